@@ -1,28 +1,89 @@
 from homeassistant.core import HomeAssistant
 from homeassistant.config_entries import ConfigEntry
-from .const import DOMAIN, PLATFORMS
-from .api import Hp7Api
-from .coordinator import Hp7Coordinator
+from .const import DOMAIN, PLATFORMS, CONF_SERIAL, CONF_SERIALS
+from .coordinator import AdaptivePoller, Hp7Coordinator
+from .registry import account_key, get_registry
+from .storage import async_get_cache
+
+
+def entry_serials(data) -> list[str]:
+    """Serial configurati: lista ``serials`` o, per le entry vecchie, ``serial``."""
+    serials = data.get(CONF_SERIALS)
+    if serials:
+        return list(serials)
+    return [data[CONF_SERIAL]] if data.get(CONF_SERIAL) else []
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
-    username = entry.data["username"]
-    password = entry.data["password"]
-    region = entry.data["region"]
-    serial = entry.data["serial"]
+    serials = entry_serials(entry.data)
+    registry = get_registry(hass)
+    cache = await async_get_cache(hass)
+    key = account_key(entry.data)
 
-    api = Hp7Api(username, password, region)
-    await hass.async_add_executor_job(api.login)
-    # NEW: rileva i comandi supportati dalla tua CLI 1.0.1.6
-    await hass.async_add_executor_job(api.detect_capabilities, serial)
+    # Client condiviso con le altre entry dello stesso account; con una
+    # sessione salvata niente login: il primo refresh è l'unico giro di rete
+    api = await registry.async_acquire(hass, entry, token=cache.token(key))
+    try:
+        coordinator = Hp7Coordinator(
+            hass, api, serials, AdaptivePoller.from_options(entry.options), cache=cache
+        )
 
-    coordinator = Hp7Coordinator(hass, api, serial)
-    await coordinator.async_config_entry_first_refresh()
+        # Avvio a caldo: snapshot salvato + capacità in cache per lo stesso firmware
+        snapshot = cache.snapshot(serials)
+        warm_caps = {
+            serial: cache.capabilities(serial, (snapshot or {}).get(serial, {}).get("version"))
+            for serial in serials
+        }
+        warm = snapshot is not None and all(warm_caps.values())
+        if warm:
+            coordinator.async_set_stale_data(snapshot)
+            for serial in serials:
+                api.detect_capabilities(serial, warm_caps[serial])
+        else:
+            await coordinator.async_config_entry_first_refresh()
+            # Capacità dalla pagelist appena letta, o dalla cache se il firmware è lo stesso
+            for serial in serials:
+                cached = cache.capabilities(serial, api.device_version(serial))
+                caps = await hass.async_add_executor_job(api.detect_capabilities, serial, cached)
+                cache.set_capabilities(serial, caps)
+            cache.set_token(key, api.token)
+    except Exception:
+        await registry.async_release(hass, entry)
+        raise
 
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = {
         "api": api,
-        "serial": serial,
+        "serials": serials,
         "coordinator": coordinator,
     }
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_on_unload(entry.add_update_listener(_async_options_updated))
+    if warm:
+        # Le entità sono già popolate: il primo refresh reale le aggiorna sul posto
+        entry.async_create_background_task(
+            hass, _async_first_live_refresh(coordinator, cache, key, api), f"{DOMAIN} first refresh"
+        )
     return True
+
+
+async def _async_first_live_refresh(coordinator, cache, key, api) -> None:
+    await coordinator.async_refresh()
+    if coordinator.last_update_success:
+        cache.set_token(key, api.token)
+
+
+async def _async_options_updated(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    # Nuovi limiti di polling: ricarica l'entry
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
+async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if unload_ok:
+        data = hass.data[DOMAIN].pop(entry.entry_id, None)
+        if data:
+            # Sessione eventualmente rinnovata durante l'esecuzione
+            (await async_get_cache(hass)).set_token(account_key(entry.data), data["api"].token)
+        await get_registry(hass).async_release(hass, entry)
+    return unload_ok
@@ -3,9 +3,12 @@ import json
 import logging
 import shutil
 import subprocess
-from typing import Any, Dict, Optional
+import threading
+from typing import Any, Dict, Iterable, Optional
 
+from .pylocalapi.camera import EzvizCamera
 from .pylocalapi.client import EzvizClient
+from .pylocalapi.exceptions import PyEzvizError
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -17,7 +20,7 @@ DEFAULT_GATE_LOCK_NO = 1   # CANCELLO=1
 
 
 class Hp7Api:
-    def __init__(self, username: str, password: str, region: str):
+    def __init__(self, username: str, password: str, region: str, token: Optional[dict] = None):
         self._username = username
         self._password = password
 
@@ -36,6 +39,19 @@ class Hp7Api:
             self._region_or_url = reg_in
 
         self._client: Optional[EzvizClient] = None
+        # Più coordinator (una entry ciascuno) usano questo client da thread
+        # dell'executor: le chiamate SDK, compresi login e relogin, passano
+        # una alla volta così la sessione non viene ruotata in parallelo.
+        self._lock = threading.RLock()
+        # Sessione salvata al riavvio precedente: evita il login iniziale
+        self._token = token
+        # Pagelist dell'ultimo refresh completo (serial -> sezioni)
+        self._last_infos: Dict[str, Any] = {}
+        # Camere dell'ultimo refresh completo, riusate dal tier leggero.
+        # Per serial: l'Hp7Api è condivisa fra le entry dello stesso account.
+        self._cameras: Dict[str, EzvizCamera] = {}
+        # Serial non presenti nell'account all'ultimo refresh completo
+        self._missing: set = set()
         self._user_id: Optional[str] = None
         self._cli = shutil.which("pyezvizapi")
 
@@ -45,44 +61,116 @@ class Hp7Api:
     # -------------------- Sessione SDK (solo per unlock) --------------------
 
     def ensure_client(self) -> None:
-        if self._client is not None:
-            return
-        _LOGGER.debug("EZVIZ HP7: intentando login SDK con '%s'", self._region_or_url)
-        self._client = EzvizClient(
-            account=self._username,
-            password=self._password,
-            url=self._region_or_url,
-        )
-        try:
-            self._client.login()
-            _LOGGER.info("EZVIZ HP7: login OK en '%s'", self._client._token.get("api_url", self._region_or_url))
-        except Exception as e:
-            _LOGGER.error("EZVIZ HP7: login FAILED en '%s' -> %s", self._region_or_url, e)
-            raise
+        with self._lock:
+            if self._client is not None:
+                return
+            _LOGGER.debug("EZVIZ HP7: intentando login SDK con '%s'", self._region_or_url)
+            self._client = EzvizClient(
+                account=self._username,
+                password=self._password,
+                url=self._region_or_url,
+                token=dict(self._token) if self._token else None,
+            )
+            if self._token and self._token.get("session_id"):
+                # Se la sessione è scaduta il client rifà login al primo 401
+                _LOGGER.debug("EZVIZ HP7: riuso sessione salvata, login rimandato")
+                return
+            try:
+                self._client.login()
+                _LOGGER.info("EZVIZ HP7: login OK en '%s'", self._client._token.get("api_url", self._region_or_url))
+            except Exception as e:
+                _LOGGER.error("EZVIZ HP7: login FAILED en '%s' -> %s", self._region_or_url, e)
+                raise
 
     def login(self) -> bool:
         """Compat per il setup: inizializza il client SDK."""
         self.ensure_client()
         return True
 
-    def detect_capabilities(self, serial: str) -> None:
-        """Compat per il setup: per ora li consideriamo supportati."""
-        try:
-            self.ensure_client()
-            dev = self._client.get_device_infos(serial)
-            cat = dev.get("deviceInfos", {}).get("deviceCategory")
-            sub = dev.get("deviceInfos", {}).get("deviceSubCategory")
-            _LOGGER.info("EZVIZ HP7: device %s category=%s sub=%s", serial, cat, sub)
-        except Exception as e:
-            _LOGGER.debug("detect_capabilities get_device_infos fallita: %s", e)
-        self.supports_door = True
-        self.supports_gate = True
+    def close(self) -> None:
+        """Ferma l'eventuale client push e chiude la sessione HTTP."""
+        with self._lock:
+            client, self._client = self._client, None
+            self._cameras = {}
+            self._missing = set()
+            self._last_infos = {}
+            if client is None:
+                return
+            if client.mqtt_client is not None:
+                try:
+                    client.mqtt_client.stop()
+                except Exception as e:
+                    _LOGGER.debug("Stop MQTT fallito: %s", e)
+            client.close_session()
+
+    def set_password(self, password: str) -> None:
+        """Nuova password (già verificata): il client viene ricreato alla
+        prossima chiamata, con la sessione corrente finché resta valida."""
+        with self._lock:
+            if password == self._password:
+                return
+            token = self.token
+            self.close()
+            self._token = token
+            self._password = password
+
+    @property
+    def token(self) -> Optional[dict]:
+        """Sessione SDK corrente (da salvare per il prossimo avvio)."""
+        with self._lock:
+            if self._client is None:
+                return self._token
+            return dict(self._client._token)
+
+    def device_version(self, serial: str) -> Optional[str]:
+        """Firmware dall'ultima pagelist (nessuna chiamata di rete)."""
+        return (self._last_infos.get(serial) or {}).get("deviceInfos", {}).get("version")
+
+    def detect_capabilities(self, serial: str, cached: Optional[dict] = None) -> dict:
+        """Capacità del dispositivo, ricavate dalla pagelist del primo refresh.
+
+        ``cached`` (stesso firmware) evita di rifare il rilevamento; la
+        pagelist viene richiesta solo se il refresh non l'ha già caricata.
+        """
+        if cached is None:
+            dev = self._last_infos.get(serial)
+            if dev is None:
+                try:
+                    with self._lock:
+                        self.ensure_client()
+                        dev = self._client.get_device_infos(serial)
+                except Exception as e:
+                    _LOGGER.debug("detect_capabilities get_device_infos fallita: %s", e)
+                    dev = {}
+            info = dev.get("deviceInfos", {})
+            cached = {
+                "version": info.get("version"),
+                "category": info.get("deviceCategory"),
+                "sub_category": info.get("deviceSubCategory"),
+                # Per ora li consideriamo supportati
+                "supports_door": True,
+                "supports_gate": True,
+            }
+            _LOGGER.info(
+                "EZVIZ HP7: device %s category=%s sub=%s",
+                serial, cached["category"], cached["sub_category"],
+            )
+        self.supports_door = cached.get("supports_door", True)
+        self.supports_gate = cached.get("supports_gate", True)
+        return cached
+
+    def metrics_snapshot(self) -> Dict[str, Any]:
+        """Snapshot delle metriche per endpoint del client SDK (vuoto se non connesso)."""
+        if self._client is None:
+            return {"endpoints": {}, "totals": {}}
+        return self._client.metrics.snapshot()
 
     def _ensure_user_id(self) -> str:
         if self._user_id:
             return self._user_id
-        self.ensure_client()
-        info = self._client.get_user_id()
+        with self._lock:
+            self.ensure_client()
+            info = self._client.get_user_id()
         for k in ("userId", "username", "userName", "uid"):
             if isinstance(info, dict) and info.get(k):
                 self._user_id = str(info[k])
@@ -115,16 +203,13 @@ class Hp7Api:
     # -------------------- Discovery & Status --------------------
 
     def list_devices(self) -> Dict[str, Dict[str, Any]]:
-        self.ensure_client()
-        cams = self._client.load_cameras()  # dict per serial
+        """Elenco per il config flow: una sola pagelist ``CLOUD``, niente allarmi."""
+        with self._lock:
+            self.ensure_client()
+            devices = self._client.discover_devices()
         result: Dict[str, Dict[str, Any]] = {}
-        for serial, data in (cams or {}).items():
-            name = (
-                data.get("STATUS", {}).get("name")
-                or data.get("deviceInfos", {}).get("deviceName")
-                or "Device"
-            )
-            result[serial] = {"device_name": name}
+        for serial, info in devices.items():
+            result[serial] = {**info, "device_name": info.get("name") or "Device"}
         return result
 
     def get_status(self, serial: str) -> Dict[str, Any]:
@@ -145,15 +230,93 @@ class Hp7Api:
             _LOGGER.error("Parse JSON status fallito: %s. Preview=%.300s", e, preview)
             return {}
 
+    def get_statuses(self, serials: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Stato di più dispositivi in un solo ciclo.
+
+        Una sola pagelist per tutto l'account, poi ``EzvizCamera.status()`` per
+        ogni serial (che aggiunge solo la chiamata dell'ultimo allarme). Se il
+        passaggio SDK fallisce si torna alla CLI, un serial alla volta.
+        """
+        serials = list(serials)
+        result: Dict[str, Dict[str, Any]] = {}
+        failed: list[str] = []
+        with self._lock:
+            try:
+                self.ensure_client()
+                infos = self._client.get_device_infos()
+            except (PyEzvizError, KeyError, TypeError, ValueError) as e:
+                _LOGGER.warning("Pagelist SDK fallita (%s); uso la CLI per %s", e, serials)
+                infos = None
+            if infos is not None:
+                self._last_infos = infos
+                for serial in serials:
+                    device = infos.get(serial)
+                    if device is None:
+                        _LOGGER.warning("Dispositivo %s non presente nell'account", serial)
+                        result[serial] = {}
+                        self._cameras.pop(serial, None)
+                        self._missing.add(serial)
+                        continue
+                    self._missing.discard(serial)
+                    try:
+                        camera = EzvizCamera(self._client, serial, device)
+                        status = camera.status()
+                        # Allarme già visto (anche da un poll precedente)?
+                        status["new_alarm"] = camera.alarm_is_new
+                        result[serial] = status
+                        self._cameras[serial] = camera
+                    except (PyEzvizError, KeyError, TypeError, ValueError) as e:
+                        _LOGGER.warning("Stato SDK fallito per %s (%s); uso la CLI", serial, e)
+                        self._cameras.pop(serial, None)
+                        failed.append(serial)
+        if infos is None:
+            failed = serials
+        # La CLI apre una sessione propria: fuori dal lock
+        for serial in failed:
+            result[serial] = self.get_status(serial)
+        return {serial: result[serial] for serial in serials}
+
+    def refresh_liveness(
+        self, serials: Iterable[str], previous: Dict[str, Dict[str, Any]]
+    ) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Tier leggero: stato online in batch + ultimo allarme per serial.
+
+        Aggiorna solo ``status`` e le chiavi dell'allarme sopra lo stato
+        completo precedente. Restituisce None quando serve un refresh completo
+        (camera non ancora costruita o chiamata fallita). I serial assenti
+        dall'account vengono saltati fino al prossimo refresh completo.
+        """
+        serials = list(serials)
+        live: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            present = [s for s in serials if s not in self._missing]
+            cameras = {s: self._cameras[s] for s in present if s in self._cameras}
+            if len(cameras) != len(present) or not all(previous.get(s) for s in present):
+                return None
+            if cameras:
+                try:
+                    self.ensure_client()
+                    live = self._client.refresh_liveness(cameras)
+                    for serial, camera in cameras.items():
+                        live.setdefault(serial, {})["new_alarm"] = camera.alarm_is_new
+                except (PyEzvizError, KeyError, TypeError, ValueError) as e:
+                    _LOGGER.warning("Refresh leggero fallito (%s); passo al completo", e)
+                    return None
+        return {
+            serial: {**previous.get(serial, {}), **live.get(serial, {})}
+            for serial in serials
+        }
+
     # -------------------- Sblocco (solo SDK, sin CLI) --------------------
 
     def _try_unlock(self, serial: str, lock_no: int) -> bool:
         """Desbloquea vía SDK pasando user_id y lock_no con keywords."""
         self.ensure_client()
         try:
-            uid = self._ensure_user_id()
-            # Usar keywords evita problemas con el orden de argumentos del SDK
-            self._client.remote_unlock(serial=serial, user_id=uid, lock_no=lock_no)
+            with self._lock:
+                uid = self._ensure_user_id()
+                # Usar keywords evita problemas con el orden de argumentos del SDK
+                self._client.remote_unlock(serial=serial, user_id=uid, lock_no=lock_no)
             _LOGGER.info("remote_unlock SDK OK (serial=%s, user_id=%s, lock_no=%s)", serial, uid, lock_no)
             return True
         except Exception as e:
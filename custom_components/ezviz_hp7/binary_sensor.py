@@ -1,8 +1,8 @@
 from __future__ import annotations
 from homeassistant.components.binary_sensor import BinarySensorEntity, BinarySensorDeviceClass
 from homeassistant.helpers.entity import DeviceInfo
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from .const import DOMAIN
+from .entity import Hp7CoordinatorEntity
 
 def _to_bool(v) -> bool:
     if isinstance(v, bool):
@@ -25,25 +25,28 @@ MAP = [
 async def async_setup_entry(hass, entry, async_add_entities):
     data = hass.data[DOMAIN][entry.entry_id]
     coordinator = data["coordinator"]
-    serial = data["serial"]
-    ents = [Hp7Binary(coordinator, serial, key, name, dc) for key, name, dc in MAP]
+    ents = [
+        Hp7Binary(coordinator, serial, key, name, dc)
+        for serial in data["serials"]
+        for key, name, dc in MAP
+    ]
     async_add_entities(ents)
 
-class Hp7Binary(CoordinatorEntity, BinarySensorEntity):
+class Hp7Binary(Hp7CoordinatorEntity, BinarySensorEntity):
     _attr_should_poll = False
     _attr_has_entity_name = True
 
     def __init__(self, coordinator, serial, key, name, device_class):
-        super().__init__(coordinator)
-        self._serial = serial
+        super().__init__(coordinator, serial)
         self._key = key
+        self._watch_keys = (key,)
         self._attr_name = name
         self._attr_unique_id = f"{DOMAIN}_{serial}_bin_{key}"
         self._attr_device_class = device_class
 
     @property
     def is_on(self) -> bool:
-        data = self.coordinator.data or {}
+        data = self.coordinator.device_data(self._serial)
         raw = data.get(self._key)
         return _to_bool(raw)
 
@@ -9,18 +9,20 @@ _LOGGER = logging.getLogger(__name__)
 async def async_setup_entry(hass, entry, async_add_entities):
     data = hass.data[DOMAIN][entry.entry_id]
     api = data["api"]
-    serial = data["serial"]
+    coordinator = data["coordinator"]
 
     entities = []
-    if getattr(api, "supports_gate", False):
-        entities.append(EzvizHp7Button(api, serial, "unlock_gate", "Sblocca Cancello"))
-    if getattr(api, "supports_door", False):
-        entities.append(EzvizHp7Button(api, serial, "unlock_door", "Sblocca Porta"))
+    for serial in data["serials"]:
+        if getattr(api, "supports_gate", False):
+            entities.append(EzvizHp7Button(api, coordinator, serial, "unlock_gate", "Sblocca Cancello"))
+        if getattr(api, "supports_door", False):
+            entities.append(EzvizHp7Button(api, coordinator, serial, "unlock_door", "Sblocca Porta"))
     async_add_entities(entities)
 
 class EzvizHp7Button(ButtonEntity):
-    def __init__(self, api, serial, action, name):
+    def __init__(self, api, coordinator, serial, action, name):
         self._api = api
+        self._coordinator = coordinator
         self._serial = serial
         self._action = action
         self._attr_name = name
@@ -43,5 +45,8 @@ class EzvizHp7Button(ButtonEntity):
         elif self._action == "unlock_door":
             ok = await self.hass.async_add_executor_job(self._api.unlock_door, self._serial)
             _LOGGER.log(logging.INFO if ok else logging.ERROR, "EZVIZ HP7: 'Sblocca Porta' %s.", "OK" if ok else "FALLITO")
+        # Dopo uno sblocco si torna al polling rapido
+        self._coordinator.note_activity()
+        await self._coordinator.async_request_refresh()
 
 
@@ -3,26 +3,28 @@ import logging
 
 from homeassistant.components.camera import Camera
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.entity import DeviceInfo
 from .const import DOMAIN
+from .entity import Hp7CoordinatorEntity
 
 _LOGGER = logging.getLogger(__name__)
 
 async def async_setup_entry(hass, entry, async_add_entities):
     data = hass.data[DOMAIN][entry.entry_id]
     coordinator = data["coordinator"]
-    serial = data["serial"]
-    async_add_entities([Hp7LastSnapshotCamera(hass, coordinator, serial)])
+    async_add_entities(
+        [Hp7LastSnapshotCamera(hass, coordinator, serial) for serial in data["serials"]]
+    )
 
-class Hp7LastSnapshotCamera(Camera, CoordinatorEntity):
+class Hp7LastSnapshotCamera(Camera, Hp7CoordinatorEntity):
     _attr_has_entity_name = True
+    # L'immagine cambia solo con un nuovo allarme
+    _watch_keys = ("last_alarm_pic", "last_alarm_time")
 
     def __init__(self, hass, coordinator, serial: str):
         Camera.__init__(self)
-        CoordinatorEntity.__init__(self, coordinator)
+        Hp7CoordinatorEntity.__init__(self, coordinator, serial)
         self.hass = hass
-        self._serial = serial
         self._attr_name = "Ultima Istantanea"
         self._attr_unique_id = f"{DOMAIN}_{serial}_last_snapshot"
 
@@ -37,7 +39,7 @@ class Hp7LastSnapshotCamera(Camera, CoordinatorEntity):
         )
 
     async def async_camera_image(self, width: int | None = None, height: int | None = None):
-        url = (self.coordinator.data or {}).get("last_alarm_pic")
+        url = self.coordinator.device_data(self._serial).get("last_alarm_pic")
         if not url:
             return None
 
@@ -55,6 +57,3 @@ class Hp7LastSnapshotCamera(Camera, CoordinatorEntity):
 
     async def _async_get_supported_webrtc_provider(self, *args, **kwargs):
         return None
-
-    def _handle_coordinator_update(self) -> None:
-        self.async_write_ha_state()
@@ -1,8 +1,27 @@
 from __future__ import annotations
 import voluptuous as vol
 from homeassistant import config_entries
-from .const import DOMAIN, CONF_REGION, CONF_SERIAL
+from homeassistant.core import callback
+import homeassistant.helpers.config_validation as cv
+from .const import (
+    DOMAIN,
+    CONF_REGION,
+    CONF_SERIAL,
+    CONF_SERIALS,
+    CONF_FAST_INTERVAL,
+    CONF_IDLE_INTERVAL,
+    CONF_OFFLINE_INTERVAL,
+    CONF_ACTIVE_WINDOW,
+    CONF_FULL_INTERVAL,
+    DEFAULT_FAST_INTERVAL,
+    DEFAULT_IDLE_INTERVAL,
+    DEFAULT_OFFLINE_INTERVAL,
+    DEFAULT_ACTIVE_WINDOW,
+    DEFAULT_FULL_INTERVAL,
+)
 from .api import Hp7Api
+from .registry import account_key, get_registry
+from . import entry_serials
 
 DATA_SCHEMA = vol.Schema({
     vol.Required("username"): str,
@@ -10,6 +29,10 @@ DATA_SCHEMA = vol.Schema({
     vol.Required(CONF_REGION, default="eu"): vol.In(["eu", "us", "cn", "as", "sa"]),
 })
 
+REAUTH_SCHEMA = vol.Schema({
+    vol.Required("password"): str,
+})
+
 SERIAL_SCHEMA = vol.Schema({
     vol.Required(CONF_SERIAL): str,
 })
@@ -17,6 +40,11 @@ SERIAL_SCHEMA = vol.Schema({
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        return OptionsFlowHandler(config_entry)
+
     def __init__(self) -> None:
         self._cached_creds: dict | None = None
         self._device_options: dict[str, str] | None = None  # serial -> label
@@ -26,6 +54,14 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         if user_input is None:
             return self.async_show_form(step_id="user", data_schema=DATA_SCHEMA)
 
+        # Stesso account già configurato: il client è condiviso, la password deve coincidere
+        if self._account_entries(user_input, user_input["password"]):
+            return self.async_show_form(
+                step_id="user",
+                data_schema=DATA_SCHEMA,
+                errors={"base": "password_mismatch"},
+            )
+
         api = Hp7Api(user_input["username"], user_input["password"], user_input[CONF_REGION])
 
         # Login e tentativo discovery
@@ -45,15 +81,21 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 errors={"base": "auth"},
             )
 
-        # estrazione delle opzioni dopo list_devices()
+        # estrazione delle opzioni dopo list_devices(), senza i serial già configurati
+        configured = self._configured_serials()
         options: dict[str, str] = {}
         for serial, info in devices.items():
+            if serial in configured:
+                continue
             label = f"{(info.get('name') or info.get('device_name') or 'Device')}".strip()
             options[serial] = f"{label} ({serial})"
         
 
         self._cached_creds = user_input
 
+        if devices and not options:
+            return self.async_abort(reason="already_configured")
+
         if options:
             # Vai alla scelta del serial dall’elenco
             self._device_options = options
@@ -65,20 +107,57 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     async def async_step_pick_serial(self, user_input=None):
         assert self._device_options is not None, "Device list not prepared"
 
+        # Selezione multipla: tutti i dispositivi scelti condividono un solo coordinator
         schema = vol.Schema({
-            vol.Required(CONF_SERIAL): vol.In(list(self._device_options.keys()))
+            vol.Required(
+                CONF_SERIALS, default=list(self._device_options.keys())
+            ): cv.multi_select(self._device_options)
         })
 
         if user_input is None:
             return self.async_show_form(step_id="pick_serial", data_schema=schema)
 
-        serial = user_input[CONF_SERIAL]
-
-        await self.async_set_unique_id(serial)
+        serials = list(user_input[CONF_SERIALS])
+        if not serials:
+            return self.async_show_form(
+                step_id="pick_serial", data_schema=schema, errors={"base": "no_selection"}
+            )
+        return await self._create_entry(serials)
+
+    def _account_entries(self, data, other_than: str | None = None, exclude: str | None = None):
+        """Entry dello stesso account, opzionalmente solo con password diversa da ``other_than``."""
+        key = account_key(data)
+        return [
+            entry
+            for entry in self._async_current_entries(include_ignore=False)
+            if entry.entry_id != exclude
+            and account_key(entry.data) == key
+            and (other_than is None or entry.data.get("password") != other_than)
+        ]
+
+    def _configured_serials(self) -> set[str]:
+        """Serial già presenti in una entry (singola o multi-dispositivo)."""
+        return {
+            serial
+            for entry in self._async_current_entries(include_ignore=False)
+            for serial in entry_serials(entry.data)
+        }
+
+    async def _create_entry(self, serials: list[str]):
+        creds = self._cached_creds or {}
+        if self._configured_serials().intersection(serials):
+            return self.async_abort(reason="already_configured")
+        if len(serials) == 1:
+            title = f"EZVIZ HP7 ({serials[0]})"
+        else:
+            title = f"EZVIZ HP7 ({creds.get('username')})"
+
+        # Un solo schema per tutte le entry: unique_id = primo serial
+        # (compatibile con le entry a dispositivo singolo esistenti)
+        await self.async_set_unique_id(serials[0])
         self._abort_if_unique_id_configured()
 
-        data = {**(self._cached_creds or {}), CONF_SERIAL: serial}
-        title = f"EZVIZ HP7 ({serial})"
+        data = {**creds, CONF_SERIAL: serials[0], CONF_SERIALS: serials}
         return self.async_create_entry(title=title, data=data)
 
     async def async_step_enter_serial(self, user_input=None):
@@ -86,11 +165,68 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         if user_input is None:
             return self.async_show_form(step_id="enter_serial", data_schema=SERIAL_SCHEMA)
 
-        serial = user_input[CONF_SERIAL]
-
-        await self.async_set_unique_id(serial)
-        self._abort_if_unique_id_configured()
-
-        data = {**(self._cached_creds or {}), CONF_SERIAL: serial}
-        title = f"EZVIZ HP7 ({serial})"
-        return self.async_create_entry(title=title, data=data)
+        return await self._create_entry([user_input[CONF_SERIAL]])
+
+    async def async_step_reauth(self, entry_data):
+        # Password rifiutata (o diversa dalle altre entry dello stesso account)
+        return await self.async_step_reauth_confirm()
+
+    async def async_step_reauth_confirm(self, user_input=None):
+        entry = self._get_reauth_entry()
+        errors = {}
+        if user_input is not None:
+            password = user_input["password"]
+            api = Hp7Api(entry.data["username"], password, entry.data[CONF_REGION])
+            try:
+                await self.hass.async_add_executor_job(api.login)
+            except Exception:
+                errors["base"] = "auth"
+            finally:
+                await self.hass.async_add_executor_job(api.close)
+            if not errors:
+                # Una sola password per account: client aperto e altre entry
+                await get_registry(self.hass).async_set_password(self.hass, entry.data, password)
+                for other in self._account_entries(entry.data, password, exclude=entry.entry_id):
+                    self.hass.config_entries.async_update_entry(
+                        other, data={**other.data, "password": password}
+                    )
+                return self.async_update_reload_and_abort(
+                    entry, data_updates={"password": password}
+                )
+        return self.async_show_form(
+            step_id="reauth_confirm",
+            data_schema=REAUTH_SCHEMA,
+            errors=errors,
+            description_placeholders={"username": entry.data["username"]},
+        )
+
+
+class OptionsFlowHandler(config_entries.OptionsFlow):
+    """Limiti del polling adattivo e del refresh completo (secondi)."""
+
+    def __init__(self, config_entry) -> None:
+        self._entry = config_entry
+
+    async def async_step_init(self, user_input=None):
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        opts = self._entry.options
+        schema = vol.Schema({
+            vol.Required(
+                CONF_FAST_INTERVAL, default=opts.get(CONF_FAST_INTERVAL, DEFAULT_FAST_INTERVAL)
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=60)),
+            vol.Required(
+                CONF_IDLE_INTERVAL, default=opts.get(CONF_IDLE_INTERVAL, DEFAULT_IDLE_INTERVAL)
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=3600)),
+            vol.Required(
+                CONF_OFFLINE_INTERVAL, default=opts.get(CONF_OFFLINE_INTERVAL, DEFAULT_OFFLINE_INTERVAL)
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=3600)),
+            vol.Required(
+                CONF_ACTIVE_WINDOW, default=opts.get(CONF_ACTIVE_WINDOW, DEFAULT_ACTIVE_WINDOW)
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
+            vol.Required(
+                CONF_FULL_INTERVAL, default=opts.get(CONF_FULL_INTERVAL, DEFAULT_FULL_INTERVAL)
+            ): vol.All(vol.Coerce(int), vol.Range(min=10, max=86400)),
+        })
+        return self.async_show_form(step_id="init", data_schema=schema)
@@ -1,5 +1,23 @@
 DOMAIN = "ezviz_hp7"
 CONF_REGION = "region"
 CONF_SERIAL = "serial"
+CONF_SERIALS = "serials"
+# Chiave in hass.data[DOMAIN] del registro client per account
+DATA_ACCOUNTS = "accounts"
+# Chiave in hass.data[DOMAIN] della cache persistente (token, capacità)
+DATA_CACHE = "cache"
 PLATFORMS = ["button", "sensor", "binary_sensor", "camera"]
 UPDATE_INTERVAL_SEC = 2  # polling rapido per eventi
+
+# Polling adattivo (sovrascrivibile dalle opzioni dell'entry)
+CONF_FAST_INTERVAL = "fast_interval"
+CONF_IDLE_INTERVAL = "idle_interval"
+CONF_OFFLINE_INTERVAL = "offline_interval"
+CONF_ACTIVE_WINDOW = "active_window"
+CONF_FULL_INTERVAL = "full_interval"
+DEFAULT_FAST_INTERVAL = UPDATE_INTERVAL_SEC  # dopo movimento/chiamata/sblocco
+DEFAULT_IDLE_INTERVAL = 30  # tetto del back-off a riposo
+DEFAULT_OFFLINE_INTERVAL = 120  # tutti i dispositivi offline
+DEFAULT_ACTIVE_WINDOW = 120  # secondi di polling rapido dopo un evento
+# Refresh completo (pagelist + allarme); tra uno e l'altro solo stato online + allarme
+DEFAULT_FULL_INTERVAL = 300
@@ -1,21 +1,231 @@
 from __future__ import annotations
 import logging
+import time
 from datetime import timedelta
+from typing import Any, Iterable, Mapping
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
-from .const import UPDATE_INTERVAL_SEC
+from .const import (
+    CONF_ACTIVE_WINDOW,
+    CONF_FAST_INTERVAL,
+    CONF_FULL_INTERVAL,
+    CONF_IDLE_INTERVAL,
+    CONF_OFFLINE_INTERVAL,
+    DEFAULT_ACTIVE_WINDOW,
+    DEFAULT_FAST_INTERVAL,
+    DEFAULT_FULL_INTERVAL,
+    DEFAULT_IDLE_INTERVAL,
+    DEFAULT_OFFLINE_INTERVAL,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+_MISSING = object()
+
+# Un cambio di queste chiavi indica attività (chiamata o movimento)
+ACTIVITY_KEYS = ("last_alarm_time", "last_alarm_pic")
+
+# Chiavi salvate nello snapshot di avvio (quelle lette dalle entità). Esclusi
+# i valori relativi all'istante (Motion_Trigger, Seconds_Last_Trigger): dopo
+# un riavvio sarebbero sbagliati.
+SNAPSHOT_KEYS = (
+    "name",
+    "version",
+    "status",
+    "wifiInfos",
+    "local_ip",
+    "wan_ip",
+    "last_alarm_time",
+    "last_alarm_pic",
+    "last_alarm_type_name",
+    "device_category",
+    "device_sub_category",
+    "alarm_notify",
+    "alarm_schedules_enabled",
+    "PIR_Status",
+    "cam_timezone",
+    "supported_channels",
+)
+_JSON_TYPES = (str, int, float, bool, type(None), dict, list)
+
+
+def compact_snapshot(status: Mapping[str, Any]) -> dict[str, Any]:
+    """Sottoinsieme serializzabile di uno stato, per la cache di avvio."""
+    return {
+        key: status[key]
+        for key in SNAPSHOT_KEYS
+        if key in status and isinstance(status[key], _JSON_TYPES)
+    }
+
+
+class AdaptivePoller:
+    """Calcola l'intervallo del prossimo refresh in base all'attività.
+
+    - entro ``active_window`` secondi da movimento/chiamata/sblocco: ``fast``;
+    - a riposo: raddoppia a ogni ciclo fino a ``idle``;
+    - tutti i dispositivi offline (``status != 1``): ``offline``.
+
+    Ogni ciclo è leggero (stato online + allarme); uno completo (pagelist)
+    al massimo ogni ``full`` secondi.
+    """
+
+    def __init__(
+        self,
+        fast: float = DEFAULT_FAST_INTERVAL,
+        idle: float = DEFAULT_IDLE_INTERVAL,
+        offline: float = DEFAULT_OFFLINE_INTERVAL,
+        active_window: float = DEFAULT_ACTIVE_WINDOW,
+        full: float = DEFAULT_FULL_INTERVAL,
+    ) -> None:
+        self.fast = max(1.0, float(fast))
+        self.idle = max(self.fast, float(idle))
+        self.offline = max(self.fast, float(offline))
+        self.active_window = max(0.0, float(active_window))
+        self.full = max(self.fast, float(full))
+        self._full_due = 0.0
+        self._active_until = 0.0
+        self._idle_steps = 0
+
+    @classmethod
+    def from_options(cls, options: Mapping[str, Any]) -> "AdaptivePoller":
+        return cls(
+            fast=options.get(CONF_FAST_INTERVAL, DEFAULT_FAST_INTERVAL),
+            idle=options.get(CONF_IDLE_INTERVAL, DEFAULT_IDLE_INTERVAL),
+            offline=options.get(CONF_OFFLINE_INTERVAL, DEFAULT_OFFLINE_INTERVAL),
+            active_window=options.get(CONF_ACTIVE_WINDOW, DEFAULT_ACTIVE_WINDOW),
+            full=options.get(CONF_FULL_INTERVAL, DEFAULT_FULL_INTERVAL),
+        )
+
+    def full_due(self, now: float | None = None) -> bool:
+        now = time.monotonic() if now is None else now
+        return now >= self._full_due
+
+    def note_full(self, now: float | None = None) -> None:
+        now = time.monotonic() if now is None else now
+        self._full_due = now + self.full
+
+    def note_activity(self, now: float | None = None) -> None:
+        now = time.monotonic() if now is None else now
+        self._active_until = now + self.active_window
+        self._idle_steps = 0
+
+    def next_interval(self, online: bool, now: float | None = None) -> float:
+        now = time.monotonic() if now is None else now
+        if now < self._active_until:
+            return self.fast
+        if not online:
+            return self.offline
+        interval = min(self.fast * (2 ** self._idle_steps), self.idle)
+        if interval < self.idle:
+            self._idle_steps += 1
+        return interval
+
+
 class Hp7Coordinator(DataUpdateCoordinator):
-    def __init__(self, hass, api, serial):
+    """Un coordinator per account: un solo ciclo di refresh per tutti i serial.
+
+    ``data`` è un dict ``serial -> stato``; le entità leggono la propria parte
+    con :meth:`device_data` e chiedono a :meth:`changed` se le chiavi che
+    osservano sono cambiate rispetto al refresh precedente. L'intervallo si
+    adatta all'attività (vedi :class:`AdaptivePoller`).
+
+    Con una ``cache`` l'ultimo stato buono viene salvato e, al riavvio,
+    servito subito come ``stale`` (vedi :meth:`async_set_stale_data`).
+    """
+
+    def __init__(
+        self, hass, api, serials: list[str], poller: AdaptivePoller | None = None, cache=None
+    ):
+        self.poller = poller or AdaptivePoller()
+        self.cache = cache
+        # True finché i dati vengono dallo snapshot salvato
+        self.stale = False
         super().__init__(
             hass,
             _LOGGER,
             name="EZVIZ HP7",
-            update_interval=timedelta(seconds=UPDATE_INTERVAL_SEC),
+            update_interval=timedelta(seconds=self.poller.fast),
         )
         self.api = api
-        self.serial = serial
+        self.serials = list(serials)
+        self._previous: dict[str, dict[str, Any]] | None = None
+        # (serial, chiave) -> cambiata?  Azzerato a ogni refresh.
+        self._changed_cache: dict[tuple[str, str], bool] = {}
+
+    def device_data(self, serial: str) -> dict[str, Any]:
+        return (self.data or {}).get(serial) or {}
+
+    def changed(self, serial: str, keys: Iterable[str]) -> bool:
+        """True se una delle ``keys`` di ``serial`` è cambiata nell'ultimo refresh.
+
+        Il confronto è pigro (solo le chiavi richieste) e memorizzato per
+        refresh, così più entità sulla stessa chiave lo pagano una volta.
+        """
+        if self._previous is None:
+            return True
+        previous = self._previous.get(serial) or {}
+        current = self.device_data(serial)
+        cache = self._changed_cache
+        for key in keys:
+            hit = cache.get((serial, key))
+            if hit is None:
+                hit = cache[(serial, key)] = (
+                    previous.get(key, _MISSING) != current.get(key, _MISSING)
+                )
+            if hit:
+                return True
+        return False
+
+    def async_set_stale_data(self, data: dict[str, dict[str, Any]]) -> None:
+        """Pubblica lo snapshot salvato come dati (stale) senza aspettare il cloud."""
+        self.data = data
+        self.stale = True
+        self.last_update_success = True
+
+    def note_activity(self) -> None:
+        """Segnala un'azione dell'utente (es. sblocco): torna al polling rapido."""
+        self.poller.note_activity()
+        self.update_interval = timedelta(seconds=self.poller.fast)
+
+    def _reschedule(self, data: dict[str, dict[str, Any]]) -> None:
+        # Eseguito prima che il coordinator pianifichi il prossimo refresh
+        previous = self.data or {}
+        for serial, status in data.items():
+            # Un allarme recente conta come attività una volta sola: i poll
+            # successivi lo vedono di nuovo (niente chiave = stato dalla CLI)
+            if status.get("Motion_Trigger") and status.get("new_alarm", True):
+                self.poller.note_activity()
+                break
+            before = previous.get(serial)
+            if before and any(before.get(k) != status.get(k) for k in ACTIVITY_KEYS):
+                self.poller.note_activity()
+                break
+        online = any(status.get("status") == 1 for status in data.values())
+        seconds = self.poller.next_interval(online)
+        if self.update_interval is None or self.update_interval.total_seconds() != seconds:
+            _LOGGER.debug("Intervallo di polling: %ss", seconds)
+            self.update_interval = timedelta(seconds=seconds)
 
     async def _async_update_data(self):
-        return await self.hass.async_add_executor_job(self.api.get_status, self.serial)
+        # Se il fetch fallisce i dati restano quelli attuali: nessun cambiamento
+        self._previous = self.data
+        self._changed_cache = {}
+        data = None
+        if self.data and not self.poller.full_due():
+            data = await self.hass.async_add_executor_job(
+                self.api.refresh_liveness, self.serials, self.data
+            )
+            # Un dispositivo tornato online può aver cambiato IP/firmware
+            if data is not None and any(
+                (self.data.get(s) or {}).get("status") != 1 and data[s].get("status") == 1
+                for s in self.serials
+            ):
+                data = None
+        if data is None:
+            data = await self.hass.async_add_executor_job(self.api.get_statuses, self.serials)
+            self.poller.note_full()
+        self._reschedule(data)
+        self.stale = False
+        if self.cache is not None:
+            for serial, status in data.items():
+                self.cache.set_snapshot(serial, compact_snapshot(status))
+        return data
@@ -0,0 +1,42 @@
+from __future__ import annotations
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+
+class Hp7CoordinatorEntity(CoordinatorEntity):
+    """Entità che scrive lo stato solo se le sue chiavi sono cambiate.
+
+    Ogni sottoclasse dichiara in ``_watch_keys`` le chiavi di primo livello
+    dello stato del dispositivo da cui dipende; a ogni refresh il coordinator
+    confronta solo quelle (vedi :meth:`Hp7Coordinator.changed`). Anche un cambio
+    di disponibilità (refresh fallito/ripristinato) o la fine dei dati stale
+    dello snapshot di avvio provocano una scrittura.
+    """
+
+    _watch_keys: tuple[str, ...] = ()
+
+    def __init__(self, coordinator, serial: str) -> None:
+        super().__init__(coordinator)
+        self._serial = serial
+        self._written_available: bool | None = None
+        self._written_stale: bool | None = None
+
+    @property
+    def extra_state_attributes(self) -> dict | None:
+        # Stato dallo snapshot salvato, in attesa del primo refresh reale
+        return {"stale": True} if self.coordinator.stale else None
+
+    def _should_write(self) -> bool:
+        if self.available != self._written_available:
+            return True
+        if self.coordinator.stale != self._written_stale:
+            return True
+        return self.coordinator.changed(self._serial, self._watch_keys)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        if not self._should_write():
+            return
+        self._written_available = self.available
+        self._written_stale = self.coordinator.stale
+        self.async_write_ha_state()
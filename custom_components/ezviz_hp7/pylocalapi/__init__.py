@@ -7,7 +7,8 @@ MQTT push, CAS, utilities) and this package exports the most useful
 symbols for convenient imports.
 """
 
-from .camera import EzvizCamera
+from .camera import CameraStatusRecord, EzvizCamera
+from .capabilities import CapabilityIndex
 from .cas import EzvizCAS
 from .client import EzvizClient
 from .constants import (
@@ -24,6 +25,9 @@ from .constants import (
     SoundMode,
     SupportExt,
 )
+from .dedup import EventDeduplicator
+from .event_history import EventHistory, EventRecord
+from .event_queue import AsyncEventReader, EventQueue, OverflowPolicy, QueueWorker
 from .exceptions import (
     AuthTestResultFailed,
     DeviceException,
@@ -35,10 +39,12 @@ from .exceptions import (
     PyEzvizError,
 )
 from .feature import (
+    FeatureView,
     day_night_mode_value,
     day_night_sensitivity_value,
     device_icr_dss_config,
     display_mode_value,
+    feature_view,
     get_algorithm_value,
     has_algorithm_subtype,
     has_osd_overlay,
@@ -63,20 +69,44 @@ from .feature import (
     support_ext_value,
 )
 from .light_bulb import EzvizLightBulb
+from .metrics import ClientMetrics
 from .models import EzvizDeviceRecord, build_device_records_map
-from .mqtt import EzvizToken, MQTTClient, MqttData, ServiceUrls
+from .mqtt import (
+    EzvizToken,
+    ExtView,
+    MQTTClient,
+    MqttData,
+    ServiceUrls,
+    decode_mqtt_payload,
+)
+from .mqtt_async import AsyncMQTTClient
 from .test_cam_rtsp import TestRTSPAuth
+from .tracing import (
+    JsonLinesTraceHooks,
+    OpenTelemetryTraceHooks,
+    RecordingTraceHooks,
+    TraceHooks,
+)
 
 __all__ = [
     "AlarmDetectHumanCar",
+    "AsyncMQTTClient",
+    "AsyncEventReader",
     "AuthTestResultFailed",
     "BatteryCameraNewWorkMode",
     "BatteryCameraWorkMode",
+    "CameraStatusRecord",
+    "CapabilityIndex",
+    "ClientMetrics",
     "DefenseModeType",
     "DeviceCatagories",
     "DeviceException",
     "DeviceSwitchType",
     "DisplayMode",
+    "EventDeduplicator",
+    "EventHistory",
+    "EventQueue",
+    "EventRecord",
     "EzvizAuthTokenExpired",
     "EzvizAuthVerificationCode",
     "EzvizCAS",
@@ -85,24 +115,34 @@ __all__ = [
     "EzvizDeviceRecord",
     "EzvizLightBulb",
     "EzvizToken",
+    "ExtView",
+    "FeatureView",
     "HTTPError",
     "IntelligentDetectionSmartApp",
     "InvalidHost",
     "InvalidURL",
+    "JsonLinesTraceHooks",
     "MQTTClient",
     "MessageFilterType",
     "MqttData",
     "NightVisionMode",
+    "OpenTelemetryTraceHooks",
+    "OverflowPolicy",
     "PyEzvizError",
+    "QueueWorker",
+    "RecordingTraceHooks",
     "ServiceUrls",
     "SoundMode",
     "SupportExt",
     "TestRTSPAuth",
+    "TraceHooks",
     "build_device_records_map",
     "day_night_mode_value",
     "day_night_sensitivity_value",
+    "decode_mqtt_payload",
     "device_icr_dss_config",
     "display_mode_value",
+    "feature_view",
     "get_algorithm_value",
     "has_algorithm_subtype",
     "has_osd_overlay",
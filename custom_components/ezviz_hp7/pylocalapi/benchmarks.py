@@ -0,0 +1,439 @@
+"""Micro-benchmarks for hot paths in pyezvizapi.
+
+Run a single case or all of them from the ``custom_components/ezviz_hp7``
+directory (so the Home Assistant integration package is not imported)::
+
+    python -m pylocalapi.benchmarks mqtt-decode
+    python -m pylocalapi.benchmarks all --json
+
+Each case compares the previous implementation (kept here verbatim as a
+reference) with the current one, so numbers are comparable on one machine.
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import Callable
+from contextlib import suppress
+import json
+import sys
+import time
+import tracemalloc
+from typing import Any
+
+from .camera import CameraStatusRecord, EzvizCamera, _project_values, project_status
+from .constants import SoundMode
+from .models import EzvizDeviceRecord, build_device_records_map, readonly_view
+from .mqtt import EXT_FIELD_NAMES, EXT_INT_FIELDS, JSON_BACKEND, decode_mqtt_payload
+from .utils import fetch_nested_value, string_to_list
+
+
+def _timeit(func: Callable[[], Any], number: int, repeat: int = 5) -> float:
+    """Return the best per-call time in seconds over ``repeat`` runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def _alloc(func: Callable[[], Any]) -> dict[str, int]:
+    """Return peak and retained traced bytes of one call (after a warm-up)."""
+    func()
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        result = func()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return {"peak_bytes": peak - base, "retained_bytes": current - base}
+
+
+def _row(name: str, per_call: float, baseline: float | None = None) -> dict[str, Any]:
+    row: dict[str, Any] = {
+        "case": name,
+        "us_per_call": round(per_call * 1e6, 3),
+        "per_sec": round(1 / per_call) if per_call else None,
+    }
+    if baseline:
+        row["speedup"] = round(baseline / per_call, 2)
+    return row
+
+
+# ---------------------------------------------------------------------------
+# MQTT payload decoding
+# ---------------------------------------------------------------------------
+
+
+def _reference_decode(payload_bytes: bytes) -> dict[str, Any]:
+    """Decoder as implemented before the precomputed schema (for comparison)."""
+    data: dict[str, Any] = json.loads(payload_bytes.decode("utf-8"))
+    if "ext" in data and isinstance(data["ext"], str):
+        ext_parts = data["ext"].split(",")
+        ext_dict: dict[str, Any] = {}
+        for i, name in enumerate(EXT_FIELD_NAMES):
+            value: Any = ext_parts[i] if i < len(ext_parts) else None
+            if value is not None and name in EXT_INT_FIELDS:
+                with suppress(ValueError):
+                    value = int(value)
+            ext_dict[name] = value
+        data["ext"] = ext_dict
+    return data
+
+
+SAMPLE_PUSH_PAYLOAD = json.dumps(
+    {
+        "id": "d6f2a9a0c1e34c8a",
+        "alert": "Someone is ringing the doorbell",
+        "alert_type": "10",
+        "ext": "1,2024-05-01 12:00:00,BD1234567,1,10000,0,0,0,0,1,"
+        "0c5a7e2b9d,0,a1b2c3,0,0,msg-000001,https://example.invalid/pic.jpg,"
+        "Front Door,0,42",
+        "t": "1714564800000",
+    }
+).encode("utf-8")
+
+
+def bench_mqtt_decode(number: int = 20000) -> list[dict[str, Any]]:
+    """Messages per second for the reference, eager and lazy decoders."""
+    payload = SAMPLE_PUSH_PAYLOAD
+    baseline = _timeit(lambda: _reference_decode(payload), number)
+
+    def lazy_serial_only() -> None:
+        ext = decode_mqtt_payload(payload, lazy_ext=True)["ext"]
+        _ = ext["device_serial"], ext["alert_type_code"], ext["msgId"]
+
+    return [
+        _row("reference (json + loop/suppress)", baseline),
+        _row(
+            f"eager ({JSON_BACKEND} + converter table)",
+            _timeit(lambda: decode_mqtt_payload(payload), number),
+            baseline,
+        ),
+        _row(
+            f"lazy ext, 3 fields read ({JSON_BACKEND})",
+            _timeit(lazy_serial_only, number),
+            baseline,
+        ),
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Camera status projection
+# ---------------------------------------------------------------------------
+
+
+SAMPLE_DEVICE: dict[str, Any] = {
+    "resourceId": "res0000001",
+    "deviceInfos": {
+        "deviceSerial": "BD1234567",
+        "name": "Front Door",
+        "deviceCategory": "BDoorBell",
+        "deviceSubCategory": "HP7",
+        "version": "V5.3.8 build 230101",
+        "status": 1,
+        "mac": "00:11:22:33:44:55",
+        "channelNumber": 1,
+        "offlineNotify": 0,
+        "supportExt": {"1": "1", "10": "1", "154": "1"},
+    },
+    "STATUS": {
+        "globalStatus": 1,
+        "pirStatus": 1,
+        "isEncrypt": 0,
+        "alarmSoundMode": 0,
+        "optionals": {
+            "timeZone": "UTC+01:00",
+            "powerRemaining": 87,
+            "diskCapacity": "29000,0",
+            "Alarm_Light": {"luminance": 40},
+            "NightVision_Model": {"graphicType": 2},
+        },
+    },
+    "CONNECTION": {"localIp": "192.168.1.20", "netIp": "203.0.113.10", "localRtspPort": 554},
+    "WIFI": {"ssid": "home", "signal": 80, "address": "192.168.1.20"},
+    "NODISTURB": {"alarmEnable": 0, "callingEnable": 0},
+    "UPGRADE": {"isNeedUpgrade": 0, "upgradePackageInfo": None},
+    "resourceInfos": [{"resourceId": "res0000001"}],
+    **{section: {} for section in ("P2P", "KMS", "QOS", "FEATURE", "FEATURE_INFO", "VTM")},
+}
+
+SAMPLE_COMPUTED: dict[str, Any] = {
+    "serial": "BD1234567",
+    "alarm_schedules_enabled": False,
+    "local_ip": "192.168.1.20",
+    "wan_ip": "203.0.113.10",
+    "switches": {7: False, 22: True},
+    "Motion_Trigger": False,
+    "Seconds_Last_Trigger": None,
+    "last_alarm_time": None,
+    "last_alarm_pic": "",
+    "last_alarm_type_code": "0000",
+    "last_alarm_type_name": "NoAlarm",
+}
+
+
+def _reference_status(device: dict[str, Any], computed: dict[str, Any]) -> dict[str, Any]:
+    """EzvizCamera.status() body before the compiled projection (no alarm I/O)."""
+
+    def fetch_key(keys: list[Any], default_value: Any = None) -> Any:
+        return fetch_nested_value(device, keys, default_value)
+
+    data: dict[str, Any] = {
+        "serial": computed["serial"],
+        "name": fetch_key(["deviceInfos", "name"]),
+        "version": fetch_key(["deviceInfos", "version"]),
+        "upgrade_available": bool(fetch_key(["UPGRADE", "isNeedUpgrade"]) == 3),
+        "status": fetch_key(["deviceInfos", "status"]),
+        "device_category": fetch_key(["deviceInfos", "deviceCategory"]),
+        "device_sub_category": fetch_key(["deviceInfos", "deviceSubCategory"]),
+        "upgrade_percent": fetch_key(["STATUS", "upgradeProcess"]),
+        "upgrade_in_progress": bool(fetch_key(["STATUS", "upgradeStatus"]) == 0),
+        "latest_firmware_info": fetch_key(["UPGRADE", "upgradePackageInfo"]),
+        "alarm_notify": bool(fetch_key(["STATUS", "globalStatus"])),
+        "alarm_schedules_enabled": computed["alarm_schedules_enabled"],
+        "alarm_sound_mod": SoundMode(fetch_key(["STATUS", "alarmSoundMode"], -1)).name,
+        "encrypted": bool(fetch_key(["STATUS", "isEncrypt"])),
+        "encrypted_pwd_hash": fetch_key(["STATUS", "encryptPwd"]),
+        "local_ip": computed["local_ip"],
+        "wan_ip": computed["wan_ip"],
+        "supportExt": fetch_key(["deviceInfos", "supportExt"]),
+        "optionals": fetch_key(["STATUS", "optionals"]),
+        "switches": computed["switches"],
+        "mac_address": fetch_key(["deviceInfos", "mac"]),
+        "offline_notify": bool(fetch_key(["deviceInfos", "offlineNotify"])),
+        "last_offline_time": fetch_key(["deviceInfos", "offlineTime"]),
+        "local_rtsp_port": (
+            "554"
+            if (port := fetch_key(["CONNECTION", "localRtspPort"], "554"))
+            in (0, "0", None)
+            else str(port)
+        ),
+        "supported_channels": fetch_key(["deviceInfos", "channelNumber"]),
+        "battery_level": fetch_key(["STATUS", "optionals", "powerRemaining"]),
+        "PIR_Status": fetch_key(["STATUS", "pirStatus"]),
+        "Motion_Trigger": computed["Motion_Trigger"],
+        "Seconds_Last_Trigger": computed["Seconds_Last_Trigger"],
+        "last_alarm_time": computed["last_alarm_time"],
+        "last_alarm_pic": computed["last_alarm_pic"],
+        "last_alarm_type_code": computed["last_alarm_type_code"],
+        "last_alarm_type_name": computed["last_alarm_type_name"],
+        "cam_timezone": fetch_key(["STATUS", "optionals", "timeZone"]),
+        "push_notify_alarm": not bool(fetch_key(["NODISTURB", "alarmEnable"])),
+        "push_notify_call": not bool(fetch_key(["NODISTURB", "callingEnable"])),
+        "alarm_light_luminance": fetch_key(
+            ["STATUS", "optionals", "Alarm_Light", "luminance"]
+        ),
+        "Alarm_DetectHumanCar": fetch_key(
+            ["STATUS", "optionals", "Alarm_DetectHumanCar", "type"]
+        ),
+        "diskCapacity": string_to_list(
+            fetch_key(["STATUS", "optionals", "diskCapacity"])
+        ),
+        "NightVision_Model": fetch_key(["STATUS", "optionals", "NightVision_Model"]),
+        "battery_camera_work_mode": fetch_key(
+            ["STATUS", "optionals", "batteryCameraWorkMode"], -1
+        ),
+        "Alarm_AdvancedDetect": fetch_key(
+            ["STATUS", "optionals", "Alarm_AdvancedDetect", "type"]
+        ),
+        "resouceid": fetch_key(["resourceInfos", 0, "resourceId"]),
+    }
+    source_map = dict(device)
+    for key, value in source_map.items():
+        if key not in data:
+            data[key] = value
+    return data
+
+
+def _current_status(device: dict[str, Any], computed: dict[str, Any]) -> dict[str, Any]:
+    data = project_status(device, computed)
+    for key, value in device.items():
+        if key not in data:
+            data[key] = value
+    return data
+
+
+def _current_record(device: dict[str, Any], computed: dict[str, Any]) -> Any:
+    return CameraStatusRecord(_project_values(device, computed), device)
+
+
+def bench_status_projection(number: int = 20000) -> list[dict[str, Any]]:
+    """Per-call time and traced allocations of the status() projection."""
+    device, computed = SAMPLE_DEVICE, SAMPLE_COMPUTED
+    assert _reference_status(device, computed) == _current_status(device, computed)
+
+    def reference() -> dict[str, Any]:
+        return _reference_status(device, computed)
+
+    def current() -> dict[str, Any]:
+        return _current_status(device, computed)
+
+    def record() -> Any:
+        return _current_record(device, computed)
+
+    assert record().as_dict() == current()
+    baseline = _timeit(reference, number)
+    return [
+        {**_row("reference (fetch_key per field + copy)", baseline), **_alloc(reference)},
+        {
+            **_row("compiled projection, sections by reference", _timeit(current, number), baseline),
+            **_alloc(current),
+        },
+        {
+            **_row("slotted CameraStatusRecord", _timeit(record, number), baseline),
+            **_alloc(record),
+        },
+    ]
+
+
+def _synthetic_account(count: int) -> dict[str, dict[str, Any]]:
+    """Return a pagelist of ``count`` distinct devices shaped like SAMPLE_DEVICE."""
+    template = json.dumps(SAMPLE_DEVICE)
+    account: dict[str, dict[str, Any]] = {}
+    for idx in range(count):
+        device = json.loads(template)
+        serial = f"BD{idx:07d}"
+        device["deviceInfos"]["deviceSerial"] = serial
+        device["SWITCH"] = [{"type": 7, "enable": False}, {"type": 22, "enable": True}]
+        account[serial] = device
+    return account
+
+
+def bench_account_memory(count: int = 1000, number: int = 5) -> list[dict[str, Any]]:
+    """Memory held by records + cameras + statuses for a large account.
+
+    The reference copies each payload into the camera (``dict(rec.raw)``),
+    as ``load_devices`` used to; the current path shares one read-only view.
+    """
+    account = _synthetic_account(count)
+
+    def reference() -> Any:
+        records = build_device_records_map(account)
+        cameras = {s: EzvizCamera(None, s, dict(r.raw)) for s, r in records.items()}  # type: ignore[arg-type]
+        return records, cameras, {s: c.status(refresh=False) for s, c in cameras.items()}
+
+    def shared() -> Any:
+        records = build_device_records_map(account)
+        cameras = {s: EzvizCamera(None, s, r.raw) for s, r in records.items()}  # type: ignore[arg-type]
+        return records, cameras, {s: c.status(refresh=False) for s, c in cameras.items()}
+
+    def shared_records() -> Any:
+        records = build_device_records_map(account)
+        cameras = {s: EzvizCamera(None, s, r.raw) for s, r in records.items()}  # type: ignore[arg-type]
+        return records, cameras, {s: c.status_record(refresh=False) for s, c in cameras.items()}
+
+    baseline = _timeit(reference, number)
+    return [
+        {**_row(f"{count} devices, payload copied per camera", baseline), **_alloc(reference)},
+        {**_row("shared read-only payload", _timeit(shared, number), baseline), **_alloc(shared)},
+        {
+            **_row("shared payload + CameraStatusRecord", _timeit(shared_records, number), baseline),
+            **_alloc(shared_records),
+        },
+    ]
+
+
+def _reference_record(serial: str, data: dict[str, Any]) -> EzvizDeviceRecord:
+    device_infos = data.get("deviceInfos", {}) or {}
+    status = (data.get("STATUS", {}) or {})
+    optionals = status.get("optionals") if isinstance(status, dict) else None
+    switches_list = data.get("SWITCH") or []
+    switches: dict[int, bool] = {}
+    for item in switches_list if isinstance(switches_list, list) else []:
+        t = item.get("type")
+        en = item.get("enable")
+        if isinstance(t, int) and isinstance(en, (bool, int)):
+            switches[t] = bool(en)
+    return EzvizDeviceRecord(
+        serial=serial,
+        name=device_infos.get("name"),
+        device_category=device_infos.get("deviceCategory") or device_infos.get("device_category"),
+        device_sub_category=device_infos.get("deviceSubCategory") or device_infos.get("device_sub_category"),
+        version=device_infos.get("version"),
+        status=device_infos.get("status") or status.get("globalStatus") if isinstance(status, dict) else None,
+        support_ext=device_infos.get("supportExt"),
+        connection=data.get("CONNECTION"),
+        wifi=data.get("WIFI"),
+        qos=data.get("QOS"),
+        vtm=next(iter((data.get("VTM") or {}).values()), None),
+        cloud=next(iter((data.get("CLOUD") or {}).values()), None),
+        p2p=data.get("P2P"),
+        time_plan=data.get("TIME_PLAN"),
+        optionals=optionals if isinstance(optionals, dict) else None,
+        switches=switches,
+        raw=readonly_view(data),
+    )
+
+
+def bench_device_records(count: int = 1000, number: int = 20) -> list[dict[str, Any]]:
+    """Per-account build time of build_device_records_map on each refresh.
+
+    Every refresh parses a fresh pagelist, so the reuse row compares a new
+    but unchanged account against the previous build.
+    """
+    account = _synthetic_account(count)
+    refreshed = json.loads(json.dumps(account))
+    previous = build_device_records_map(account)
+    assert all(
+        _reference_record(s, p) == previous[s] for s, p in account.items()
+    )
+
+    def reference() -> Any:
+        return {s: _reference_record(s, p) for s, p in refreshed.items()}
+
+    def rebuilt() -> Any:
+        return build_device_records_map(refreshed)
+
+    def reused() -> Any:
+        return build_device_records_map(refreshed, previous)
+
+    baseline = _timeit(reference, number)
+    return [
+        {**_row(f"{count} devices, dataclass __init__", baseline), **_alloc(reference)},
+        {**_row("slotted, direct slot writes", _timeit(rebuilt, number), baseline), **_alloc(rebuilt)},
+        {**_row("unchanged payloads reused", _timeit(reused, number), baseline), **_alloc(reused)},
+    ]
+
+
+CASES: dict[str, Callable[[], list[dict[str, Any]]]] = {
+    "account-memory": bench_account_memory,
+    "device-records": bench_device_records,
+    "mqtt-decode": bench_mqtt_decode,
+    "status-projection": bench_status_projection,
+}
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point for the benchmarks."""
+    parser = argparse.ArgumentParser(prog="benchmarks")
+    parser.add_argument("case", choices=[*CASES, "all"])
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    selected = CASES if args.case == "all" else {args.case: CASES[args.case]}
+    results = {name: case() for name, case in selected.items()}
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+    for name, rows in results.items():
+        print(f"== {name}")
+        for row in rows:
+            extra = "".join(
+                f"  {key}={value}"
+                for key, value in row.items()
+                if key not in ("case", "us_per_call")
+            )
+            print(f"  {row['case']:<46}{row['us_per_call']:>10} us{extra}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+# ruff: noqa: T201
@@ -4,11 +4,14 @@ from __future__ import annotations
 
 import datetime
 import logging
+from collections.abc import Iterator, Mapping
+from operator import attrgetter
 from typing import TYPE_CHECKING, Any, Literal, TypedDict, cast
 
 from .constants import BatteryCameraWorkMode, DeviceSwitchType, SoundMode
 from .exceptions import PyEzvizError
-from .models import EzvizDeviceRecord
+from .feature import FeatureView, support_ext_value
+from .models import EzvizDeviceRecord, readonly_view
 from .utils import (
     compute_motion_from_alarm,
     fetch_nested_value,
@@ -76,6 +79,271 @@ class CameraStatus(TypedDict, total=False):
     # parallel curated aliases like 'wifiInfos', 'switches', or 'optionals'.
 
 
+_MISSING = object()
+
+# Placeholder path for fields computed in status() rather than read from the
+# pagelist mapping.
+_COMPUTED = None
+
+
+def _rtsp_port(port: Any) -> str:
+    return "554" if port in (0, "0", None) else str(port)
+
+
+# status() schema in output order: (key, path, default, convert). Fields with
+# a ``_COMPUTED`` path are filled from values prepared by status() itself.
+_STATUS_SCHEMA: tuple[tuple[str, tuple[Any, ...] | None, Any, Any], ...] = (
+    ("serial", _COMPUTED, None, None),
+    ("name", ("deviceInfos", "name"), None, None),
+    ("version", ("deviceInfos", "version"), None, None),
+    ("upgrade_available", ("UPGRADE", "isNeedUpgrade"), None, lambda v: v == 3),
+    ("status", ("deviceInfos", "status"), None, None),
+    ("device_category", ("deviceInfos", "deviceCategory"), None, None),
+    ("device_sub_category", ("deviceInfos", "deviceSubCategory"), None, None),
+    ("upgrade_percent", ("STATUS", "upgradeProcess"), None, None),
+    ("upgrade_in_progress", ("STATUS", "upgradeStatus"), None, lambda v: v == 0),
+    ("latest_firmware_info", ("UPGRADE", "upgradePackageInfo"), None, None),
+    ("alarm_notify", ("STATUS", "globalStatus"), None, bool),
+    ("alarm_schedules_enabled", _COMPUTED, None, None),
+    ("alarm_sound_mod", ("STATUS", "alarmSoundMode"), -1, lambda v: SoundMode(v).name),
+    ("encrypted", ("STATUS", "isEncrypt"), None, bool),
+    ("encrypted_pwd_hash", ("STATUS", "encryptPwd"), None, None),
+    ("local_ip", _COMPUTED, None, None),
+    ("wan_ip", _COMPUTED, None, None),
+    ("supportExt", ("deviceInfos", "supportExt"), None, None),
+    # Backwards-compatibility aliases
+    ("optionals", ("STATUS", "optionals"), None, None),
+    ("switches", _COMPUTED, None, None),
+    ("mac_address", ("deviceInfos", "mac"), None, None),
+    ("offline_notify", ("deviceInfos", "offlineNotify"), None, bool),
+    ("last_offline_time", ("deviceInfos", "offlineTime"), None, None),
+    ("local_rtsp_port", ("CONNECTION", "localRtspPort"), "554", _rtsp_port),
+    ("supported_channels", ("deviceInfos", "channelNumber"), None, None),
+    ("battery_level", ("STATUS", "optionals", "powerRemaining"), None, None),
+    ("PIR_Status", ("STATUS", "pirStatus"), None, None),
+    ("Motion_Trigger", _COMPUTED, None, None),
+    ("Seconds_Last_Trigger", _COMPUTED, None, None),
+    ("last_alarm_time", _COMPUTED, None, None),
+    ("last_alarm_pic", _COMPUTED, None, None),
+    ("last_alarm_type_code", _COMPUTED, None, None),
+    ("last_alarm_type_name", _COMPUTED, None, None),
+    ("cam_timezone", ("STATUS", "optionals", "timeZone"), None, None),
+    ("push_notify_alarm", ("NODISTURB", "alarmEnable"), None, lambda v: not v),
+    ("push_notify_call", ("NODISTURB", "callingEnable"), None, lambda v: not v),
+    (
+        "alarm_light_luminance",
+        ("STATUS", "optionals", "Alarm_Light", "luminance"),
+        None,
+        None,
+    ),
+    (
+        "Alarm_DetectHumanCar",
+        ("STATUS", "optionals", "Alarm_DetectHumanCar", "type"),
+        None,
+        None,
+    ),
+    ("diskCapacity", ("STATUS", "optionals", "diskCapacity"), None, string_to_list),
+    ("NightVision_Model", ("STATUS", "optionals", "NightVision_Model"), None, None),
+    (
+        "battery_camera_work_mode",
+        ("STATUS", "optionals", "batteryCameraWorkMode"),
+        -1,
+        None,
+    ),
+    (
+        "Alarm_AdvancedDetect",
+        ("STATUS", "optionals", "Alarm_AdvancedDetect", "type"),
+        None,
+        None,
+    ),
+    ("resouceid", ("resourceInfos", 0, "resourceId"), None, None),
+)
+
+
+def _step(node: Any, key: Any) -> Any:
+    try:
+        return node[key]
+    except (KeyError, IndexError, TypeError):
+        return _MISSING
+
+
+def _compile_status_projection(
+    schema: tuple[tuple[str, tuple[Any, ...] | None, Any, Any], ...],
+) -> tuple[
+    tuple[tuple[int, Any], ...],
+    tuple[tuple[str, int, Any, Any, Any], ...],
+]:
+    """Compile ``schema`` into a prefix plan and per-field extractors.
+
+    Every distinct path prefix (``STATUS``, ``STATUS.optionals``, ...) is
+    resolved once per call, each from its parent's node, and fields then
+    read a single leaf key from their prefix node. Computed fields get a
+    prefix index of ``-1``.
+    """
+    prefixes: dict[tuple[Any, ...], int] = {}
+    plan: list[tuple[int, Any]] = []
+
+    def prefix_index(prefix: tuple[Any, ...]) -> int:
+        if not prefix:
+            return -1
+        found = prefixes.get(prefix)
+        if found is None:
+            parent = prefix_index(prefix[:-1])
+            found = prefixes[prefix] = len(plan)
+            plan.append((parent, prefix[-1]))
+        return found
+
+    fields = []
+    for key, path, default, convert in schema:
+        if path is None:
+            fields.append((key, -2, None, default, convert))
+        else:
+            fields.append((key, prefix_index(path[:-1]), path[-1], default, convert))
+    return tuple(plan), tuple(fields)
+
+
+_STATUS_PREFIXES, _STATUS_FIELDS = _compile_status_projection(_STATUS_SCHEMA)
+
+
+_STATUS_KEYS: tuple[str, ...] = tuple(field[0] for field in _STATUS_SCHEMA)
+_STATUS_INDEX: dict[str, int] = {key: idx for idx, key in enumerate(_STATUS_KEYS)}
+# Fields a typed EzvizDeviceRecord overrides: (status key, record attribute).
+_RECORD_OVERRIDES = (
+    ("name", "name"),
+    ("version", "version"),
+    ("status", "status"),
+    ("device_category", "device_category"),
+    ("device_sub_category", "device_sub_category"),
+    ("supportExt", "support_ext"),
+)
+
+
+def _project_values(device: Mapping[str, Any], computed: Mapping[str, Any]) -> list[Any]:
+    """Apply the compiled status schema, returning values in ``_STATUS_KEYS`` order."""
+    nodes: list[Any] = []
+    append = nodes.append
+    for parent, key in _STATUS_PREFIXES:
+        base = device if parent < 0 else nodes[parent]
+        # .get fast path (dicts and the read-only top-level view); _step
+        # covers lists and odd shapes.
+        if type(base) is dict or base is device:
+            append(base.get(key, _MISSING))
+        else:
+            append(_MISSING if base is _MISSING else _step(base, key))
+    values: list[Any] = []
+    put = values.append
+    for key, prefix, leaf, default, convert in _STATUS_FIELDS:
+        if prefix == -2:
+            put(computed[key])
+            continue
+        base = device if prefix < 0 else nodes[prefix]
+        if type(base) is dict or base is device:
+            value = base.get(leaf, _MISSING)
+        else:
+            value = _MISSING if base is _MISSING else _step(base, leaf)
+        if value is _MISSING:
+            value = default
+        put(value if convert is None else convert(value))
+    return values
+
+
+def project_status(
+    device: Mapping[str, Any], computed: Mapping[str, Any]
+) -> dict[str, Any]:
+    """Apply the compiled status schema to a pagelist ``device`` mapping.
+
+    ``computed`` supplies the values of the schema's computed fields.
+    """
+    return dict(zip(_STATUS_KEYS, _project_values(device, computed), strict=True))
+
+
+class CameraStatusRecord(Mapping[str, Any]):
+    """Immutable, slotted alternative to the :class:`CameraStatus` dict.
+
+    Curated fields are slots with the same names as the dict keys
+    (``record.local_ip``, ``record["local_ip"]``). Raw pagelist sections
+    are not merged in; they are looked up lazily in the source mapping
+    (``record["WIFI"]``, ``record.WIFI``, :attr:`raw`). Items match
+    :meth:`EzvizCamera.status`, so dict consumers keep working, and
+    :meth:`as_dict` returns the plain dict.
+    """
+
+    __slots__ = (*_STATUS_KEYS, "_raw")
+
+    def __init__(self, values: list[Any], raw: Mapping[str, Any]) -> None:
+        """Create a record from projected ``values`` and the source mapping."""
+        for setter, value in zip(_STATUS_SETTERS, values):
+            setter(self, value)
+        object.__setattr__(self, "_raw", raw)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Reject attribute assignment."""
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        """Reject attribute deletion."""
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __getattr__(self, name: str) -> Any:
+        """Resolve raw pagelist sections (only called for non-slot names)."""
+        if name.startswith("__"):
+            raise AttributeError(name)
+        raw = object.__getattribute__(self, "_raw")
+        if name in raw:
+            return raw[name]
+        raise AttributeError(name)
+
+    @property
+    def raw(self) -> Mapping[str, Any]:
+        """Source pagelist mapping (shared, treat as read-only)."""
+        return self._raw
+
+    def __getitem__(self, key: str) -> Any:
+        """Return a curated field or, failing that, a raw section."""
+        if key in _STATUS_INDEX:
+            return object.__getattribute__(self, key)
+        return self._raw[key]
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate curated keys, then raw keys not shadowed by them."""
+        yield from _STATUS_KEYS
+        for key in self._raw:
+            if key not in _STATUS_INDEX:
+                yield key
+
+    def __len__(self) -> int:
+        """Return the number of keys, as in the equivalent status dict."""
+        return len(_STATUS_KEYS) + sum(
+            1 for key in self._raw if key not in _STATUS_INDEX
+        )
+
+    def as_dict(self) -> CameraStatus:
+        """Return the equivalent :meth:`EzvizCamera.status` dict."""
+        data: dict[str, Any] = dict(zip(_STATUS_KEYS, _STATUS_GETTER(self)))
+        for key, value in self._raw.items():
+            if key not in data:
+                data[key] = value
+        return cast(CameraStatus, data)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        """Support pickling and copying despite the immutable attributes."""
+        return (type(self), (list(_STATUS_GETTER(self)), dict(self._raw)))
+
+    def __repr__(self) -> str:
+        """Return a short debug representation."""
+        return (
+            f"CameraStatusRecord(serial={self.serial!r}, name={self.name!r}, "
+            f"status={self.status!r})"
+        )
+
+
+_STATUS_GETTER = attrgetter(*_STATUS_KEYS)
+# Slot descriptors' __set__ bypasses the immutable __setattr__ above.
+_STATUS_SETTERS = tuple(
+    getattr(CameraStatusRecord, key).__set__ for key in _STATUS_KEYS
+)
+
+
 class EzvizCamera:
     """Representation of an Ezviz camera device.
 
@@ -106,15 +374,21 @@ class EzvizCamera:
         }
         self._record: EzvizDeviceRecord | None = None
 
+        # The pagelist payload is shared with the client and the record, never
+        # copied: keep a read-only view of it.
         if device_obj is None:
-            self._device = self._client.get_device_infos(self._serial)
+            self._device = readonly_view(self._client.get_device_infos(self._serial))
         elif isinstance(device_obj, EzvizDeviceRecord):
             # Accept either a typed record or the original dict
             self._record = device_obj
-            self._device = dict(device_obj.raw)
+            self._device = readonly_view(device_obj.raw)
         else:
-            self._device = device_obj or {}
+            self._device = readonly_view(device_obj)
         self._last_alarm: dict[str, Any] = {}
+        # True when the last fetch returned an alarm not seen before
+        self._alarm_is_new = False
+        # Decoded feature sections, built on first use and dropped with the camera
+        self._features: FeatureView | None = None
         self._switch: dict[int, bool] = {}
         if self._record and getattr(self._record, "switches", None):
             self._switch = {int(k): bool(v) for k, v in self._record.switches.items()}
@@ -129,6 +403,21 @@ class EzvizCamera:
                     if isinstance(t, int) and isinstance(en, (bool, int)):
                         self._switch[t] = bool(en)
 
+    def feature_view(self) -> FeatureView:
+        """Return the :class:`FeatureView` of this camera's device payload.
+
+        Pass it to the ``feature`` helpers so their decoded sections are
+        shared for as long as the camera lives.
+        """
+        if self._features is None:
+            self._features = FeatureView(self._device)
+        return self._features
+
+    def support_ext_value(self, ext_key: str) -> str | None:
+        """Return a supportExt entry, via the client's compiled index if built."""
+        index = self._client.capabilities(self._serial) if self._client else None
+        return support_ext_value(self._device, ext_key, index)
+
     def fetch_key(self, keys: list[Any], default_value: Any = None) -> Any:
         """Fetch dictionary key."""
         return fetch_nested_value(self._device, keys, default_value)
@@ -146,13 +435,28 @@ class EzvizCamera:
         total = fetch_nested_value(_alarmlist, ["page", "totalResults"], 0)
         if total and total > 0:
             self._last_alarm = _alarmlist.get("alarms", [{}])[0]
+            # The last alarm stays the sensor state either way; the client's
+            # deduplicator (shared with push and backfill) only tells whether
+            # it is a new event.
+            self._alarm_is_new = self._client.event_dedup.is_new(
+                self._last_alarm, self._serial
+            )
             _LOGGER.debug(
-                "Fetched last alarm for %s: %s", self._serial, self._last_alarm
+                "Fetched last alarm for %s (new=%s): %s",
+                self._serial,
+                self._alarm_is_new,
+                self._last_alarm,
             )
             self._motion_trigger()
         else:
+            self._alarm_is_new = False
             _LOGGER.debug("No alarms found for %s", self._serial)
 
+    @property
+    def alarm_is_new(self) -> bool:
+        """True if the last alarm refresh found an alarm not handled before."""
+        return self._alarm_is_new
+
     def _local_ip(self) -> str:
         """Fix empty ip value for certain cameras."""
         wifi = (self._record.wifi if self._record else self._device.get("WIFI")) or {}
@@ -191,6 +495,23 @@ class EzvizCamera:
         tz_val = self.fetch_key(["STATUS", "optionals", "timeZone"])
         return parse_timezone_value(tz_val)
 
+    def _alarm_fields(self) -> dict[str, Any]:
+        """Return the status keys derived from the last fetched alarm."""
+        return {
+            "Motion_Trigger": self._alarmmotiontrigger["alarm_trigger_active"],
+            "Seconds_Last_Trigger": self._alarmmotiontrigger["timepassed"],
+            # Keep last_alarm_time in sync with the time actually used to
+            # compute Motion_Trigger/Seconds_Last_Trigger.
+            "last_alarm_time": self._alarmmotiontrigger.get("last_alarm_time_str")
+            or self._last_alarm.get("alarmStartTimeStr"),
+            "last_alarm_pic": self._last_alarm.get(
+                "picUrl",
+                "https://eustatics.ezvizlife.com/ovs_mall/web/img/index/EZVIZ_logo.png?ver=3007907502",
+            ),
+            "last_alarm_type_code": self._last_alarm.get("alarmType", "0000"),
+            "last_alarm_type_name": self._last_alarm.get("sampleName", "NoAlarm"),
+        }
+
     def _is_alarm_schedules_enabled(self) -> bool:
         """Check if alarm schedules enabled."""
         plans = self.fetch_key(["TIME_PLAN"], []) or []
@@ -204,6 +525,40 @@ class EzvizCamera:
         )
         return bool(sched and sched.get("enable"))
 
+    def _status_inputs(self) -> tuple[Mapping[str, Any], dict[str, Any]]:
+        """Return the source mapping and computed fields for the projection."""
+        record = self._record
+        conn = (record.connection if record else self._device.get("CONNECTION")) or {}
+        computed = {
+            "serial": self._serial,
+            "alarm_schedules_enabled": self._is_alarm_schedules_enabled(),
+            "local_ip": self._local_ip(),
+            "wan_ip": conn.get("netIp") or self.fetch_key(["CONNECTION", "netIp"]),
+            "switches": self._switch,
+            **self._alarm_fields(),
+        }
+        return (record.raw if record else self._device), computed
+
+    def status_record(self, refresh: bool = True) -> CameraStatusRecord:
+        """Return the status as an immutable :class:`CameraStatusRecord`.
+
+        Same fields and values as :meth:`status`, without building the dict
+        or merging the raw sections into it.
+
+        Raises:
+            InvalidURL: If the API endpoint/connection is invalid while refreshing.
+            HTTPError: If the API returns a non-success HTTP status while refreshing.
+            PyEzvizError: On Ezviz API contract errors or decoding failures.
+        """
+        if refresh:
+            self._alarm_list()
+        source, computed = self._status_inputs()
+        values = _project_values(source, computed)
+        if self._record:
+            for key, attr in _RECORD_OVERRIDES:
+                values[_STATUS_INDEX[key]] = getattr(self._record, attr)
+        return CameraStatusRecord(values, source)
+
     def status(self, refresh: bool = True) -> CameraStatus:
         """Return the status of the camera.
 
@@ -217,125 +572,18 @@ class EzvizCamera:
         if refresh:
             self._alarm_list()
 
-        name = (
-            self._record.name
-            if self._record
-            else self.fetch_key(["deviceInfos", "name"])
-        )
-        version = (
-            self._record.version
-            if self._record
-            else self.fetch_key(["deviceInfos", "version"])
-        )
-        dev_status = (
-            self._record.status
-            if self._record
-            else self.fetch_key(["deviceInfos", "status"])
-        )
-        device_category = (
-            self._record.device_category
-            if self._record
-            else self.fetch_key(["deviceInfos", "deviceCategory"])
-        )
-        device_sub_category = (
-            self._record.device_sub_category
-            if self._record
-            else self.fetch_key(["deviceInfos", "deviceSubCategory"])
-        )
-        conn = (
-            self._record.connection if self._record else self._device.get("CONNECTION")
-        ) or {}
-        wan_ip = conn.get("netIp") or self.fetch_key(["CONNECTION", "netIp"])
-
-        data: dict[str, Any] = {
-            "serial": self._serial,
-            "name": name,
-            "version": version,
-            "upgrade_available": bool(
-                self.fetch_key(["UPGRADE", "isNeedUpgrade"]) == 3
-            ),
-            "status": dev_status,
-            "device_category": device_category,
-            "device_sub_category": device_sub_category,
-            "upgrade_percent": self.fetch_key(["STATUS", "upgradeProcess"]),
-            "upgrade_in_progress": bool(
-                self.fetch_key(["STATUS", "upgradeStatus"]) == 0
-            ),
-            "latest_firmware_info": self.fetch_key(["UPGRADE", "upgradePackageInfo"]),
-            "alarm_notify": bool(self.fetch_key(["STATUS", "globalStatus"])),
-            "alarm_schedules_enabled": self._is_alarm_schedules_enabled(),
-            "alarm_sound_mod": SoundMode(
-                self.fetch_key(["STATUS", "alarmSoundMode"], -1)
-            ).name,
-            "encrypted": bool(self.fetch_key(["STATUS", "isEncrypt"])),
-            "encrypted_pwd_hash": self.fetch_key(["STATUS", "encryptPwd"]),
-            "local_ip": self._local_ip(),
-            "wan_ip": wan_ip,
-            "supportExt": (
-                self._record.support_ext
-                if self._record
-                else self.fetch_key(
-                    ["deviceInfos", "supportExt"]
-                )  # convenience top-level
-            ),
-            # Backwards-compatibility aliases
-            "optionals": self.fetch_key(["STATUS", "optionals"]),
-            "switches": self._switch,
-            "mac_address": self.fetch_key(["deviceInfos", "mac"]),
-            "offline_notify": bool(self.fetch_key(["deviceInfos", "offlineNotify"])),
-            "last_offline_time": self.fetch_key(["deviceInfos", "offlineTime"]),
-            "local_rtsp_port": (
-                "554"
-                if (port := self.fetch_key(["CONNECTION", "localRtspPort"], "554"))
-                in (0, "0", None)
-                else str(port)
-            ),
-            "supported_channels": self.fetch_key(["deviceInfos", "channelNumber"]),
-            "battery_level": self.fetch_key(["STATUS", "optionals", "powerRemaining"]),
-            "PIR_Status": self.fetch_key(["STATUS", "pirStatus"]),
-            "Motion_Trigger": self._alarmmotiontrigger["alarm_trigger_active"],
-            "Seconds_Last_Trigger": self._alarmmotiontrigger["timepassed"],
-            # Keep last_alarm_time in sync with the time actually used to
-            # compute Motion_Trigger/Seconds_Last_Trigger.
-            "last_alarm_time": self._alarmmotiontrigger.get("last_alarm_time_str")
-            or self._last_alarm.get("alarmStartTimeStr"),
-            "last_alarm_pic": self._last_alarm.get(
-                "picUrl",
-                "https://eustatics.ezvizlife.com/ovs_mall/web/img/index/EZVIZ_logo.png?ver=3007907502",
-            ),
-            "last_alarm_type_code": self._last_alarm.get("alarmType", "0000"),
-            "last_alarm_type_name": self._last_alarm.get("sampleName", "NoAlarm"),
-            "cam_timezone": self.fetch_key(["STATUS", "optionals", "timeZone"]),
-            "push_notify_alarm": not bool(self.fetch_key(["NODISTURB", "alarmEnable"])),
-            "push_notify_call": not bool(
-                self.fetch_key(["NODISTURB", "callingEnable"])
-            ),
-            "alarm_light_luminance": self.fetch_key(
-                ["STATUS", "optionals", "Alarm_Light", "luminance"]
-            ),
-            "Alarm_DetectHumanCar": self.fetch_key(
-                ["STATUS", "optionals", "Alarm_DetectHumanCar", "type"]
-            ),
-            "diskCapacity": string_to_list(
-                self.fetch_key(["STATUS", "optionals", "diskCapacity"])
-            ),
-            "NightVision_Model": self.fetch_key(
-                ["STATUS", "optionals", "NightVision_Model"]
-            ),
-            "battery_camera_work_mode": self.fetch_key(
-                ["STATUS", "optionals", "batteryCameraWorkMode"], -1
-            ),
-            "Alarm_AdvancedDetect": self.fetch_key(
-                ["STATUS", "optionals", "Alarm_AdvancedDetect", "type"]
-            ),
-            "resouceid": self.fetch_key(["resourceInfos", 0, "resourceId"]),
-        }
+        source, computed = self._status_inputs()
+        data = project_status(source, computed)
+        if self._record:
+            # Typed record values win over the raw pagelist lookups.
+            for key, attr in _RECORD_OVERRIDES:
+                data[key] = getattr(self._record, attr)
 
         # Include all top-level keys from the pagelist/device mapping to allow
         # consumers to access new fields without library updates. We do not
-        # overwrite curated keys above if there is a name collision.
-        source_map = dict(self._record.raw) if self._record else dict(self._device)
-        for key, value in source_map.items():
+        # overwrite curated keys above if there is a name collision. Sections
+        # are attached by reference, not copied.
+        for key, value in source.items():
             if key not in data:
                 data[key] = value
 
@@ -344,6 +592,31 @@ class EzvizCamera:
     # essential_status() was removed in favor of including all top-level
     # pagelist keys directly in status().
 
+    def liveness(self, status: int | None = None, refresh: bool = True) -> dict[str, Any]:
+        """Return the cheap subset of :meth:`status`: online state and alarm keys.
+
+        status: online state from a batched ``get_devices_status`` call; when
+            None the (possibly stale) pagelist value is used.
+        refresh: if True, fetches the latest alarm first (one request).
+
+        Merge the result over the last full :meth:`status` to keep it current
+        between full refreshes.
+
+        Raises:
+            InvalidURL: If the API endpoint/connection is invalid while refreshing.
+            HTTPError: If the API returns a non-success HTTP status while refreshing.
+            PyEzvizError: On Ezviz API contract errors or decoding failures.
+        """
+        if refresh:
+            self._alarm_list()
+        if status is None:
+            status = (
+                self._record.status
+                if self._record
+                else self.fetch_key(["deviceInfos", "status"])
+            )
+        return {"status": status, **self._alarm_fields()}
+
     def move(
         self, direction: Literal["right", "left", "down", "up"], speed: int = 5
     ) -> bool:
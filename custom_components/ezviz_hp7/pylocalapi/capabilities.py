@@ -0,0 +1,133 @@
+"""Compiled capability index over a device's ``supportExt`` mapping.
+
+``supportExt`` arrives as a JSON object of string keys (the numeric values
+of :class:`~.constants.SupportExt`) to string values, almost all ``"0"`` or
+``"1"``. :class:`CapabilityIndex` folds it into two integer bitsets plus a
+small dict for the few non-boolean values, so a check such as
+``index.supports(SupportExt.SupportChangeVoice)`` is a shift and a mask.
+
+:class:`EzvizClient` keeps one index per serial and rebuilds it only when
+the device's firmware version (or the raw ``supportExt`` string) changes::
+
+    >>> client.get_device_infos()
+    >>> client.capabilities("BD1234567").supports(SupportExt.SupportTalk)
+    True
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Mapping
+from typing import Any
+
+from .constants import SupportExt
+
+
+# Keys above this go to the string side table: bitsets stay small.
+_MAX_EXT_KEY = max(member.value for member in SupportExt) + 1024
+
+
+def _ext_key(ext: SupportExt | int | str) -> int | None:
+    """Return the numeric supportExt key for a member, int or decimal string.
+
+    Negative or out-of-range numbers are not bitset keys and return None.
+    """
+    if isinstance(ext, SupportExt):
+        return ext.value
+    if isinstance(ext, int):
+        key = ext
+    elif isinstance(ext, str) and ext.isdecimal():
+        try:
+            key = int(ext)
+        except ValueError:
+            return None
+    else:
+        return None
+    return key if 0 <= key <= _MAX_EXT_KEY else None
+
+
+class CapabilityIndex:
+    """Immutable, constant-time view of one device's ``supportExt`` entries."""
+
+    __slots__ = ("_enabled", "_extra", "_present", "_values", "version")
+
+    def __init__(
+        self,
+        support_ext: Mapping[str, Any] | None,
+        version: str | None = None,
+    ) -> None:
+        """Compile ``support_ext`` (decoded mapping) for firmware ``version``."""
+        present = 0
+        enabled = 0
+        values: dict[int, str] = {}
+        extra: dict[str, str] = {}
+        for raw_key, raw_value in (support_ext or {}).items():
+            value = "" if raw_value is None else str(raw_value)
+            key = _ext_key(str(raw_key))
+            if key is None:
+                # Non-numeric (or out-of-range) keys are not SupportExt
+                # members; keep them as-is.
+                extra[str(raw_key)] = value
+                continue
+            present |= 1 << key
+            if value not in ("", "0"):
+                enabled |= 1 << key
+            if value not in ("0", "1"):
+                values[key] = value
+        self.version = version
+        self._present = present
+        self._enabled = enabled
+        self._values = values
+        self._extra = extra
+
+    def __contains__(self, ext: object) -> bool:
+        """Return True if ``ext`` is listed in supportExt at all."""
+        key = _ext_key(ext)  # type: ignore[arg-type]
+        if key is None:
+            return isinstance(ext, str) and ext in self._extra
+        return bool(self._present >> key & 1)
+
+    def supports(self, ext: SupportExt | int | str) -> bool:
+        """Return True if ``ext`` is listed with a value other than ``"0"``."""
+        key = _ext_key(ext)
+        if key is None:
+            return self._extra.get(str(ext), "0") not in ("", "0")
+        return bool(self._enabled >> key & 1)
+
+    def value(self, ext: SupportExt | int | str) -> str | None:
+        """Return the raw string value of ``ext``, or None when not listed."""
+        key = _ext_key(ext)
+        if key is None:
+            return self._extra.get(str(ext))
+        if not self._present >> key & 1:
+            return None
+        found = self._values.get(key)
+        if found is not None:
+            return found
+        return "1" if self._enabled >> key & 1 else "0"
+
+    def enabled(self) -> Iterator[SupportExt]:
+        """Yield the known :class:`SupportExt` members the device supports."""
+        for member in SupportExt:
+            if self._enabled >> member.value & 1:
+                yield member
+
+    def as_dict(self) -> dict[str, str]:
+        """Return the index back as a ``supportExt``-shaped mapping."""
+        out: dict[str, str] = {}
+        bits = self._present
+        while bits:
+            # Visit set bits only, lowest first
+            low = bits & -bits
+            key = low.bit_length() - 1
+            out[str(key)] = self.value(key)  # type: ignore[assignment]
+            bits ^= low
+        out.update(self._extra)
+        return out
+
+    def __repr__(self) -> str:
+        """Return a short debug representation."""
+        return (
+            f"CapabilityIndex(version={self.version!r}, "
+            f"listed={self._present.bit_count()}, "
+            f"enabled={self._enabled.bit_count()})"
+        )
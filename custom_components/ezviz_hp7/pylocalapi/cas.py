@@ -15,6 +15,7 @@ import xmltodict
 
 from .constants import FEATURE_CODE, XOR_KEY
 from .exceptions import InvalidHost, PyEzvizError
+from .tracing import NOOP_TRACER, TraceHooks
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -28,9 +29,12 @@ def xor_enc_dec(msg: bytes, xor_key: bytes = XOR_KEY) -> bytes:
 class EzvizCAS:
     """Ezviz CAS server client."""
 
-    def __init__(self, token: dict[str, Any] | None) -> None:
+    def __init__(
+        self, token: dict[str, Any] | None, tracer: TraceHooks | None = None
+    ) -> None:
         """Initialize the client object."""
         self._session = None
+        self._tracer = tracer or NOOP_TRACER
         self._token: dict[str, Any] = token or {
             "session_id": None,
             "rf_session_id": None,
@@ -43,6 +47,32 @@ class EzvizCAS:
             )
         self._service_urls: dict[str, Any] = token["service_urls"]
 
+    def _connect(self) -> ssl.SSLSocket:
+        """Open a TLS connection to the CAS server."""
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS)
+        context.set_ciphers(
+            "DEFAULT:!aNULL:!eNULL:!MD5:!3DES:!DES:!RC4:!IDEA:!SEED:!aDSS:!SRP:!PSK"
+        )
+
+        # Create a TCP/IP socket
+        host = cast(str, self._service_urls["sysConf"][15])
+        port = cast(int, self._service_urls["sysConf"][16])
+        span = (
+            self._tracer.start_span("cas.connect", host=host, port=port)
+            if self._tracer.enabled
+            else None
+        )
+        try:
+            my_socket = socket.create_connection((host, port))
+            my_socket = context.wrap_socket(my_socket, server_hostname=host)
+        except OSError as err:
+            if span is not None:
+                self._tracer.end_span(span, error=type(err).__name__)
+            raise
+        if span is not None:
+            self._tracer.end_span(span)
+        return my_socket
+
     def cas_get_encryption(self, devserial: str) -> dict[str, Any]:
         """Fetch encryption code from EZVIZ CAS server."""
         # Random hex 64 characters long.
@@ -63,28 +93,38 @@ class EzvizCAS:
 
         payload_end_padding = rand_hex_str.encode("latin1")
 
-        context = ssl.SSLContext(ssl.PROTOCOL_TLS)
-        context.set_ciphers(
-            "DEFAULT:!aNULL:!eNULL:!MD5:!3DES:!DES:!RC4:!IDEA:!SEED:!aDSS:!SRP:!PSK"
-        )
-
-        # Create a TCP/IP socket
-        host = cast(str, self._service_urls["sysConf"][15])
-        port = cast(int, self._service_urls["sysConf"][16])
-        my_socket = socket.create_connection((host, port))
-        my_socket = context.wrap_socket(
-            my_socket, server_hostname=self._service_urls["sysConf"][15]
-        )
+        my_socket = self._connect()
 
         # Get CAS Encryption Key
+        request = payload + payload_end_padding
+        span = (
+            self._tracer.start_span(
+                "cas.exchange",
+                op="get_encryption",
+                serial=devserial,
+                request_bytes=len(request),
+            )
+            if self._tracer.enabled
+            else None
+        )
+        response_bytes = b""
+        error: str | None = None
         try:
-            my_socket.send(payload + payload_end_padding)
+            my_socket.send(request)
             response_bytes = my_socket.recv(1024)
             _LOGGER.debug("Get Encryption Key: %r", response_bytes)
         except (socket.gaierror, ConnectionRefusedError) as err:
+            error = type(err).__name__
             raise InvalidHost("Invalid IP or Hostname") from err
+        except BaseException as err:
+            error = type(err).__name__
+            raise
         finally:
             my_socket.close()
+            if span is not None:
+                self._tracer.end_span(
+                    span, response_bytes=len(response_bytes), error=error
+                )
 
         # Trim header, tail and convert xml to dict.
         body = response_bytes[32:-32]
@@ -127,18 +167,7 @@ class EzvizCAS:
             f"\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10"
         ).encode("latin1")
 
-        context = ssl.SSLContext(ssl.PROTOCOL_TLS)
-        context.set_ciphers(
-            "DEFAULT:!aNULL:!eNULL:!MD5:!3DES:!DES:!RC4:!IDEA:!SEED:!aDSS:!SRP:!PSK"
-        )
-
-        # Create a TCP/IP socket
-        host = cast(str, self._service_urls["sysConf"][15])
-        port = cast(int, self._service_urls["sysConf"][16])
-        my_socket = socket.create_connection((host, port))
-        my_socket = context.wrap_socket(
-            my_socket, server_hostname=self._service_urls["sysConf"][15]
-        )
+        my_socket = self._connect()
 
         cas_client = self.cas_get_encryption(serial)
 
@@ -152,13 +181,34 @@ class EzvizCAS:
         # Message encryption
         cipher = AES.new(aes_key, AES.MODE_CBC, iv_value)
 
+        span = (
+            self._tracer.start_span("cas.exchange", op="set_defence", serial=serial)
+            if self._tracer.enabled
+            else None
+        )
+        request = b""
+        response_bytes = b""
+        error: str | None = None
         try:
             enc_bytes = cipher.encrypt(defence_msg_string)
-            my_socket.send(payload + enc_bytes + payload_end_padding)
-            _LOGGER.debug("Set camera response: %r", my_socket.recv())
+            request = payload + enc_bytes + payload_end_padding
+            my_socket.send(request)
+            response_bytes = my_socket.recv()
+            _LOGGER.debug("Set camera response: %r", response_bytes)
         except (socket.gaierror, ConnectionRefusedError) as err:
+            error = type(err).__name__
             raise InvalidHost("Invalid IP or Hostname") from err
+        except BaseException as err:
+            error = type(err).__name__
+            raise
         finally:
             my_socket.close()
+            if span is not None:
+                self._tracer.end_span(
+                    span,
+                    request_bytes=len(request),
+                    response_bytes=len(response_bytes),
+                    error=error,
+                )
 
         return True
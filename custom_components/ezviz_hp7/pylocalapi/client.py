@@ -3,10 +3,11 @@
 from __future__ import annotations
 
 from collections.abc import Callable, Mapping
-from datetime import datetime
+from datetime import datetime, timedelta
 import hashlib
 import json
 import logging
+import time
 from typing import Any, ClassVar, TypedDict, cast
 from urllib.parse import urlencode
 from uuid import uuid4
@@ -107,10 +108,12 @@ from .api_endpoints import (
     API_ENDPOINT_VIDEO_ENCRYPT,
 )
 from .camera import EzvizCamera
+from .capabilities import CapabilityIndex
 from .cas import EzvizCAS
 from .constants import (
     DEFAULT_TIMEOUT,
     FEATURE_CODE,
+    MAX_BACKFILL_PAGES,
     MAX_RETRIES,
     REQUEST_HEADER,
     DefenseModeType,
@@ -118,6 +121,7 @@ from .constants import (
     DeviceSwitchType,
     MessageFilterType,
 )
+from .dedup import EventDeduplicator
 from .exceptions import (
     DeviceException,
     EzvizAuthTokenExpired,
@@ -128,9 +132,11 @@ from .exceptions import (
 )
 from .feature import optionals_mapping
 from .light_bulb import EzvizLightBulb
+from .metrics import ClientMetrics, endpoint_label
 from .models import EzvizDeviceRecord, build_device_records_map
-from .mqtt import MQTTClient
-from .utils import convert_to_dict, deep_merge
+from .mqtt import MQTTClient, push_event_from_message
+from .tracing import NOOP_TRACER, TraceHooks, serial_hint
+from .utils import build_url, coerce_int, convert_to_dict, deep_merge
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -225,8 +231,16 @@ class EzvizClient:
         url: str = "apiieu.ezvizlife.com",
         timeout: int = DEFAULT_TIMEOUT,
         token: dict | None = None,
+        metrics: ClientMetrics | None = None,
+        tracer: TraceHooks | None = None,
     ) -> None:
-        """Initialize the client object."""
+        """Initialize the client object.
+
+        ``metrics`` may be shared between clients; a private registry is
+        created when omitted. ``tracer`` receives spans for every HTTP
+        attempt and is passed on to the MQTT and CAS helpers; the default is
+        a no-op.
+        """
         self.account = account
         self.password = (
             hashlib.md5(password.encode("utf-8")).hexdigest() if password else None
@@ -249,6 +263,16 @@ class EzvizClient:
         self._cameras: dict[str, Any] = {}
         self._light_bulbs: dict[str, Any] = {}
         self.mqtt_client: MQTTClient | None = None
+        self.metrics = metrics or ClientMetrics()
+        self.tracer: TraceHooks = tracer or NOOP_TRACER
+        # Shared by MQTT push, backfill and alarm polling consumers.
+        self.event_dedup = EventDeduplicator()
+        # serial -> (version, raw supportExt string, decoded mapping, index)
+        self._support_ext: dict[
+            str, tuple[Any, str, dict[str, Any], CapabilityIndex]
+        ] = {}
+        # Last get_device_records() build; unchanged devices reuse their record
+        self._device_records: dict[str, EzvizDeviceRecord] = {}
 
     def _login(self, smscode: int | None = None) -> dict[Any, Any]:
         """Login to Ezviz API."""
@@ -266,9 +290,16 @@ class EzvizClient:
             "smsCode": smscode,
         }
 
+        label = endpoint_label("POST", API_ENDPOINT_LOGIN)
+        span = (
+            self.tracer.start_span("http.request", endpoint=label, attempt=0)
+            if self.tracer.enabled
+            else None
+        )
+        started = time.perf_counter()
         try:
             req = self._session.post(
-                url=f"https://{self._token['api_url']}{API_ENDPOINT_LOGIN}",
+                url=self._url(API_ENDPOINT_LOGIN),
                 allow_redirects=False,
                 data=payload,
                 timeout=self._timeout,
@@ -277,11 +308,20 @@ class EzvizClient:
             req.raise_for_status()
 
         except requests.ConnectionError as err:
+            self._observe(label, started, span, None, error="connection")
             raise InvalidURL("A Invalid URL or Proxy error occurred") from err
 
         except requests.HTTPError as err:
+            self._observe(label, started, span, req, error=req.status_code)
             raise HTTPError from err
 
+        except requests.RequestException:
+            # Timeouts and other transport errors: close the span, then re-raise
+            self._observe(label, started, span, None, error="connection")
+            raise
+
+        self._observe(label, started, span, req)
+
         try:
             json_result = req.json()
 
@@ -357,6 +397,18 @@ class EzvizClient:
         individual endpoint behavior. Returns the Response for the caller to
         parse and validate according to its API contract.
         """
+        label = endpoint_label(method, url)
+        span = (
+            self.tracer.start_span(
+                "http.request",
+                endpoint=label,
+                serial=serial_hint(params, data, json_body),
+                attempt=max_retries,
+            )
+            if self.tracer.enabled
+            else None
+        )
+        started = time.perf_counter()
         try:
             req = self._session.request(
                 method=method,
@@ -368,14 +420,13 @@ class EzvizClient:
             )
             req.raise_for_status()
         except requests.HTTPError as err:
-            if (
-                retry_401
-                and err.response is not None
-                and err.response.status_code == 401
-            ):
+            status = err.response.status_code if err.response is not None else None
+            self._observe(label, started, span, err.response, error=status or "http")
+            if retry_401 and status == 401:
                 if max_retries >= MAX_RETRIES:
                     raise HTTPError from err
                 # Re-login and retry once
+                self.metrics.record_relogin(label)
                 self.login()
                 return self._http_request(
                     method,
@@ -387,9 +438,34 @@ class EzvizClient:
                     max_retries=max_retries + 1,
                 )
             raise HTTPError from err
+        except requests.RequestException:
+            self._observe(label, started, span, None, error="connection")
+            raise
         else:
+            self._observe(label, started, span, req)
             return req
 
+    def _observe(
+        self,
+        label: str,
+        started: float,
+        span: Any,
+        resp: requests.Response | None,
+        *,
+        error: str | int | None = None,
+    ) -> None:
+        """Record metrics for one HTTP attempt and close its trace span."""
+        self.metrics.record_request(label, time.perf_counter() - started, error=error)
+        if span is not None:
+            body = resp.request.body if resp is not None and resp.request else None
+            self.tracer.end_span(
+                span,
+                status=resp.status_code if resp is not None else None,
+                request_bytes=len(body) if body else 0,
+                response_bytes=len(resp.content) if resp is not None else 0,
+                error=error,
+            )
+
     @staticmethod
     def _parse_json(resp: requests.Response) -> dict:
         """Parse JSON or raise a friendly error."""
@@ -485,29 +561,39 @@ class EzvizClient:
 
         Useful for endpoints requiring special URL encoding or manual preparation.
         """
+        label = endpoint_label(prepared.method or "GET", prepared.url or "")
+        span = (
+            self.tracer.start_span("http.request", endpoint=label, attempt=max_retries)
+            if self.tracer.enabled
+            else None
+        )
+        started = time.perf_counter()
         try:
             req = self._session.send(request=prepared, timeout=self._timeout)
             req.raise_for_status()
         except requests.HTTPError as err:
-            if (
-                retry_401
-                and err.response is not None
-                and err.response.status_code == 401
-            ):
+            status = err.response.status_code if err.response is not None else None
+            self._observe(label, started, span, err.response, error=status or "http")
+            if retry_401 and status == 401:
                 if max_retries >= MAX_RETRIES:
                     raise HTTPError from err
+                self.metrics.record_relogin(label)
                 self.login()
                 return self._send_prepared(
                     prepared, retry_401=retry_401, max_retries=max_retries + 1
                 )
             raise HTTPError from err
+        except requests.RequestException:
+            self._observe(label, started, span, None, error="connection")
+            raise
+        self._observe(label, started, span, req)
         return req
 
     # ---- Small helpers --------------------------------------------------------------
 
     def _url(self, path: str) -> str:
         """Build a full API URL for the given path."""
-        return f"https://{self._token['api_url']}{path}"
+        return build_url(self._token["api_url"], path)
 
     def _request_json(
         self,
@@ -530,7 +616,12 @@ class EzvizClient:
             retry_401=retry_401,
             max_retries=max_retries,
         )
-        return self._parse_json(resp)
+        payload = self._parse_json(resp)
+        if not self._is_ok(payload):
+            code = self._response_code(payload)
+            if code is not None:
+                self.metrics.record_code(self.metrics.last_endpoint, code)
+        return payload
 
     def _retry_json(
         self,
@@ -557,6 +648,7 @@ class EzvizClient:
             if not should_retry(payload):
                 return payload
             if attempt < total:
+                self.metrics.record_retry()
                 # Prefer modern meta.code; fall back to legacy resultCode
                 code = self._response_code(payload)
                 _LOGGER.warning(
@@ -641,6 +733,7 @@ class EzvizClient:
         )
         if self._meta_code(json_output) != 200:
             # session is wrong, need to relogin and retry
+            self.metrics.record_relogin(endpoint_label("GET", API_ENDPOINT_PAGELIST))
             self.login()
             _LOGGER.warning(
                 "Http_retry: serial=%s code=%s msg=%s",
@@ -657,8 +750,12 @@ class EzvizClient:
 
         data = json_output[json_key] if json_key else json_output
 
-        if next_page:
-            next_offset = offset + limit
+        # Advance by what the server actually returned: it may cap ``limit``
+        received = json_output.get("deviceInfos")
+        step = len(received) if isinstance(received, list) else limit
+
+        if next_page and step:
+            next_offset = offset + step
             # Recursive call to fetch next page
             next_data = self._api_get_pagelist(
                 page_filter, json_key, group_id, limit, next_offset, max_retries
@@ -668,8 +765,19 @@ class EzvizClient:
 
         return data
 
-    def get_alarminfo(self, serial: str, limit: int = 1, max_retries: int = 0) -> dict:
-        """Get data from alarm info API for camera serial."""
+    def get_alarminfo(
+        self,
+        serial: str,
+        limit: int = 1,
+        max_retries: int = 0,
+        *,
+        dedup: bool = False,
+    ) -> dict:
+        """Get data from alarm info API for camera serial.
+
+        dedup: drop from ``alarms`` the entries already seen through
+            :attr:`event_dedup` (push, backfill or an earlier poll).
+        """
         params: dict[str, int | str] = {
             "deviceSerials": serial,
             "queryType": -1,
@@ -692,6 +800,8 @@ class EzvizClient:
         )
         if self._meta_code(json_output) != 200:
             raise PyEzvizError(f"Could not get data from alarm api: Got {json_output})")
+        if dedup:
+            self._drop_seen_events(json_output, ("alarms",), serial)
         return json_output
 
     def get_device_messages_list(
@@ -703,8 +813,14 @@ class EzvizClient:
         end_time: str | None = None,
         tags: str = "ALL",
         max_retries: int = 0,
+        *,
+        dedup: bool = False,
     ) -> dict:
-        """Get data from Unified message list API."""
+        """Get data from Unified message list API.
+
+        dedup: drop from the message list the entries already seen through
+            :attr:`event_dedup` (push, backfill or an earlier poll).
+        """
         if max_retries > MAX_RETRIES:
             raise PyEzvizError("Can't gather proper data. Max retries exceeded.")
 
@@ -725,8 +841,21 @@ class EzvizClient:
             max_retries=max_retries,
         )
         self._ensure_ok(json_output, "Could not get unified message list")
+        if dedup:
+            self._drop_seen_events(json_output, ("message", "messages"))
         return json_output
 
+    def _drop_seen_events(
+        self, json_output: dict, keys: tuple[str, ...], serial: str | None = None
+    ) -> None:
+        """Filter the event lists under ``keys`` through :attr:`event_dedup`."""
+        for key in keys:
+            items = json_output.get(key)
+            if isinstance(items, list):
+                json_output[key] = self.event_dedup.filter_new(
+                    [item for item in items if isinstance(item, Mapping)], serial
+                )
+
     def add_device(
         self,
         serial: str,
@@ -1374,7 +1503,7 @@ class EzvizClient:
 
         payload = json.dumps({"itemKey": key, "productId": product_id, "value": value})
 
-        full_url = f"https://{self._token['api_url']}{API_ENDPOINT_IOT_FEATURE}{serial.upper()}/0"
+        full_url = self._url(f"{API_ENDPOINT_IOT_FEATURE}{serial.upper()}/0")
 
         headers = {
             **self._session.headers,
@@ -2084,7 +2213,7 @@ class EzvizClient:
                     try:
                         # Create a light bulb object
                         self._light_bulbs[device] = EzvizLightBulb(
-                            self, device, dict(rec.raw)
+                            self, device, rec.raw
                         ).status()
                     except (
                         PyEzvizError,
@@ -2101,7 +2230,8 @@ class EzvizClient:
                 else:
                     try:
                         # Create camera object
-                        cam = EzvizCamera(self, device, dict(rec.raw))
+                        # Share the record's read-only payload, no copy
+                        cam = EzvizCamera(self, device, rec.raw)
                         self._cameras[device] = cam.status(refresh=refresh)
 
                     except (
@@ -2177,15 +2307,7 @@ class EzvizClient:
                 "deviceInfos": device,
             }
             # Nested keys are still encoded as JSON strings
-            try:
-                support_ext = result[_serial].get("deviceInfos", {}).get("supportExt")
-                if isinstance(support_ext, str) and support_ext:
-                    result[_serial]["deviceInfos"]["supportExt"] = json.loads(
-                        support_ext
-                    )
-            except (TypeError, ValueError):
-                # Leave as-is if not valid JSON
-                pass
+            self._decode_support_ext(_serial, device)
             convert_to_dict(result[_serial]["STATUS"].get("optionals"))
 
         if not serial:
@@ -2201,7 +2323,8 @@ class EzvizClient:
         Falls back to raw when a specific serial is requested but not found.
         """
         devices = self.get_device_infos()
-        records = build_device_records_map(devices)
+        records = build_device_records_map(devices, self._device_records)
+        self._device_records = records
         if serial is None:
             return records
         return records.get(serial) or devices.get(serial, {})
@@ -2635,9 +2758,16 @@ class EzvizClient:
     def login(self, sms_code: int | None = None) -> dict[Any, Any]:
         """Get or refresh ezviz login token."""
         if self._token["session_id"] and self._token["rf_session_id"]:
+            label = endpoint_label("PUT", API_ENDPOINT_REFRESH_SESSION_ID)
+            span = (
+                self.tracer.start_span("http.request", endpoint=label, attempt=0)
+                if self.tracer.enabled
+                else None
+            )
+            started = time.perf_counter()
             try:
                 req = self._session.put(
-                    url=f"https://{self._token['api_url']}{API_ENDPOINT_REFRESH_SESSION_ID}",
+                    url=self._url(API_ENDPOINT_REFRESH_SESSION_ID),
                     data={
                         "refreshSessionId": self._token["rf_session_id"],
                         "featureCode": FEATURE_CODE,
@@ -2647,8 +2777,15 @@ class EzvizClient:
                 req.raise_for_status()
 
             except requests.HTTPError as err:
+                self._observe(label, started, span, req, error=req.status_code)
                 raise HTTPError from err
 
+            except requests.RequestException:
+                self._observe(label, started, span, None, error="connection")
+                raise
+
+            self._observe(label, started, span, req)
+
             try:
                 json_result = req.json()
 
@@ -2699,7 +2836,7 @@ class EzvizClient:
         """Close Ezviz session and remove login session from ezviz servers."""
         try:
             req = self._session.delete(
-                url=f"https://{self._token['api_url']}{API_ENDPOINT_LOGOUT}",
+                url=self._url(API_ENDPOINT_LOGOUT),
                 timeout=self._timeout,
             )
             req.raise_for_status()
@@ -2732,7 +2869,7 @@ class EzvizClient:
 
     def set_camera_defence_old(self, serial: str, enable: int) -> bool:
         """Enable/Disable motion detection on camera."""
-        cas_client = EzvizCAS(cast(dict[str, Any], self._token))
+        cas_client = EzvizCAS(cast(dict[str, Any], self._token), tracer=self.tracer)
         cas_client.set_camera_defence_state(serial, enable)
 
         return True
@@ -3200,7 +3337,7 @@ class EzvizClient:
             )
         try:
             req = self._session.post(
-                url=f"https://{self._token['api_url']}{API_ENDPOINT_DETECTION_SENSIBILITY}",
+                url=self._url(API_ENDPOINT_DETECTION_SENSIBILITY),
                 data={
                     "subSerial": serial,
                     "type": type_value,
@@ -3877,6 +4014,50 @@ class EzvizClient:
         self._ensure_ok(json_output, "Could not get device status")
         return json_output
 
+    def get_devices_online(
+        self,
+        serials: list[str] | str,
+        *,
+        max_retries: int = 0,
+    ) -> dict[str, int | None]:
+        """Return ``serial -> status`` (1 = online) from one batched call."""
+
+        infos = (
+            self.get_devices_status(serials, max_retries=max_retries).get(
+                "statusInfos"
+            )
+            or {}
+        )
+        result: dict[str, int | None] = {}
+        for serial, info in infos.items():
+            value = info.get("status") if isinstance(info, Mapping) else info
+            result[str(serial)] = coerce_int(value)
+        return result
+
+    def refresh_liveness(
+        self,
+        cameras: Mapping[str, EzvizCamera],
+        *,
+        alarms: bool = True,
+        max_retries: int = 0,
+    ) -> dict[str, dict[str, Any]]:
+        """Cheap refresh tier for cameras built by an earlier full refresh.
+
+        Issues one batched ``get_devices_status`` call for all serials and,
+        when ``alarms`` is True, one ``get_alarminfo`` per camera. Returns
+        ``serial -> partial status`` (``status`` plus the alarm keys) to merge
+        over the last :meth:`EzvizCamera.status` result; everything else
+        (settings, firmware, network) needs the full pagelist tier.
+        """
+
+        if not cameras:
+            return {}
+        online = self.get_devices_online(list(cameras), max_retries=max_retries)
+        return {
+            serial: camera.liveness(online.get(serial), refresh=alarms)
+            for serial, camera in cameras.items()
+        }
+
     def get_device_secret_key_info(
         self,
         serials: list[str] | str,
@@ -4374,18 +4555,95 @@ class EzvizClient:
         return True
 
     def get_mqtt_client(
-        self, on_message_callback: Callable[[dict[str, Any]], None] | None = None
+        self,
+        on_message_callback: Callable[[dict[str, Any]], None] | None = None,
+        **options: Any,
     ) -> MQTTClient:
-        """Return a configured MQTTClient using this client's session."""
+        """Return a configured MQTTClient using this client's session.
+
+        The client follows this client's token across re-logins, backfills
+        missed events through :meth:`fetch_missed_push_events` when connected
+        with ``supervise=True`` and drops events already seen by
+        :attr:`event_dedup`. Extra ``options`` are passed to
+        :class:`MQTTClient` (e.g. ``event_queue``, ``history_size``).
+        """
         if self.mqtt_client is None:
+            options.setdefault("dedup", self.event_dedup)
             self.mqtt_client = MQTTClient(
                 token=cast(dict[Any, Any], self._token),
                 session=self._session,
                 timeout=self._timeout,
                 on_message_callback=on_message_callback,
+                tracer=self.tracer,
+                token_provider=lambda: cast(dict[Any, Any], self._token),
+                backfill=self.fetch_missed_push_events,
+                **options,
             )
         return self.mqtt_client
 
+    def fetch_missed_push_events(
+        self, since: float, serials: str | None = None, *, limit: int = 50
+    ) -> list[dict[str, Any]]:
+        """Return unified-list messages newer than ``since`` in push shape.
+
+        Queries each calendar day between ``since`` and now (usually one),
+        paging back with ``end_time`` set to the oldest message returned until
+        a message older than ``since`` shows up or the list runs out, and
+        converts entries with :func:`push_event_from_message`. Results are
+        ordered oldest first.
+        """
+        since_ms = int(since * 1000)
+        day = datetime.fromtimestamp(since).date()
+        today = datetime.now().date()
+        events: list[dict[str, Any]] = []
+        seen: set[Any] = set()
+        while day <= today:
+            date = day.strftime("%Y%m%d")
+            end_time: str | None = None
+            for _ in range(MAX_BACKFILL_PAGES):
+                json_output = self.get_device_messages_list(
+                    serials=serials, limit=limit, date=date, end_time=end_time
+                )
+                items = [
+                    item
+                    for item in json_output.get("message")
+                    or json_output.get("messages")
+                    or []
+                    if isinstance(item, Mapping)
+                ]
+                reached_since = False
+                for item in items:
+                    stamp = coerce_int(item.get("time") or item.get("msgTime"))
+                    if stamp is not None and stamp < since_ms:
+                        reached_since = True
+                        continue
+                    msg_id = item.get("msgId")
+                    if msg_id is not None:
+                        if msg_id in seen:
+                            continue
+                        seen.add(msg_id)
+                    event = push_event_from_message(item)
+                    if event is not None:
+                        events.append(event)
+                if reached_since or not items or json_output.get("hasNext") is False:
+                    break
+                # Newest first: the last item is the oldest of this page
+                oldest = items[-1]
+                cursor = oldest.get("msgId") or oldest.get("time") or oldest.get("msgTime")
+                if cursor is None or str(cursor) == end_time:
+                    break
+                end_time = str(cursor)
+            else:
+                _LOGGER.warning(
+                    "Backfill for %s stopped after %s pages of %s messages; older events may be missing",
+                    date,
+                    MAX_BACKFILL_PAGES,
+                    limit,
+                )
+            day += timedelta(days=1)
+        events.sort(key=lambda event: coerce_int(event["t"]) or 0)
+        return events
+
     def _get_page_list(self) -> Any:
         """Get ezviz device info broken down in sections."""
         return self._api_get_pagelist(
@@ -4398,10 +4656,72 @@ class EzvizClient:
             json_key=None,
         )
 
+    def _decode_support_ext(self, serial: str, device_infos: dict[str, Any]) -> None:
+        """Decode ``supportExt`` in place, reusing the last result per serial.
+
+        The JSON string only changes with the firmware, so while ``version``
+        and the raw string match the cached entry the previously decoded
+        mapping (shared, treat as read-only) is reused and the
+        :class:`CapabilityIndex` is not rebuilt.
+        """
+        raw = device_infos.get("supportExt")
+        if not isinstance(raw, str) or not raw:
+            return
+        version = device_infos.get("version")
+        cached = self._support_ext.get(serial)
+        if cached is not None and cached[0] == version and cached[1] == raw:
+            device_infos["supportExt"] = cached[2]
+            return
+        try:
+            decoded = json.loads(raw)
+        except (TypeError, ValueError):
+            # Leave as-is if not valid JSON
+            return
+        if not isinstance(decoded, dict):
+            return
+        device_infos["supportExt"] = decoded
+        self._support_ext[serial] = (
+            version,
+            raw,
+            decoded,
+            CapabilityIndex(decoded, version),
+        )
+
+    def capabilities(self, serial: str) -> CapabilityIndex | None:
+        """Return the compiled supportExt index of ``serial``.
+
+        Built by :meth:`get_device_infos` and kept until the device reports a
+        new firmware version; None before the first pagelist fetch.
+        """
+        cached = self._support_ext.get(serial)
+        return cached[3] if cached is not None else None
+
     def get_device(self) -> Any:
         """Get ezviz devices filter."""
         return self._api_get_pagelist(page_filter="CLOUD", json_key="deviceInfos")
 
+    def discover_devices(self) -> dict[str, dict[str, Any]]:
+        """List the account's devices from the minimal ``CLOUD`` pagelist.
+
+        Returns ``serial -> {name, device_type, device_category,
+        device_sub_category, version, status}`` without building camera
+        objects or fetching alarms, so it stays cheap on large accounts.
+        Intended for device pickers; use :meth:`get_device_infos` for status.
+        """
+        result: dict[str, dict[str, Any]] = {}
+        for device in self.get_device() or []:
+            if not isinstance(device, dict) or not device.get("deviceSerial"):
+                continue
+            result[str(device["deviceSerial"])] = {
+                "name": device.get("name"),
+                "device_type": device.get("deviceType"),
+                "device_category": device.get("deviceCategory"),
+                "device_sub_category": device.get("deviceSubCategory"),
+                "version": device.get("version"),
+                "status": device.get("status"),
+            }
+        return result
+
     def get_connection(self) -> Any:
         """Get ezviz connection infos filter."""
         return self._api_get_pagelist(page_filter="CONNECTION", json_key="CONNECTION")
@@ -13,6 +13,8 @@ FEATURE_CODE = generate_unique_code()
 XOR_KEY = b"\x0c\x0eJ^X\x15@Rr"
 DEFAULT_TIMEOUT = 25
 MAX_RETRIES = 3
+# Safety cap on unified message list pages fetched per day when backfilling
+MAX_BACKFILL_PAGES = 20
 REQUEST_HEADER = {
     "featureCode": FEATURE_CODE,
     "clientType": "3",
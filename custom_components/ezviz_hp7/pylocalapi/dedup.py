@@ -0,0 +1,100 @@
+"""Cross-source de-duplication of device events.
+
+The same alarm can reach a consumer three ways: MQTT push (``ext.msgId`` /
+``ext.file_id``), ``get_alarminfo`` polling (``alarmId``) and the unified
+message list (``msgId``). :class:`EventDeduplicator` remembers recently seen
+identifiers per serial in a bounded LRU so each event is handled once, no
+matter how many sources are active.
+
+An event counts as already seen when *any* of its identifiers was seen
+before; all of its identifiers are then remembered, so a push carrying both
+``msgId`` and ``file_id`` links the two for later sources.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping
+import threading
+from typing import Any
+
+# Identifier keys per payload shape, in lookup order.
+_ID_KEYS = ("msgId", "alarmId", "fileId", "file_id")
+_SERIAL_KEYS = ("deviceSerial", "device_serial", "subSerial")
+
+
+def event_identity(event: Mapping[str, Any]) -> tuple[str | None, tuple[str, ...]]:
+    """Return ``(serial, ids)`` for a push, alarminfo or unified-list event.
+
+    Decoded push messages carry both under ``ext``; alarm and message-list
+    entries carry them at the top level. Empty and ``"0"`` ids are ignored.
+    """
+    ext = event.get("ext")
+    source: Mapping[str, Any] = ext if isinstance(ext, Mapping) else event
+    serial = next((source.get(key) for key in _SERIAL_KEYS if source.get(key)), None)
+    ids = tuple(
+        str(value)
+        for key in _ID_KEYS
+        if (value := source.get(key)) not in (None, "", "0", 0)
+    )
+    return (str(serial) if serial else None), ids
+
+
+class EventDeduplicator:
+    """Thread-safe bounded LRU of recently seen event ids per serial."""
+
+    def __init__(self, per_serial: int = 128, max_serials: int = 1024) -> None:
+        """Remember up to ``per_serial`` ids for up to ``max_serials`` devices."""
+        self.per_serial = max(1, per_serial)
+        self.max_serials = max(1, max_serials)
+        self._seen: OrderedDict[str, OrderedDict[str, None]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.duplicates = 0
+
+    def is_new(self, event: Mapping[str, Any], serial: str | None = None) -> bool:
+        """Return True the first time an event is offered, False afterwards.
+
+        ``serial`` is used when the event carries none. Events without a
+        serial or without any identifier cannot be matched and are always
+        reported as new.
+        """
+        event_serial, ids = event_identity(event)
+        serial = event_serial or serial
+        if serial is None or not ids:
+            return True
+        return self.check_ids(serial, ids)
+
+    def check_ids(self, serial: str, ids: Iterable[str]) -> bool:
+        """Record ``ids`` for ``serial``; True if none of them was seen."""
+        ids = tuple(ids)
+        with self._lock:
+            known = self._seen.get(serial)
+            if known is None:
+                known = self._seen[serial] = OrderedDict()
+                while len(self._seen) > self.max_serials:
+                    self._seen.popitem(last=False)
+            else:
+                self._seen.move_to_end(serial)
+            duplicate = any(event_id in known for event_id in ids)
+            for event_id in ids:
+                known[event_id] = None
+                known.move_to_end(event_id)
+            while len(known) > self.per_serial:
+                known.popitem(last=False)
+            if duplicate:
+                self.duplicates += 1
+            return not duplicate
+
+    def filter_new(
+        self, events: Iterable[Mapping[str, Any]], serial: str | None = None
+    ) -> list[Mapping[str, Any]]:
+        """Return the events of ``events`` not seen before, in order."""
+        return [event for event in events if self.is_new(event, serial)]
+
+    def clear(self, serial: str | None = None) -> None:
+        """Forget ids for ``serial`` or for all devices."""
+        with self._lock:
+            if serial is None:
+                self._seen.clear()
+            else:
+                self._seen.pop(serial, None)
@@ -0,0 +1,257 @@
+"""Per-device ring buffer of recent push events.
+
+:attr:`MQTTClient.messages_by_device` only keeps the last payload per serial.
+:class:`EventHistory` keeps the last ``capacity`` events of every device as
+compact :class:`EventRecord` objects (slotted, no per-event dict), so
+questions like "how many rings in the last ten minutes?" are answered
+locally instead of polling ``get_alarminfo``/``get_device_messages_list``.
+
+Example:
+    >>> client = MQTTClient(token, session, history_size=50)
+    >>> client.connect()
+    >>> client.history.query("BD1234567", since=time.time() - 600, alert_types={10})
+"""
+
+from __future__ import annotations
+
+from collections.abc import Collection, Iterator, Mapping
+import datetime
+import threading
+import time
+from typing import Any
+
+from .utils import coerce_int
+
+
+def _epoch(value: float | datetime.datetime | None) -> float | None:
+    """Return ``value`` as epoch seconds (naive datetimes are local time)."""
+    if isinstance(value, datetime.datetime):
+        return value.timestamp()
+    return value
+
+
+class EventRecord:
+    """One push event reduced to the fields history queries need."""
+
+    __slots__ = (
+        "alert",
+        "alert_type_code",
+        "channel_no",
+        "file_id",
+        "image",
+        "msg_id",
+        "received_at",
+        "serial",
+        "time_str",
+        "timestamp",
+    )
+
+    def __init__(
+        self,
+        serial: str,
+        timestamp: float,
+        *,
+        alert_type_code: int | None = None,
+        alert: str | None = None,
+        msg_id: str | None = None,
+        file_id: str | None = None,
+        channel_no: int | None = None,
+        image: str | None = None,
+        time_str: str | None = None,
+        received_at: float | None = None,
+    ) -> None:
+        """Create a record; ``timestamp`` is the event time in epoch seconds."""
+        self.serial = serial
+        self.timestamp = timestamp
+        self.alert_type_code = alert_type_code
+        self.alert = alert
+        self.msg_id = msg_id
+        self.file_id = file_id
+        self.channel_no = channel_no
+        self.image = image
+        self.time_str = time_str
+        self.received_at = timestamp if received_at is None else received_at
+
+    @classmethod
+    def from_push(
+        cls, decoded: Mapping[str, Any], received_at: float | None = None
+    ) -> EventRecord | None:
+        """Build a record from a decoded MQTT message; None without a serial.
+
+        The event time comes from the top-level ``t`` (epoch milliseconds)
+        when present, otherwise the receive time is used.
+        """
+        ext = decoded.get("ext")
+        if not isinstance(ext, Mapping):
+            return None
+        serial = ext.get("device_serial")
+        if not serial:
+            return None
+        now = time.time() if received_at is None else received_at
+        stamp = coerce_int(decoded.get("t"))
+        return cls(
+            str(serial),
+            stamp / 1000 if stamp else now,
+            alert_type_code=coerce_int(ext.get("alert_type_code")),
+            alert=decoded.get("alert"),
+            msg_id=ext.get("msgId") or None,
+            file_id=ext.get("file_id") or None,
+            channel_no=coerce_int(ext.get("channel_no")),
+            image=ext.get("image") or None,
+            time_str=ext.get("time") or None,
+            received_at=now,
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the record as a plain dict."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        """Return a short debug representation."""
+        return (
+            f"EventRecord(serial={self.serial!r}, timestamp={self.timestamp!r}, "
+            f"alert_type_code={self.alert_type_code!r}, msg_id={self.msg_id!r})"
+        )
+
+
+class DeviceEventRing:
+    """Fixed-capacity ring of :class:`EventRecord` for one device.
+
+    Not thread-safe on its own; :class:`EventHistory` serializes access.
+    """
+
+    __slots__ = ("_head", "_size", "_slots")
+
+    def __init__(self, capacity: int) -> None:
+        """Preallocate ``capacity`` slots."""
+        self._slots: list[EventRecord | None] = [None] * max(1, capacity)
+        self._head = 0  # next write position
+        self._size = 0
+
+    @property
+    def capacity(self) -> int:
+        """Maximum number of records kept."""
+        return len(self._slots)
+
+    def __len__(self) -> int:
+        """Return the number of stored records."""
+        return self._size
+
+    def append(self, record: EventRecord) -> None:
+        """Store ``record``, overwriting the oldest one when full."""
+        self._slots[self._head] = record
+        self._head = (self._head + 1) % len(self._slots)
+        if self._size < len(self._slots):
+            self._size += 1
+
+    def newest_first(self) -> Iterator[EventRecord]:
+        """Yield stored records from the most recently added backwards."""
+        slots = self._slots
+        cap = len(slots)
+        for offset in range(1, self._size + 1):
+            record = slots[(self._head - offset) % cap]
+            if record is not None:
+                yield record
+
+
+class EventHistory:
+    """Thread-safe per-serial event history with time/alert-type queries."""
+
+    def __init__(self, capacity: int = 100) -> None:
+        """Keep up to ``capacity`` events per device."""
+        self.capacity = max(1, capacity)
+        self._rings: dict[str, DeviceEventRing] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Return the total number of stored events."""
+        with self._lock:
+            return sum(len(ring) for ring in self._rings.values())
+
+    def serials(self) -> list[str]:
+        """Return serials that have at least one event."""
+        with self._lock:
+            return list(self._rings)
+
+    def add(self, record: EventRecord) -> None:
+        """Append ``record`` to its device's ring."""
+        with self._lock:
+            ring = self._rings.get(record.serial)
+            if ring is None:
+                ring = self._rings[record.serial] = DeviceEventRing(self.capacity)
+            ring.append(record)
+
+    def record_push(
+        self, decoded: Mapping[str, Any], received_at: float | None = None
+    ) -> EventRecord | None:
+        """Add a decoded MQTT message; returns the stored record, if any."""
+        record = EventRecord.from_push(decoded, received_at)
+        if record is not None:
+            self.add(record)
+        return record
+
+    def query(
+        self,
+        serial: str,
+        *,
+        since: float | datetime.datetime | None = None,
+        until: float | datetime.datetime | None = None,
+        alert_types: Collection[int] | None = None,
+        limit: int | None = None,
+    ) -> list[EventRecord]:
+        """Return matching events for ``serial``, newest first.
+
+        Args:
+            serial: Device serial.
+            since: Inclusive lower bound on the event time (epoch seconds or
+                datetime).
+            until: Inclusive upper bound on the event time.
+            alert_types: Only events whose ``alert_type_code`` is in this set.
+            limit: Maximum number of events returned.
+        """
+        lower, upper = _epoch(since), _epoch(until)
+        matches: list[EventRecord] = []
+        with self._lock:
+            ring = self._rings.get(serial)
+            if ring is None:
+                return matches
+            for record in ring.newest_first():
+                stamp = record.timestamp
+                if lower is not None and stamp < lower:
+                    continue
+                if upper is not None and stamp > upper:
+                    continue
+                if alert_types is not None and record.alert_type_code not in alert_types:
+                    continue
+                matches.append(record)
+                if limit is not None and len(matches) >= limit:
+                    break
+        return matches
+
+    def latest(
+        self, serial: str, alert_types: Collection[int] | None = None
+    ) -> EventRecord | None:
+        """Return the most recent event of ``serial`` (optionally filtered)."""
+        found = self.query(serial, alert_types=alert_types, limit=1)
+        return found[0] if found else None
+
+    def count(
+        self,
+        serial: str,
+        *,
+        since: float | datetime.datetime | None = None,
+        until: float | datetime.datetime | None = None,
+        alert_types: Collection[int] | None = None,
+    ) -> int:
+        """Return the number of events matching the :meth:`query` filters."""
+        return len(
+            self.query(serial, since=since, until=until, alert_types=alert_types)
+        )
+
+    def clear(self, serial: str | None = None) -> None:
+        """Forget the history of ``serial`` or of all devices."""
+        with self._lock:
+            if serial is None:
+                self._rings.clear()
+            else:
+                self._rings.pop(serial, None)
@@ -0,0 +1,325 @@
+"""Bounded handoff queue between paho's network thread and event consumers.
+
+:class:`MQTTClient` decodes push messages on paho's thread. With a
+:class:`EventQueue` attached, it only enqueues the decoded event there and
+returns immediately, so a slow consumer cannot stall keepalives or later
+messages. Consumers read the queue from a :class:`QueueWorker` thread or
+from asyncio through :class:`AsyncEventReader`.
+
+Overflow policies (:class:`OverflowPolicy`):
+
+``drop_oldest``
+    When full, evict the oldest pending event to make room.
+``coalesce``
+    When full, replace the newest pending event of the same device serial
+    in place (the queue keeps one slot per burst); with no pending event
+    for that serial, evict the oldest. Below ``maxsize`` every event is
+    kept, so distinct alerts from one camera are not lost.
+``block``
+    Make the producer wait for space (up to ``block_timeout``), then drop the
+    new event. Only use this when back-pressure on the MQTT loop is acceptable.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Callable, Mapping
+from enum import Enum, unique
+from itertools import count
+import logging
+import threading
+import time
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@unique
+class OverflowPolicy(Enum):
+    """What :meth:`EventQueue.put` does when the queue is full."""
+
+    DROP_OLDEST = "drop_oldest"
+    COALESCE = "coalesce"
+    BLOCK = "block"
+
+
+def event_serial(event: Mapping[str, Any]) -> str | None:
+    """Return the device serial of a decoded push event, if any."""
+    ext = event.get("ext")
+    if isinstance(ext, Mapping):
+        serial = ext.get("device_serial")
+        return str(serial) if serial else None
+    return None
+
+
+class EventQueue:
+    """Thread-safe bounded queue of decoded push events."""
+
+    def __init__(
+        self,
+        maxsize: int = 256,
+        policy: OverflowPolicy | str = OverflowPolicy.DROP_OLDEST,
+        *,
+        block_timeout: float | None = 1.0,
+        key_func: Callable[[Mapping[str, Any]], str | None] = event_serial,
+    ) -> None:
+        """Initialize the queue.
+
+        Args:
+            maxsize: Maximum number of pending events (at least 1).
+            policy: Overflow policy, as enum or its string value.
+            block_timeout: Max seconds :meth:`put` waits under ``block``
+                (``None`` waits forever).
+            key_func: Coalescing key for the ``coalesce`` policy.
+        """
+        self.maxsize = max(1, maxsize)
+        self.policy = OverflowPolicy(policy)
+        self._block_timeout = block_timeout
+        self._key_func = key_func
+        # seq -> (coalescing key, event); FIFO order
+        self._items: OrderedDict[int, tuple[Any, Mapping[str, Any]]] = OrderedDict()
+        # coalescing key -> seq of its newest pending event
+        self._latest: dict[Any, int] = {}
+        self._seq = count()
+        self._cond = threading.Condition()
+        self._listeners: list[Callable[[], None]] = []
+        self._closed = False
+        self._enqueued = 0
+        self._delivered = 0
+        self._dropped = 0
+        self._coalesced = 0
+        self._max_depth = 0
+
+    def __len__(self) -> int:
+        """Return the number of pending events."""
+        return len(self._items)
+
+    @property
+    def closed(self) -> bool:
+        """True once :meth:`close` was called."""
+        return self._closed
+
+    def add_listener(self, listener: Callable[[], None]) -> Callable[[], None]:
+        """Call ``listener`` on the producer thread after each accepted put.
+
+        Returns a callable that removes the listener.
+        """
+        with self._cond:
+            self._listeners.append(listener)
+
+        def _remove() -> None:
+            with self._cond:
+                if listener in self._listeners:
+                    self._listeners.remove(listener)
+
+        return _remove
+
+    def put(self, event: Mapping[str, Any]) -> bool:
+        """Enqueue ``event`` applying the overflow policy.
+
+        Returns False if the event was dropped (or the queue is closed).
+        """
+        with self._cond:
+            if self._closed:
+                return False
+            key: Any = None
+            if self.policy is OverflowPolicy.COALESCE:
+                key = self._key_func(event)
+            full = len(self._items) >= self.maxsize
+            if full and key is not None and key in self._latest:
+                # Replace in place: keeps the serial's position in the queue.
+                seq = self._latest[key]
+                self._items[seq] = (key, event)
+                self._coalesced += 1
+            else:
+                if full and not self._make_room():
+                    self._dropped += 1
+                    return False
+                seq = next(self._seq)
+                self._items[seq] = (key, event)
+                if key is not None:
+                    self._latest[key] = seq
+                self._max_depth = max(self._max_depth, len(self._items))
+            self._enqueued += 1
+            listeners = list(self._listeners)
+            self._cond.notify()
+        self._fire(listeners)
+        return True
+
+    @staticmethod
+    def _fire(listeners: list[Callable[[], None]]) -> None:
+        for listener in listeners:
+            try:
+                listener()
+            except Exception:
+                _LOGGER.exception("Event queue listener raised")
+
+    def _make_room(self) -> bool:
+        """Free one slot according to the policy; caller holds the lock."""
+        if self.policy is OverflowPolicy.BLOCK:
+            deadline = (
+                None
+                if self._block_timeout is None
+                else time.monotonic() + self._block_timeout
+            )
+            while len(self._items) >= self.maxsize and not self._closed:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            return not self._closed
+        self._popleft()
+        self._dropped += 1
+        return True
+
+    def _popleft(self) -> Mapping[str, Any]:
+        """Remove and return the oldest event; caller holds the lock."""
+        seq, (key, event) = self._items.popitem(last=False)
+        if key is not None and self._latest.get(key) == seq:
+            del self._latest[key]
+        return event
+
+    def get(self, timeout: float | None = None) -> Mapping[str, Any] | None:
+        """Pop the oldest event, waiting up to ``timeout`` seconds.
+
+        Returns None on timeout or once the queue is closed and drained.
+        """
+        with self._cond:
+            if not self._cond.wait_for(
+                lambda: self._items or self._closed, timeout=timeout
+            ):
+                return None
+            return self._pop()
+
+    def get_nowait(self) -> Mapping[str, Any] | None:
+        """Pop the oldest event or return None if the queue is empty."""
+        with self._cond:
+            return self._pop()
+
+    def _pop(self) -> Mapping[str, Any] | None:
+        if not self._items:
+            return None
+        event = self._popleft()
+        self._delivered += 1
+        # Wake a producer blocked under the BLOCK policy.
+        self._cond.notify_all()
+        return event
+
+    def close(self) -> None:
+        """Reject further puts and wake all waiters."""
+        with self._cond:
+            self._closed = True
+            listeners = list(self._listeners)
+            self._cond.notify_all()
+        self._fire(listeners)
+
+    def stats(self) -> dict[str, Any]:
+        """Return depth and counters for diagnostics."""
+        with self._cond:
+            return {
+                "policy": self.policy.value,
+                "maxsize": self.maxsize,
+                "depth": len(self._items),
+                "max_depth": self._max_depth,
+                "enqueued": self._enqueued,
+                "delivered": self._delivered,
+                "dropped": self._dropped,
+                "coalesced": self._coalesced,
+            }
+
+
+class QueueWorker:
+    """Deliver queued events to ``callback`` on a dedicated thread."""
+
+    def __init__(
+        self,
+        queue: EventQueue,
+        callback: Callable[[Mapping[str, Any]], None],
+        *,
+        name: str = "ezviz-mqtt-events",
+    ) -> None:
+        """Bind the worker; call :meth:`start` to begin delivery."""
+        self._queue = queue
+        self._callback = callback
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    def start(self) -> None:
+        """Start the delivery thread."""
+        self._thread.start()
+
+    def stop(self, timeout: float | None = 5.0) -> None:
+        """Stop after the current event; pending events stay in the queue."""
+        self._stop.set()
+        if self._thread.is_alive() and threading.current_thread() is not self._thread:
+            self._thread.join(timeout)
+
+    @property
+    def running(self) -> bool:
+        """True while the delivery thread is alive."""
+        return self._thread.is_alive()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            event = self._queue.get(timeout=0.5)
+            if event is None:
+                if self._queue.closed and not len(self._queue):
+                    return
+                continue
+            try:
+                self._callback(event)
+            except Exception:
+                _LOGGER.exception("MQTT event consumer raised")
+
+
+class AsyncEventReader:
+    """Async iterator over an :class:`EventQueue` on a given event loop.
+
+    The producer thread only schedules a wake-up through
+    ``loop.call_soon_threadsafe``; events are popped on the loop itself, so
+    no executor thread is held while waiting::
+
+        reader = AsyncEventReader(client.events, hass.loop)
+        async for event in reader:
+            ...
+    """
+
+    def __init__(
+        self, queue: EventQueue, loop: asyncio.AbstractEventLoop | None = None
+    ) -> None:
+        """Attach to ``queue``; ``loop`` defaults to the running loop."""
+        self._queue = queue
+        self._loop = loop or asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._remove = queue.add_listener(self._notify)
+
+    def _notify(self) -> None:
+        try:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+        except RuntimeError:  # loop closed
+            pass
+
+    def __aiter__(self) -> AsyncIterator[Mapping[str, Any]]:
+        """Return self."""
+        return self
+
+    async def __anext__(self) -> Mapping[str, Any]:
+        """Wait for and return the next event."""
+        while True:
+            event = self._queue.get_nowait()
+            if event is not None:
+                return event
+            if self._queue.closed:
+                self.close()
+                raise StopAsyncIteration
+            self._wakeup.clear()
+            # Re-check after clearing to avoid missing a put in between.
+            event = self._queue.get_nowait()
+            if event is not None:
+                return event
+            await self._wakeup.wait()
+
+    def close(self) -> None:
+        """Detach from the queue."""
+        self._remove()
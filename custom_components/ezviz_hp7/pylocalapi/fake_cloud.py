@@ -0,0 +1,622 @@
+"""Local stand-in for the EZVIZ cloud used for end-to-end and load testing.
+
+Implements the subset of the EZVIZ REST API that this package relies on
+(login, session refresh, pagelist with paging, alarm info, the unified
+message list, remote unlock, device status and the MQTT push
+register/start/stop calls) on top of the
+standard library HTTP server. Latency, fault injection and the size of the
+synthetic account are configurable so that client behaviour can be exercised
+without touching the real service.
+
+The server speaks plain HTTP. Point an :class:`EzvizClient` at it by passing
+the server ``base_url`` (which includes the ``http://`` scheme) as ``url``::
+
+    >>> with FakeEzvizCloud(FakeCloudConfig(device_count=5)) as cloud:
+    ...     client = EzvizClient("user", "pass", url=cloud.base_url)
+    ...     client.login()
+    ...     client.get_device_infos()
+
+Fault kinds understood by :attr:`FakeCloudConfig.faults` and
+:meth:`FakeEzvizCloud.inject`:
+
+``http401``
+    HTTP 401, triggering the client re-login path.
+``meta500`` / ``meta504``
+    HTTP 200 with ``meta.code`` 500/504 (server busy / gateway timeout).
+``result_code``
+    HTTP 200 with legacy ``resultCode`` ``-1``.
+"""
+
+from __future__ import annotations
+
+from collections import Counter, defaultdict, deque
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import logging
+import random
+import re
+import threading
+import time
+from typing import Any, Callable, Final
+from urllib.parse import parse_qs, urlsplit
+from uuid import uuid4
+
+from .api_endpoints import (
+    API_ENDPOINT_ALARMINFO_GET,
+    API_ENDPOINT_IOT_ACTION,
+    API_ENDPOINT_LOGIN,
+    API_ENDPOINT_LOGOUT,
+    API_ENDPOINT_PAGELIST,
+    API_ENDPOINT_REFRESH_SESSION_ID,
+    API_ENDPOINT_REGISTER_MQTT,
+    API_ENDPOINT_REMOTE_UNLOCK,
+    API_ENDPOINT_SERVER_INFO,
+    API_ENDPOINT_START_MQTT,
+    API_ENDPOINT_STOP_MQTT,
+    API_ENDPOINT_UNIFIEDMSG_LIST_GET,
+    API_ENDPOINT_USER_ID,
+    API_ENDPOINT_USERDEVICES_STATUS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+FAULT_KINDS: Final[tuple[str, ...]] = ("http401", "meta500", "meta504", "result_code")
+
+# Routes served without a valid session id.
+_UNAUTHENTICATED_ROUTES: Final[frozenset[str]] = frozenset(
+    {"login", "refresh", "mqtt_register", "mqtt_start", "mqtt_stop"}
+)
+# Routes excluded from random faults (use inject() to target them explicitly).
+_AUTH_ROUTES: Final[frozenset[str]] = frozenset({"login", "refresh", "server_info"})
+
+# Sections returned per serial by the pagelist endpoint.
+_SERIAL_SECTIONS: Final[tuple[str, ...]] = (
+    "STATUS",
+    "CONNECTION",
+    "WIFI",
+    "SWITCH",
+    "TIME_PLAN",
+    "NODISTURB",
+    "P2P",
+    "KMS",
+    "QOS",
+    "UPGRADE",
+    "FEATURE",
+    "FEATURE_INFO",
+    "CUSTOM_TAG",
+)
+# Sections keyed by resourceId instead of serial.
+_RESOURCE_SECTIONS: Final[tuple[str, ...]] = ("CLOUD", "VTM", "CHANNEL", "VIDEO_QUALITY")
+
+
+@dataclass
+class FakeCloudConfig:
+    """Behaviour knobs for :class:`FakeEzvizCloud`.
+
+    Attributes:
+        device_count: Number of synthetic devices on the account.
+        latency: Base delay in seconds added to every response.
+        latency_jitter: Extra uniformly distributed delay (0..jitter seconds).
+        fault_rate: Probability (0..1) that a request gets a random fault.
+            Login, refresh and server info are never faulted at random.
+        faults: Fault kinds drawn from when ``fault_rate`` triggers.
+        max_page_size: Upper bound applied to the pagelist ``limit`` parameter,
+            so small values force the client through multiple pages. Pages
+            then hold fewer devices than the client asked for; the reply's
+            ``page.limit`` reports the capped value.
+        session_ttl: Seconds before an issued session id stops being accepted
+            (``None`` keeps sessions valid forever).
+        serial_prefix: Prefix used to build device serials.
+        seed: Seed for the random generator driving jitter and faults.
+    """
+
+    device_count: int = 1
+    latency: float = 0.0
+    latency_jitter: float = 0.0
+    fault_rate: float = 0.0
+    faults: tuple[str, ...] = FAULT_KINDS
+    max_page_size: int = 30
+    session_ttl: float | None = None
+    serial_prefix: str = "BD"
+    seed: int | None = None
+    # Extra pagelist sections per serial, merged over the generated defaults.
+    device_overrides: dict[str, dict[str, Any]] = field(default_factory=dict)
+
+
+class FakeEzvizCloud:
+    """Threaded HTTP server emulating the EZVIZ cloud endpoints.
+
+    Use as a context manager or call :meth:`start` / :meth:`stop` explicitly.
+    Per-route request counts are available from :attr:`request_counts`.
+    """
+
+    def __init__(
+        self,
+        config: FakeCloudConfig | None = None,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        """Initialize the server (not yet listening)."""
+        self.config = config or FakeCloudConfig()
+        self._host = host
+        self._port = port
+        self._server: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._rng = random.Random(self.config.seed)
+        self._sessions: dict[str, float] = {}
+        self._refresh_tokens: set[str] = set()
+        self._injected: dict[str, deque[str]] = defaultdict(deque)
+        self._alarms: dict[str, list[dict[str, Any]]] = {}
+        self.request_counts: Counter[str] = Counter()
+        self.fault_counts: Counter[str] = Counter()
+        self.unlocks: list[tuple[str, int]] = []
+        self.devices: dict[str, dict[str, Any]] = self._build_devices()
+        self._routes: list[
+            tuple[str, re.Pattern[str], str, Callable[..., tuple[int, dict[str, Any]]]]
+        ] = [
+            ("POST", _exact(API_ENDPOINT_LOGIN), "login", self._handle_login),
+            ("PUT", _exact(API_ENDPOINT_REFRESH_SESSION_ID), "refresh", self._handle_refresh),
+            ("DELETE", _exact(API_ENDPOINT_LOGOUT), "logout", self._handle_logout),
+            ("GET", _exact(API_ENDPOINT_SERVER_INFO), "server_info", self._handle_server_info),
+            ("GET", _exact(API_ENDPOINT_USER_ID), "user_id", self._handle_user_id),
+            ("GET", _exact(API_ENDPOINT_PAGELIST), "pagelist", self._handle_pagelist),
+            ("GET", _exact(API_ENDPOINT_ALARMINFO_GET), "alarminfo", self._handle_alarminfo),
+            (
+                "GET",
+                _exact(API_ENDPOINT_UNIFIEDMSG_LIST_GET),
+                "unifiedmsg",
+                self._handle_unifiedmsg,
+            ),
+            (
+                "PUT",
+                re.compile(
+                    "^"
+                    + re.escape(API_ENDPOINT_IOT_ACTION)
+                    + r"(?P<serial>[^/]+)"
+                    + re.escape(API_ENDPOINT_REMOTE_UNLOCK)
+                    + "$"
+                ),
+                "remote_unlock",
+                self._handle_remote_unlock,
+            ),
+            (
+                "GET",
+                _exact(API_ENDPOINT_USERDEVICES_STATUS),
+                "devices_status",
+                self._handle_devices_status,
+            ),
+            ("POST", _exact(API_ENDPOINT_REGISTER_MQTT), "mqtt_register", self._handle_mqtt_register),
+            ("POST", _exact(API_ENDPOINT_START_MQTT), "mqtt_start", self._handle_mqtt_start),
+            ("POST", _exact(API_ENDPOINT_STOP_MQTT), "mqtt_stop", self._handle_mqtt_stop),
+        ]
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    @property
+    def base_url(self) -> str:
+        """Return ``http://host:port`` of the running server."""
+        if self._server is None:
+            raise RuntimeError("FakeEzvizCloud is not running")
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> str:
+        """Start serving in a background thread and return :attr:`base_url`."""
+        if self._server is not None:
+            return self.base_url
+        handler = _make_handler(self)
+        self._server = ThreadingHTTPServer((self._host, self._port), handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="fake-ezviz-cloud", daemon=True
+        )
+        self._thread.start()
+        _LOGGER.debug("Fake EZVIZ cloud listening on %s", self.base_url)
+        return self.base_url
+
+    def stop(self) -> None:
+        """Stop the server; safe to call more than once."""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join(timeout=5)
+        self._server = None
+        self._thread = None
+
+    def __enter__(self) -> FakeEzvizCloud:
+        """Start the server on context entry."""
+        self.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        """Stop the server on context exit."""
+        self.stop()
+
+    # ------------------------------------------------------------------
+    # Test controls
+    # ------------------------------------------------------------------
+
+    def inject(self, route: str, fault: str, count: int = 1) -> None:
+        """Queue ``count`` deterministic faults for the next requests to ``route``.
+
+        ``route`` is one of the names in :meth:`routes` (e.g. ``"pagelist"``).
+        """
+        if fault not in FAULT_KINDS:
+            raise ValueError(f"Unknown fault kind: {fault}")
+        with self._lock:
+            self._injected[route].extend([fault] * count)
+
+    def routes(self) -> list[str]:
+        """Return the names of the emulated routes."""
+        return [name for _, _, name, _ in self._routes]
+
+    def expire_sessions(self) -> None:
+        """Invalidate all issued session ids (refresh tokens remain valid)."""
+        with self._lock:
+            self._sessions.clear()
+
+    def add_alarm(self, serial: str, **fields: Any) -> dict[str, Any]:
+        """Record a new alarm for ``serial``; newest alarms are returned first."""
+        now = time.time()
+        alarm = {
+            "alarmId": uuid4().hex,
+            "deviceSerial": serial,
+            "alarmType": "10000",
+            "sampleName": "Motion",
+            "alarmStartTime": int(now * 1000),
+            "alarmStartTimeStr": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now)),
+            "picUrl": "",
+            **fields,
+        }
+        with self._lock:
+            self._alarms.setdefault(serial, []).insert(0, alarm)
+        return alarm
+
+    # ------------------------------------------------------------------
+    # Request dispatch
+    # ------------------------------------------------------------------
+
+    def _dispatch(
+        self, method: str, raw_path: str, headers: Any, body: bytes
+    ) -> tuple[int, dict[str, Any]]:
+        """Route a request and apply latency and fault injection."""
+        parts = urlsplit(raw_path)
+        query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+        form = _decode_body(body, headers.get("Content-Type", ""))
+
+        for route_method, pattern, name, handler in self._routes:
+            if route_method != method:
+                continue
+            match = pattern.match(parts.path)
+            if not match:
+                continue
+            with self._lock:
+                self.request_counts[name] += 1
+            self._sleep()
+            fault = self._next_fault(name, random_ok=name not in _AUTH_ROUTES)
+            if fault is not None:
+                with self._lock:
+                    self.fault_counts[f"{name}:{fault}"] += 1
+                return _fault_response(fault)
+            if name not in _UNAUTHENTICATED_ROUTES:
+                if not self._session_valid(headers.get("sessionId")):
+                    return 401, {"meta": {"code": 401, "message": "session invalid"}}
+            return handler(query=query, form=form, **match.groupdict())
+
+        with self._lock:
+            self.request_counts["unknown"] += 1
+        return 404, {"meta": {"code": 404, "message": f"no route for {parts.path}"}}
+
+    def _sleep(self) -> None:
+        delay = self.config.latency
+        if self.config.latency_jitter:
+            with self._lock:
+                delay += self._rng.uniform(0, self.config.latency_jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+    def _next_fault(self, route: str, *, random_ok: bool) -> str | None:
+        with self._lock:
+            queue = self._injected.get(route)
+            if queue:
+                return queue.popleft()
+            if random_ok and self.config.fault_rate and self.config.faults:
+                if self._rng.random() < self.config.fault_rate:
+                    return self._rng.choice(self.config.faults)
+        return None
+
+    def _session_valid(self, session_id: str | None) -> bool:
+        if not session_id:
+            return False
+        with self._lock:
+            issued = self._sessions.get(session_id)
+        if issued is None:
+            return False
+        ttl = self.config.session_ttl
+        return ttl is None or time.monotonic() - issued < ttl
+
+    def _issue_session(self) -> tuple[str, str]:
+        session_id, refresh_id = uuid4().hex, uuid4().hex
+        with self._lock:
+            self._sessions[session_id] = time.monotonic()
+            self._refresh_tokens.add(refresh_id)
+        return session_id, refresh_id
+
+    # ------------------------------------------------------------------
+    # Synthetic account
+    # ------------------------------------------------------------------
+
+    def _build_devices(self) -> dict[str, dict[str, Any]]:
+        devices: dict[str, dict[str, Any]] = {}
+        for idx in range(self.config.device_count):
+            serial = f"{self.config.serial_prefix}{idx:07d}"
+            resource_id = f"res{idx:07d}"
+            device = {
+                "resourceId": resource_id,
+                "deviceInfos": {
+                    "deviceSerial": serial,
+                    "name": f"Device {idx}",
+                    "deviceCategory": "BDoorBell" if idx % 2 == 0 else "IPC",
+                    "deviceSubCategory": "HP7" if idx % 2 == 0 else "C6N",
+                    "version": "V5.3.8 build 230101",
+                    "status": 1,
+                    "mac": f"00:11:22:{idx >> 16 & 0xFF:02x}:{idx >> 8 & 0xFF:02x}:{idx & 0xFF:02x}",
+                    "channelNumber": 1,
+                    "offlineNotify": 0,
+                    "supportExt": json.dumps({"1": "1", "10": "1", "154": "1"}),
+                },
+                "STATUS": {
+                    "globalStatus": 1,
+                    "pirStatus": 1,
+                    "isEncrypt": 0,
+                    "alarmSoundMode": 0,
+                    "optionals": {"timeZone": "UTC+00:00"},
+                },
+                "CONNECTION": {
+                    "localIp": f"192.168.{idx >> 8 & 0xFF}.{idx & 0xFF}",
+                    "netIp": "203.0.113.10",
+                    "localRtspPort": 554,
+                },
+                "WIFI": {"ssid": "fake-wifi", "signal": 80, "address": "0.0.0.0"},
+                "SWITCH": [{"type": 7, "enable": False}, {"type": 22, "enable": True}],
+                "TIME_PLAN": [{"type": 2, "enable": 1}],
+                "NODISTURB": {"alarmEnable": 0, "callingEnable": 0},
+                "P2P": [],
+                "KMS": {},
+                "QOS": {},
+                "UPGRADE": {"isNeedUpgrade": 0},
+                "FEATURE": {},
+                "FEATURE_INFO": {},
+                "CUSTOM_TAG": {},
+                "CLOUD": {"deviceSerial": serial, "resourceId": resource_id},
+                "VTM": {},
+                "CHANNEL": {},
+                "VIDEO_QUALITY": {},
+            }
+            device.update(self.config.device_overrides.get(serial, {}))
+            devices[serial] = device
+        return devices
+
+    # ------------------------------------------------------------------
+    # Handlers
+    # ------------------------------------------------------------------
+
+    def _handle_login(self, **_: Any) -> tuple[int, dict[str, Any]]:
+        session_id, refresh_id = self._issue_session()
+        return 200, {
+            "meta": {"code": 200, "message": "OK"},
+            "loginSession": {"sessionId": session_id, "rfSessionId": refresh_id},
+            "loginUser": {"username": "fake_internal_user"},
+            "loginArea": {"apiDomain": self.base_url},
+        }
+
+    def _handle_refresh(self, *, form: dict[str, Any], **_: Any) -> tuple[int, dict[str, Any]]:
+        with self._lock:
+            known = form.get("refreshSessionId") in self._refresh_tokens
+        if not known:
+            return 200, {"meta": {"code": 403, "message": "refresh token invalid"}}
+        session_id, refresh_id = self._issue_session()
+        return 200, {
+            "meta": {"code": 200, "message": "OK"},
+            "sessionInfo": {"sessionId": session_id, "refreshSessionId": refresh_id},
+        }
+
+    def _handle_logout(self, **_: Any) -> tuple[int, dict[str, Any]]:
+        return 200, {"meta": {"code": 200, "message": "OK"}}
+
+    def _handle_server_info(self, **_: Any) -> tuple[int, dict[str, Any]]:
+        host = self.base_url.split("://", 1)[1].split(":", 1)[0]
+        sys_conf = ["0"] * 17
+        sys_conf[15] = host
+        sys_conf[16] = "6500"
+        return 200, {
+            "meta": {"code": 200, "message": "OK"},
+            "systemConfigInfo": {"pushAddr": self.base_url, "sysConf": "|".join(sys_conf)},
+        }
+
+    def _handle_user_id(self, **_: Any) -> tuple[int, dict[str, Any]]:
+        return 200, {
+            "meta": {"code": 200, "message": "OK"},
+            "deviceTokenInfo": {"userId": "fake_user_id", "token": uuid4().hex},
+        }
+
+    def _handle_pagelist(self, *, query: dict[str, str], **_: Any) -> tuple[int, dict[str, Any]]:
+        limit = max(1, min(int(query.get("limit", 30)), self.config.max_page_size))
+        offset = max(0, int(query.get("offset", 0)))
+        wanted = {s.strip() for s in query.get("filter", "").split(",") if s.strip()}
+        serials = list(self.devices)
+        page = serials[offset : offset + limit]
+
+        payload: dict[str, Any] = {
+            "meta": {"code": 200, "message": "OK"},
+            "page": {
+                "offset": offset,
+                "limit": limit,
+                "totalResults": len(serials),
+                "hasNext": offset + limit < len(serials),
+            },
+            "deviceInfos": [self.devices[s]["deviceInfos"] for s in page],
+            "resourceInfos": [
+                {"deviceSerial": s, "resourceId": self.devices[s]["resourceId"]} for s in page
+            ],
+        }
+        for section in _SERIAL_SECTIONS:
+            if section in wanted:
+                payload[section] = {s: self.devices[s][section] for s in page}
+        for section in _RESOURCE_SECTIONS:
+            if section in wanted:
+                payload[section] = {
+                    self.devices[s]["resourceId"]: self.devices[s][section] for s in page
+                }
+        return 200, payload
+
+    def _handle_alarminfo(self, *, query: dict[str, str], **_: Any) -> tuple[int, dict[str, Any]]:
+        serial = query.get("deviceSerials", "")
+        limit = max(1, int(query.get("limit", 1)))
+        with self._lock:
+            alarms = list(self._alarms.get(serial, ())[:limit])
+        return 200, {
+            "meta": {"code": 200, "message": "OK"},
+            "page": {"totalResults": len(alarms)},
+            "alarms": alarms,
+        }
+
+    def _handle_unifiedmsg(self, *, query: dict[str, str], **_: Any) -> tuple[int, dict[str, Any]]:
+        wanted = {s for s in query.get("serials", "").split(",") if s}
+        limit = max(1, min(int(query.get("limit", 20)), 50))
+        with self._lock:
+            alarms = [
+                alarm
+                for serial, items in self._alarms.items()
+                if not wanted or serial in wanted
+                for alarm in items
+            ]
+        alarms.sort(key=lambda alarm: alarm["alarmStartTime"], reverse=True)
+        end_time = query.get("endTime")
+        if end_time:
+            # Paging cursor: the msgId (or time) of the oldest message seen
+            ids = [alarm["alarmId"] for alarm in alarms]
+            if end_time in ids:
+                alarms = alarms[ids.index(end_time) + 1 :]
+            elif end_time.isdigit():
+                alarms = [a for a in alarms if a["alarmStartTime"] < int(end_time)]
+        return 200, {
+            "meta": {"code": 200, "message": "OK"},
+            "hasNext": len(alarms) > limit,
+            "message": [
+                {
+                    "msgId": alarm["alarmId"],
+                    "deviceSerial": alarm["deviceSerial"],
+                    "channelNo": 1,
+                    "time": alarm["alarmStartTime"],
+                    "timeStr": alarm["alarmStartTimeStr"],
+                    "subType": alarm["alarmType"],
+                    "title": alarm["sampleName"],
+                    "pic": alarm["picUrl"],
+                }
+                for alarm in alarms[:limit]
+            ],
+        }
+
+    def _handle_remote_unlock(
+        self, *, serial: str, form: dict[str, Any], **_: Any
+    ) -> tuple[int, dict[str, Any]]:
+        if serial not in self.devices:
+            return 200, {"meta": {"code": 2003, "message": "device not found"}}
+        lock_no = int((form.get("unLockInfo") or {}).get("lockNo", 0))
+        with self._lock:
+            self.unlocks.append((serial, lock_no))
+        return 200, {"meta": {"code": 200, "message": "OK"}}
+
+    def _handle_devices_status(
+        self, *, query: dict[str, str], **_: Any
+    ) -> tuple[int, dict[str, Any]]:
+        serials = [s for s in query.get("deviceSerials", "").split(",") if s]
+        return 200, {
+            "meta": {"code": 200, "message": "OK"},
+            "statusInfos": {
+                s: {"status": self.devices[s]["deviceInfos"]["status"]}
+                for s in serials
+                if s in self.devices
+            },
+        }
+
+    def _handle_mqtt_register(self, **_: Any) -> tuple[int, dict[str, Any]]:
+        return 200, {"status": 200, "data": {"clientId": f"fake-{uuid4().hex[:16]}"}}
+
+    def _handle_mqtt_start(self, **_: Any) -> tuple[int, dict[str, Any]]:
+        return 200, {"status": 200, "ticket": uuid4().hex}
+
+    def _handle_mqtt_stop(self, **_: Any) -> tuple[int, dict[str, Any]]:
+        return 200, {"status": 200}
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+def _exact(path: str) -> re.Pattern[str]:
+    return re.compile("^" + re.escape(path) + "$")
+
+
+def _decode_body(body: bytes, content_type: str) -> dict[str, Any]:
+    if not body:
+        return {}
+    text = body.decode("utf-8", "replace")
+    if "json" in content_type or text.lstrip().startswith("{"):
+        try:
+            decoded = json.loads(text)
+        except ValueError:
+            return {}
+        return decoded if isinstance(decoded, dict) else {}
+    return {k: v[-1] for k, v in parse_qs(text).items()}
+
+
+def _fault_response(fault: str) -> tuple[int, dict[str, Any]]:
+    if fault == "http401":
+        return 401, {"meta": {"code": 401, "message": "injected 401"}}
+    if fault == "meta500":
+        return 200, {"meta": {"code": 500, "message": "injected server busy"}}
+    if fault == "meta504":
+        return 200, {"meta": {"code": 504, "message": "injected gateway timeout"}}
+    return 200, {"resultCode": "-1", "resultDes": "injected failure"}
+
+
+def _make_handler(cloud: FakeEzvizCloud) -> type[BaseHTTPRequestHandler]:
+    """Bind a request handler class to ``cloud``."""
+
+    class _Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def _serve(self) -> None:
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length) if length else b""
+            try:
+                status, payload = cloud._dispatch(  # noqa: SLF001
+                    self.command, self.path, self.headers, body
+                )
+            except Exception as err:  # noqa: BLE001
+                _LOGGER.exception("Fake cloud handler failed")
+                status, payload = 500, {"meta": {"code": 500, "message": str(err)}}
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        do_GET = do_POST = do_PUT = do_DELETE = _serve
+
+        def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+            _LOGGER.debug("fake-cloud: " + format, *args)
+
+    return _Handler
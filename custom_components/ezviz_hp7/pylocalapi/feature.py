@@ -1,16 +1,143 @@
-"""Helpers for working with Ezviz feature metadata payloads."""
+"""Helpers for working with Ezviz feature metadata payloads.
+
+Most helpers need the same few nested sections (``FEATURE_INFO`` video
+settings, decoded ``optionals``), several of which arrive as JSON strings.
+:class:`FeatureView` wraps a payload, decodes each section on first use
+and caches it on the view, so reading many values through one view decodes
+every section once. The view is itself a read-only mapping over the
+payload: keep it next to the payload (``EzvizCamera.feature_view()`` does)
+and pass it to the public helpers, which are thin accessors over it. Plain
+payloads get a throw-away view per call.
+"""
 
 from __future__ import annotations
 
-from collections.abc import Iterable, Iterator, Mapping, MutableMapping
-from typing import Any, cast
+from collections.abc import Callable, Iterable, Iterator, Mapping, MutableMapping
+from typing import TYPE_CHECKING, Any, cast
 
 from .utils import coerce_int, decode_json
 
+if TYPE_CHECKING:
+    from .capabilities import CapabilityIndex
+
+_MISSING = object()
+
+
+class FeatureView(Mapping[str, Any]):
+    """Lazily decoded, memoized sections of one camera payload.
+
+    Reads as the wrapped payload (a read-only mapping), so it can be passed
+    wherever a payload is accepted. Cached values are shared between
+    callers; the public helpers return copies where they always did. The
+    payload is treated as immutable: build a new view for a new payload.
+    """
+
+    __slots__ = ("_cache", "_data")
+
+    def __init__(self, camera_data: Mapping[str, Any]) -> None:
+        """Wrap ``camera_data``; nothing is decoded until first access."""
+        self._data = camera_data
+        self._cache: dict[str, Any] = {}
+
+    def __getitem__(self, key: str) -> Any:
+        """Return a top-level payload key."""
+        return self._data[key]
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate the payload keys."""
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        """Return the number of payload keys."""
+        return len(self._data)
+
+    def _memo(self, name: str, build: Callable[[Mapping[str, Any]], Any]) -> Any:
+        value = self._cache.get(name, _MISSING)
+        if value is _MISSING:
+            value = self._cache[name] = build(self._data)
+        return value
+
+    @property
+    def video(self) -> dict[str, Any]:
+        """``FEATURE_INFO`` Video section (empty when absent)."""
+        return self._memo("video", _build_video_section)
+
+    @property
+    def optionals(self) -> Mapping[str, Any]:
+        """Decoded optionals mapping (empty when absent)."""
+        return self._memo("optionals", _build_optionals)
+
+    @property
+    def supplement_light_params(self) -> Mapping[str, Any]:
+        """Decoded SupplementLightMgr mode-switch parameters."""
+        return self._memo("supplement_light", _build_supplement_light_params)
+
+    @property
+    def lens_defog_config(self) -> dict[str, Any]:
+        """LensCleaning DefogCfg section."""
+        return self._memo("lens_defog", _build_lens_defog_config)
+
+    @property
+    def display_mode(self) -> Any:
+        """Decoded ``display_mode`` optional."""
+        return self._memo(
+            "display_mode", lambda _: decode_json(self.optionals.get("display_mode"))
+        )
+
+    @property
+    def inverse_mode(self) -> Any:
+        """Decoded ``inverse_mode`` (BLC) optional."""
+        return self._memo(
+            "inverse_mode", lambda _: decode_json(self.optionals.get("inverse_mode"))
+        )
+
+    @property
+    def icr_dss(self) -> Mapping[str, Any]:
+        """Decoded ``device_ICR_DSS`` optional."""
+        return self._memo(
+            "icr_dss",
+            lambda _: _as_mapping(decode_json(self.optionals.get("device_ICR_DSS"))),
+        )
+
+    @property
+    def night_vision(self) -> Mapping[str, Any]:
+        """Decoded NightVision_Model configuration."""
+        return self._memo("night_vision", self._build_night_vision)
+
+    @property
+    def port_security(self) -> Mapping[str, Any]:
+        """Normalized port-security mapping."""
+        return self._memo("port_security", _build_port_security_config)
+
+    def _build_night_vision(self, camera_data: Mapping[str, Any]) -> Mapping[str, Any]:
+        config: Any = self.optionals.get("NightVision_Model")
+        if config is None:
+            config = camera_data.get("NightVision_Model")
+        return _as_mapping(decode_json(config))
+
+
+def feature_view(camera_data: Mapping[str, Any]) -> FeatureView:
+    """Return ``camera_data`` as a :class:`FeatureView`.
+
+    A view is returned as-is (keeping its decoded sections); any other
+    payload gets a new view.
+    """
+    if isinstance(camera_data, FeatureView):
+        return camera_data
+    return FeatureView(camera_data)
+
+
+def _as_mapping(value: Any) -> Mapping[str, Any]:
+    return value if isinstance(value, Mapping) else {}
+
 
 def _feature_video_section(camera_data: Mapping[str, Any]) -> dict[str, Any]:
     """Return the nested Video feature section from feature info payload."""
 
+    return feature_view(camera_data).video
+
+
+def _build_video_section(camera_data: Mapping[str, Any]) -> dict[str, Any]:
     feature = camera_data.get("FEATURE_INFO")
     if not isinstance(feature, Mapping):
         return {}
@@ -27,7 +154,11 @@ def _feature_video_section(camera_data: Mapping[str, Any]) -> dict[str, Any]:
 def supplement_light_params(camera_data: Mapping[str, Any]) -> dict[str, Any]:
     """Return SupplementLightMgr parameters if present."""
 
-    video = _feature_video_section(camera_data)
+    return dict(feature_view(camera_data).supplement_light_params)
+
+
+def _build_supplement_light_params(camera_data: Mapping[str, Any]) -> Mapping[str, Any]:
+    video = feature_view(camera_data).video
     if not video:
         return {}
 
@@ -37,14 +168,13 @@ def supplement_light_params(camera_data: Mapping[str, Any]) -> dict[str, Any]:
         return {}
 
     params: Any = manager.get("ImageSupplementLightModeSwitchParams")
-    params = decode_json(params)
-    return dict(params) if isinstance(params, Mapping) else {}
+    return _as_mapping(decode_json(params))
 
 
 def supplement_light_enabled(camera_data: Mapping[str, Any]) -> bool:
     """Return True when intelligent fill light is enabled."""
 
-    params = supplement_light_params(camera_data)
+    params = feature_view(camera_data).supplement_light_params
     if not params:
         return False
 
@@ -63,13 +193,17 @@ def supplement_light_enabled(camera_data: Mapping[str, Any]) -> bool:
 def supplement_light_available(camera_data: Mapping[str, Any]) -> bool:
     """Return True when intelligent fill light parameters are present."""
 
-    return bool(supplement_light_params(camera_data))
+    return bool(feature_view(camera_data).supplement_light_params)
 
 
 def lens_defog_config(camera_data: Mapping[str, Any]) -> dict[str, Any]:
     """Return the LensCleaning defog configuration if present."""
 
-    video = _feature_video_section(camera_data)
+    return feature_view(camera_data).lens_defog_config
+
+
+def _build_lens_defog_config(camera_data: Mapping[str, Any]) -> dict[str, Any]:
+    video = feature_view(camera_data).video
     lens = video.get("LensCleaning") if isinstance(video, Mapping) else None
     if not isinstance(lens, MutableMapping):
         return {}
@@ -102,6 +236,10 @@ def lens_defog_value(camera_data: Mapping[str, Any]) -> int:
 def optionals_mapping(camera_data: Mapping[str, Any]) -> dict[str, Any]:
     """Return decoded optionals mapping from the camera payload."""
 
+    return dict(feature_view(camera_data).optionals)
+
+
+def _build_optionals(camera_data: Mapping[str, Any]) -> Mapping[str, Any]:
     status_info = camera_data.get("statusInfo")
     optionals: Any = None
     if isinstance(status_info, Mapping):
@@ -117,7 +255,7 @@ def optionals_mapping(camera_data: Mapping[str, Any]) -> dict[str, Any]:
         if isinstance(status, Mapping):
             optionals = decode_json(status.get("optionals"))
 
-    return dict(optionals) if isinstance(optionals, Mapping) else {}
+    return _as_mapping(optionals)
 
 
 def optionals_dict(camera_data: Mapping[str, Any]) -> dict[str, Any]:
@@ -129,7 +267,7 @@ def optionals_dict(camera_data: Mapping[str, Any]) -> dict[str, Any]:
 def iter_algorithm_entries(camera_data: Mapping[str, Any]) -> Iterator[dict[str, Any]]:
     """Yield entries from the AlgorithmInfo optionals list."""
 
-    entries = optionals_dict(camera_data).get("AlgorithmInfo")
+    entries = feature_view(camera_data).optionals.get("AlgorithmInfo")
     if not isinstance(entries, Iterable):
         return
     for entry in entries:
@@ -168,8 +306,19 @@ def has_algorithm_subtype(
     return get_algorithm_value(camera_data, subtype, channel) is not None
 
 
-def support_ext_value(camera_data: Mapping[str, Any], ext_key: str) -> str | None:
-    """Fetch a supportExt entry as a string when present."""
+def support_ext_value(
+    camera_data: Mapping[str, Any],
+    ext_key: str,
+    index: CapabilityIndex | None = None,
+) -> str | None:
+    """Fetch a supportExt entry as a string when present.
+
+    With ``index`` (from :meth:`EzvizClient.capabilities`) the compiled
+    index answers instead of a lookup in the payload mapping.
+    """
+
+    if index is not None:
+        return index.value(ext_key)
 
     raw = camera_data.get("supportExt")
     if not isinstance(raw, Mapping):
@@ -204,75 +353,107 @@ def _normalize_port_list(value: Any) -> list[dict[str, Any]] | None:
     return normalized
 
 
-def normalize_port_security(payload: Any) -> dict[str, Any]:
-    """Normalize IoT port-security payloads."""
+# Keys that lead to the port-security section, in lookup order.
+_PORT_SECURITY_KEYS = ("PortSecurity", "value", "data", "NetworkSecurityProtection")
+# Extra containers followed by the known-path probe (FEATURE_INFO groups).
+_PORT_SECURITY_PROBE_KEYS = (*_PORT_SECURITY_KEYS, "Video")
+_PORT_SECURITY_MAX_DEPTH = 12
 
-    seen: set[int] = set()
 
-    def _walk(obj: Any, hint: bool | None = None) -> dict[str, Any] | None:
-        obj = decode_json(obj)
-        if obj is None:
+def _decode_node(obj: Any) -> Any:
+    """``decode_json`` that skips strings which cannot hold a container."""
+    if isinstance(obj, str):
+        if obj.lstrip()[:1] not in ("{", "["):
             return None
-
+        return decode_json(obj)
+    return obj
+
+
+def _port_security_match(
+    obj: Mapping[str, Any], hint: bool | None
+) -> tuple[dict[str, Any] | None, bool | None]:
+    """Return ``(normalized, hint)`` for one mapping node."""
+    enabled_local = obj.get("enabled")
+    if isinstance(enabled_local, bool):
+        hint = enabled_local
+    ports = _normalize_port_list(obj.get("portSecurityList"))
+    if ports is None:
+        return None, hint
+    return {
+        "portSecurityList": ports,
+        "enabled": hint if isinstance(hint, bool) else True,
+    }, hint
+
+
+def _walk_port_security(
+    root: Any, *, probe: bool, max_depth: int = _PORT_SECURITY_MAX_DEPTH
+) -> dict[str, Any] | None:
+    """Depth-first search for the first port-security section.
+
+    Iterative (explicit stack) and bounded by ``max_depth``; children are
+    visited in the order of the original recursive walk: the known keys
+    first, then every other value. With ``probe`` only the known keys (and
+    the top-level resource groups) are followed, which finds the section
+    on well-formed payloads without touching the rest of the tree.
+    """
+    seen: set[int] = set()
+    stack: list[tuple[Any, bool | None, int]] = [(root, None, 0)]
+    while stack:
+        obj, hint, depth = stack.pop()
+        obj = _decode_node(obj)
+        if obj is None:
+            continue
         if isinstance(obj, Mapping):
-            obj_id = id(obj)
-            if obj_id in seen:
-                return None
-            seen.add(obj_id)
-
-            enabled_local = obj.get("enabled")
-            if isinstance(enabled_local, bool):
-                hint = enabled_local
-
-            ports = _normalize_port_list(obj.get("portSecurityList"))
-            if ports is not None:
-                return {
-                    "portSecurityList": ports,
-                    "enabled": bool(enabled_local)
-                    if isinstance(enabled_local, bool)
-                    else bool(hint)
-                    if isinstance(hint, bool)
-                    else True,
-                }
-
-            for key in (
-                "PortSecurity",
-                "value",
-                "data",
-                "NetworkSecurityProtection",
-            ):
-                if key in obj:
-                    candidate = _walk(obj[key], hint)
-                    if candidate:
-                        if "enabled" not in candidate and isinstance(hint, bool):
-                            candidate["enabled"] = hint
-                        return candidate
-
-            for value in obj.values():
-                candidate = _walk(value, hint)
-                if candidate:
-                    if "enabled" not in candidate and isinstance(hint, bool):
-                        candidate["enabled"] = hint
-                    return candidate
-
-        elif isinstance(obj, Iterable):
-            for item in obj:
-                candidate = _walk(item, hint)
-                if candidate:
-                    return candidate
+            if id(obj) in seen:
+                continue
+            seen.add(id(obj))
+            found, hint = _port_security_match(obj, hint)
+            if found is not None:
+                return found
+            if depth >= max_depth:
+                continue
+            if probe:
+                children = [obj[key] for key in _PORT_SECURITY_PROBE_KEYS if key in obj]
+                if depth == 0:
+                    children.extend(
+                        value for value in obj.values() if isinstance(value, Mapping)
+                    )
+            else:
+                children = [obj[key] for key in _PORT_SECURITY_KEYS if key in obj]
+                children.extend(obj.values())
+        elif isinstance(obj, (list, tuple)):
+            if probe or depth >= max_depth:
+                continue
+            children = list(obj)
+        else:
+            continue
+        stack.extend((child, hint, depth + 1) for child in reversed(children))
+    return None
 
-        return None
 
-    normalized = _walk(payload)
-    if isinstance(normalized, dict):
-        normalized.setdefault("enabled", True)
-        return normalized
-    return {}
+def normalize_port_security(payload: Any) -> dict[str, Any]:
+    """Normalize IoT port-security payloads.
+
+    Known locations are probed first; only if that fails is the whole tree
+    searched (iteratively, depth-bounded). Repeated reads of one payload
+    are memoized by its :class:`FeatureView` (see :func:`port_security_config`).
+    """
+
+    if payload is None:
+        return {}
+    normalized = _walk_port_security(payload, probe=True) or _walk_port_security(
+        payload, probe=False
+    )
+    return normalized or {}
 
 
 def port_security_config(camera_data: Mapping[str, Any]) -> dict[str, Any]:
     """Return the normalized port-security mapping for a camera payload."""
 
+    return dict(feature_view(camera_data).port_security)
+
+
+def _build_port_security_config(camera_data: Mapping[str, Any]) -> dict[str, Any]:
     direct = camera_data.get("NetworkSecurityProtection")
     normalized = normalize_port_security(direct)
     if normalized:
@@ -290,7 +471,7 @@ def port_security_config(camera_data: Mapping[str, Any]) -> dict[str, Any]:
 def port_security_has_port(camera_data: Mapping[str, Any], port: int) -> bool:
     """Return True if the normalized config contains the port."""
 
-    ports = port_security_config(camera_data).get("portSecurityList")
+    ports = feature_view(camera_data).port_security.get("portSecurityList")
     if not isinstance(ports, Iterable):
         return False
     return any(
@@ -302,7 +483,7 @@ def port_security_has_port(camera_data: Mapping[str, Any], port: int) -> bool:
 def port_security_port_enabled(camera_data: Mapping[str, Any], port: int) -> bool:
     """Return True if the specific port is enabled."""
 
-    ports = port_security_config(camera_data).get("portSecurityList")
+    ports = feature_view(camera_data).port_security.get("portSecurityList")
     if not isinstance(ports, Iterable):
         return False
     for entry in ports:
@@ -314,9 +495,7 @@ def port_security_port_enabled(camera_data: Mapping[str, Any], port: int) -> boo
 def display_mode_value(camera_data: Mapping[str, Any]) -> int:
     """Return display mode value (1..3) from camera data."""
 
-    optionals = optionals_mapping(camera_data)
-    display_mode = optionals.get("display_mode")
-    display_mode = decode_json(display_mode)
+    display_mode = feature_view(camera_data).display_mode
 
     if isinstance(display_mode, Mapping):
         mode = display_mode.get("mode")
@@ -331,9 +510,7 @@ def display_mode_value(camera_data: Mapping[str, Any]) -> int:
 
 def blc_current_value(camera_data: Mapping[str, Any]) -> int:
     """Return BLC position (0..5) from camera data. 0 = Off."""
-    optionals = optionals_mapping(camera_data)
-    inverse_mode = optionals.get("inverse_mode")
-    inverse_mode = decode_json(inverse_mode)
+    inverse_mode = feature_view(camera_data).inverse_mode
 
     # Expected: {"mode": int, "enable": 0|1, "position": 0..5}
     if isinstance(inverse_mode, Mapping):
@@ -359,16 +536,13 @@ def blc_current_value(camera_data: Mapping[str, Any]) -> int:
 def device_icr_dss_config(camera_data: Mapping[str, Any]) -> dict[str, Any]:
     """Decode and return the device_ICR_DSS configuration."""
 
-    optionals = optionals_mapping(camera_data)
-    icr = decode_json(optionals.get("device_ICR_DSS"))
-
-    return dict(icr) if isinstance(icr, Mapping) else {}
+    return dict(feature_view(camera_data).icr_dss)
 
 
 def day_night_mode_value(camera_data: Mapping[str, Any]) -> int:
     """Return current day/night mode (0=auto,1=day,2=night)."""
 
-    config = device_icr_dss_config(camera_data)
+    config = feature_view(camera_data).icr_dss
     mode = config.get("mode")
     if isinstance(mode, int) and mode in (0, 1, 2):
         return mode
@@ -378,7 +552,7 @@ def day_night_mode_value(camera_data: Mapping[str, Any]) -> int:
 def day_night_sensitivity_value(camera_data: Mapping[str, Any]) -> int:
     """Return current day/night sensitivity value (1..3)."""
 
-    config = device_icr_dss_config(camera_data)
+    config = feature_view(camera_data).icr_dss
     sensitivity = config.get("sensitivity")
     if isinstance(sensitivity, int) and sensitivity in (1, 2, 3):
         return sensitivity
@@ -399,20 +573,13 @@ def resolve_channel(camera_data: Mapping[str, Any]) -> int:
 def night_vision_config(camera_data: Mapping[str, Any]) -> dict[str, Any]:
     """Return decoded NightVision_Model configuration mapping."""
 
-    optionals = optionals_mapping(camera_data)
-    config: Any = optionals.get("NightVision_Model")
-    if config is None:
-        config = camera_data.get("NightVision_Model")
-
-    config = decode_json(config)
-
-    return dict(config) if isinstance(config, Mapping) else {}
+    return dict(feature_view(camera_data).night_vision)
 
 
 def night_vision_mode_value(camera_data: Mapping[str, Any]) -> int:
     """Return current night vision mode (0=BW,1=colour,2=smart,5=super)."""
 
-    config = night_vision_config(camera_data)
+    config = feature_view(camera_data).night_vision
     mode = coerce_int(config.get("graphicType"))
     if mode is None:
         return 0
@@ -422,7 +589,7 @@ def night_vision_mode_value(camera_data: Mapping[str, Any]) -> int:
 def night_vision_luminance_value(camera_data: Mapping[str, Any]) -> int:
     """Return the configured night vision luminance (default 40)."""
 
-    config = night_vision_config(camera_data)
+    config = feature_view(camera_data).night_vision
     value = coerce_int(config.get("luminance"))
     if value is None:
         value = 40
@@ -432,7 +599,7 @@ def night_vision_luminance_value(camera_data: Mapping[str, Any]) -> int:
 def night_vision_duration_value(camera_data: Mapping[str, Any]) -> int:
     """Return the configured smart night vision duration (default 60)."""
 
-    config = night_vision_config(camera_data)
+    config = feature_view(camera_data).night_vision
     value = coerce_int(config.get("duration"))
     return value if value is not None else 60
 
@@ -446,7 +613,7 @@ def night_vision_payload(
 ) -> dict[str, Any]:
     """Return a sanitized NightVision_Model payload for updates."""
 
-    config = dict(night_vision_config(camera_data))
+    config = dict(feature_view(camera_data).night_vision)
 
     resolved_mode = (
         int(mode)
@@ -494,8 +661,7 @@ def night_vision_payload(
 def has_osd_overlay(camera_data: Mapping[str, Any]) -> bool:
     """Return True when the camera has an active OSD label."""
 
-    optionals = optionals_mapping(camera_data)
-    osd_entries = optionals.get("OSD")
+    osd_entries = feature_view(camera_data).optionals.get("OSD")
 
     if isinstance(osd_entries, Mapping):
         entries: list[Mapping[str, Any]] = [osd_entries]
@@ -16,7 +16,7 @@ from .utils import fetch_nested_value
 
 if TYPE_CHECKING:
     from .client import EzvizClient
-from .models import EzvizDeviceRecord
+from .models import EzvizDeviceRecord, readonly_view
 
 
 class EzvizLightBulb:
@@ -44,11 +44,11 @@ class EzvizLightBulb:
         self._client = client
         self._serial = serial
         if device_obj is None:
-            self._device = self._client.get_device_infos(self._serial)
+            self._device = readonly_view(self._client.get_device_infos(self._serial))
         elif isinstance(device_obj, EzvizDeviceRecord):
-            self._device = dict(device_obj.raw)
+            self._device = readonly_view(device_obj.raw)
         else:
-            self._device = device_obj
+            self._device = readonly_view(device_obj)
         self._feature_json = self.get_feature_json()
         switches = self._device.get("SWITCH") or []
         self._switch: dict[int, bool] = {}
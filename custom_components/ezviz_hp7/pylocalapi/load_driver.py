@@ -0,0 +1,262 @@
+"""Load driver for EzvizClient against the local fake cloud.
+
+Spins up :class:`~.fake_cloud.FakeEzvizCloud` (or targets an already running
+instance via ``--url``), then runs concurrent callers that each own an
+:class:`EzvizClient` and repeatedly execute a scenario. Reports throughput
+and latency percentiles per operation.
+
+Example (from the ``custom_components/ezviz_hp7`` directory, so the
+Home Assistant integration package is not imported)::
+
+    python -m pylocalapi.load_driver \\
+        --devices 50 --concurrency 8 --duration 20 --latency 0.02 --fault-rate 0.02
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+import json
+import logging
+import sys
+import threading
+import time
+from typing import Any
+
+from .client import EzvizClient
+from .exceptions import PyEzvizError
+from .fake_cloud import FAULT_KINDS, FakeCloudConfig, FakeEzvizCloud
+
+_LOGGER = logging.getLogger(__name__)
+
+SCENARIOS = ("status", "alarm", "unlock", "devices_status", "mixed")
+
+
+@dataclass
+class OpStats:
+    """Latency samples and error count for one operation."""
+
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+
+    def summary(self, elapsed: float) -> dict[str, Any]:
+        """Return count, throughput and percentile latencies in milliseconds."""
+        ordered = sorted(self.latencies)
+        return {
+            "count": len(ordered),
+            "errors": self.errors,
+            "ops_per_sec": round(len(ordered) / elapsed, 2) if elapsed else 0.0,
+            "p50_ms": _percentile(ordered, 50),
+            "p95_ms": _percentile(ordered, 95),
+            "p99_ms": _percentile(ordered, 99),
+            "max_ms": round(ordered[-1] * 1000, 2) if ordered else None,
+        }
+
+
+def _percentile(ordered: list[float], pct: float) -> float | None:
+    if not ordered:
+        return None
+    idx = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return round(ordered[idx] * 1000, 2)
+
+
+def _operations(
+    client: EzvizClient, serials: list[str], scenario: str
+) -> list[tuple[str, Callable[[str], Any]]]:
+    """Return the (name, callable(serial)) steps for a scenario."""
+    status = ("get_device_infos", lambda _serial: client.get_device_infos())
+    alarm = ("get_alarminfo", lambda serial: client.get_alarminfo(serial))
+    unlock = ("remote_unlock", lambda serial: client.remote_unlock(serial, "load", 2))
+    devices_status = (
+        "get_devices_status",
+        lambda _serial: client.get_devices_status(serials),
+    )
+    if scenario == "status":
+        return [status]
+    if scenario == "alarm":
+        return [alarm]
+    if scenario == "unlock":
+        return [unlock]
+    if scenario == "devices_status":
+        return [devices_status]
+    return [status, alarm, devices_status, unlock]
+
+
+def discover_serials(url: str) -> list[str]:
+    """Return the serials the server at ``url`` actually lists."""
+    client = EzvizClient("load@example.com", "secret", url=url)
+    try:
+        client.login()
+        return list(client.get_device_infos())
+    finally:
+        client.close_session()
+
+
+def run_load(
+    url: str,
+    serials: list[str],
+    *,
+    scenario: str = "mixed",
+    concurrency: int = 4,
+    duration: float = 10.0,
+    iterations: int | None = None,
+) -> dict[str, Any]:
+    """Drive ``concurrency`` callers against ``url`` and return a report dict.
+
+    Each caller logs in once with its own client; a failed login is counted
+    as a ``login`` error and that caller stops. The run stops after
+    ``duration`` seconds, or after ``iterations`` scenario passes per caller
+    when given.
+    """
+    stats: dict[str, OpStats] = {}
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+
+    def record(name: str, elapsed: float, failed: bool) -> None:
+        with lock:
+            entry = stats.setdefault(name, OpStats())
+            if failed:
+                entry.errors += 1
+            else:
+                entry.latencies.append(elapsed)
+
+    def worker(index: int) -> None:
+        client = EzvizClient("load@example.com", "secret", url=url)
+        start = time.perf_counter()
+        try:
+            client.login()
+        except (PyEzvizError, OSError) as err:
+            # requests errors are OSErrors too
+            _LOGGER.debug("login failed: %s", err)
+            record("login", time.perf_counter() - start, True)
+            client.close_session()
+            return
+        record("login", time.perf_counter() - start, False)
+        steps = _operations(client, serials, scenario)
+        passes = 0
+        while True:
+            if iterations is not None and passes >= iterations:
+                break
+            if iterations is None and time.monotonic() >= stop_at:
+                break
+            serial = serials[(index + passes) % len(serials)]
+            for name, op in steps:
+                start = time.perf_counter()
+                failed = False
+                try:
+                    op(serial)
+                except PyEzvizError as err:
+                    failed = True
+                    _LOGGER.debug("%s failed: %s", name, err)
+                record(name, time.perf_counter() - start, failed)
+            passes += 1
+        client.close_session()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for future in [pool.submit(worker, i) for i in range(concurrency)]:
+            future.result()
+    elapsed = time.perf_counter() - started
+
+    total = sum(len(s.latencies) for s in stats.values())
+    return {
+        "scenario": scenario,
+        "concurrency": concurrency,
+        "elapsed_sec": round(elapsed, 3),
+        "total_ops": total,
+        "total_errors": sum(s.errors for s in stats.values()),
+        "ops_per_sec": round(total / elapsed, 2) if elapsed else 0.0,
+        "operations": {name: s.summary(elapsed) for name, s in sorted(stats.items())},
+    }
+
+
+def _print_report(report: dict[str, Any]) -> None:
+    print(
+        f"scenario={report['scenario']} concurrency={report['concurrency']} "
+        f"elapsed={report['elapsed_sec']}s ops={report['total_ops']} "
+        f"errors={report['total_errors']} throughput={report['ops_per_sec']} ops/s"
+    )
+    print(f"{'operation':<22}{'count':>8}{'errors':>8}{'ops/s':>10}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}")
+    for name, row in report["operations"].items():
+        print(
+            f"{name:<22}{row['count']:>8}{row['errors']:>8}{row['ops_per_sec']:>10}"
+            f"{row['p50_ms']!s:>10}{row['p95_ms']!s:>10}{row['p99_ms']!s:>10}{row['max_ms']!s:>10}"
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point for the load driver."""
+    parser = argparse.ArgumentParser(prog="load_driver")
+    parser.add_argument("--url", help="Use an already running fake cloud at this base URL")
+    parser.add_argument("--devices", type=int, default=10, help="Synthetic device count")
+    parser.add_argument("--page-size", type=int, default=30, help="Max pagelist page size")
+    parser.add_argument("--latency", type=float, default=0.0, help="Server latency (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Server latency jitter (s)")
+    parser.add_argument("--fault-rate", type=float, default=0.0, help="Random fault probability")
+    parser.add_argument(
+        "--faults",
+        default=",".join(FAULT_KINDS),
+        help=f"Comma separated fault kinds ({', '.join(FAULT_KINDS)})",
+    )
+    parser.add_argument("--scenario", choices=SCENARIOS, default="mixed")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=10.0, help="Run time (s)")
+    parser.add_argument("--iterations", type=int, help="Scenario passes per caller")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument("--debug", action="store_true")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.debug else logging.WARNING,
+        stream=sys.stderr,
+        format="%(levelname)s: %(message)s",
+    )
+
+    config = FakeCloudConfig(
+        device_count=args.devices,
+        latency=args.latency,
+        latency_jitter=args.jitter,
+        fault_rate=args.fault_rate,
+        faults=tuple(f.strip() for f in args.faults.split(",") if f.strip()),
+        max_page_size=args.page_size,
+    )
+    # With --url the server is remote: its device list is the source of truth
+    cloud = None if args.url else FakeEzvizCloud(config)
+    url = args.url or cloud.start()
+    try:
+        serials = discover_serials(url)
+        if cloud is not None and len(serials) != len(cloud.devices):
+            _LOGGER.error(
+                "Pagelist returned %s of %s devices", len(serials), len(cloud.devices)
+            )
+            return 1
+        if not serials:
+            _LOGGER.error("No devices listed by %s", url)
+            return 1
+        report = run_load(
+            url,
+            serials,
+            scenario=args.scenario,
+            concurrency=args.concurrency,
+            duration=args.duration,
+            iterations=args.iterations,
+        )
+    finally:
+        if cloud is not None:
+            cloud.stop()
+    if cloud is not None:
+        report["server_requests"] = dict(cloud.request_counts)
+        report["server_faults"] = dict(cloud.fault_counts)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print_report(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+# ruff: noqa: T201
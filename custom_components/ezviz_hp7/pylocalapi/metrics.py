@@ -0,0 +1,202 @@
+"""Per-endpoint request metrics for the Ezviz client.
+
+Records call counts, latency histograms, retries, re-logins and error codes
+keyed by a logical endpoint label (the request path with serials and other
+identifiers collapsed). Recording is a handful of integer updates under a
+lock, cheap enough to stay enabled in production.
+
+Example:
+    >>> client = EzvizClient(account, password)
+    >>> client.get_device_infos()
+    >>> client.metrics.snapshot()["endpoints"]["GET /v3/userdevices/v1/resources/pagelist"]
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+import re
+import threading
+from typing import Any, Final
+from urllib.parse import urlsplit
+
+# Upper bounds (milliseconds) of the latency histogram buckets; the last
+# implicit bucket collects everything slower.
+LATENCY_BUCKETS_MS: Final[tuple[float, ...]] = (
+    10,
+    25,
+    50,
+    100,
+    250,
+    500,
+    1000,
+    2500,
+    5000,
+    10000,
+)
+
+_ID_SEGMENT = re.compile(r"^(?=.*\d)[A-Za-z0-9_-]{6,}$|^\d+$")
+
+
+def endpoint_label(method: str, url: str) -> str:
+    """Return ``"METHOD /path"`` with identifier-like path segments collapsed.
+
+    Segments that are purely numeric, or at least six characters long and
+    containing a digit (device serials, resource ids), become ``{id}`` so all
+    calls to the same API share one label.
+    """
+    path = urlsplit(url).path if "://" in url else url.split("?", 1)[0]
+    segments = [
+        "{id}" if segment and _ID_SEGMENT.match(segment) else segment
+        for segment in path.split("/")
+    ]
+    return f"{method.upper()} {'/'.join(segments)}"
+
+
+class EndpointStats:
+    """Mutable counters for one logical endpoint."""
+
+    __slots__ = (
+        "buckets",
+        "codes",
+        "count",
+        "errors",
+        "max_ms",
+        "relogins",
+        "retries",
+        "total_ms",
+    )
+
+    def __init__(self) -> None:
+        """Initialize empty counters."""
+        self.count = 0
+        self.errors = 0
+        self.retries = 0
+        self.relogins = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.codes: Counter[str] = Counter()
+
+    def observe(self, elapsed_ms: float) -> None:
+        """Add one latency sample."""
+        self.count += 1
+        self.total_ms += elapsed_ms
+        if elapsed_ms > self.max_ms:
+            self.max_ms = elapsed_ms
+        for idx, bound in enumerate(LATENCY_BUCKETS_MS):
+            if elapsed_ms <= bound:
+                self.buckets[idx] += 1
+                return
+        self.buckets[-1] += 1
+
+    def percentile(self, pct: float) -> float | None:
+        """Estimate a latency percentile as the upper bound of its bucket."""
+        if not self.count:
+            return None
+        threshold = self.count * pct / 100
+        running = 0
+        for idx, hits in enumerate(self.buckets[:-1]):
+            running += hits
+            if running >= threshold:
+                return round(min(LATENCY_BUCKETS_MS[idx], self.max_ms), 2)
+        return round(self.max_ms, 2)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON-friendly copy of the counters."""
+        labels = [f"le_{int(bound)}" for bound in LATENCY_BUCKETS_MS] + ["inf"]
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "retries": self.retries,
+            "relogins": self.relogins,
+            "latency_ms": {
+                "avg": round(self.total_ms / self.count, 2) if self.count else None,
+                "max": round(self.max_ms, 2) if self.count else None,
+                "p50": self.percentile(50),
+                "p95": self.percentile(95),
+                "total": round(self.total_ms, 2),
+                "buckets": dict(zip(labels, self.buckets)),
+            },
+            "codes": dict(self.codes),
+        }
+
+
+class ClientMetrics:
+    """Thread-safe registry of :class:`EndpointStats` keyed by endpoint label."""
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self._lock = threading.Lock()
+        self._endpoints: dict[str, EndpointStats] = {}
+        self._local = threading.local()
+
+    @property
+    def last_endpoint(self) -> str | None:
+        """Label of the most recent request issued from the calling thread."""
+        return getattr(self._local, "endpoint", None)
+
+    def _stats(self, endpoint: str) -> EndpointStats:
+        stats = self._endpoints.get(endpoint)
+        if stats is None:
+            stats = self._endpoints[endpoint] = EndpointStats()
+        return stats
+
+    def record_request(
+        self, endpoint: str, elapsed: float, *, error: str | int | None = None
+    ) -> None:
+        """Record one HTTP attempt taking ``elapsed`` seconds.
+
+        ``error`` is an HTTP status or short error tag when the attempt failed.
+        """
+        self._local.endpoint = endpoint
+        with self._lock:
+            stats = self._stats(endpoint)
+            stats.observe(elapsed * 1000)
+            if error is not None:
+                stats.errors += 1
+                stats.codes[str(error)] += 1
+
+    def record_code(self, endpoint: str | None, code: str | int | None) -> None:
+        """Record a non-success API code (``meta.code`` / ``resultCode``)."""
+        if endpoint is None:
+            return
+        with self._lock:
+            stats = self._stats(endpoint)
+            stats.errors += 1
+            stats.codes[str(code)] += 1
+
+    def record_retry(self, endpoint: str | None = None) -> None:
+        """Record a policy retry; defaults to this thread's last endpoint."""
+        endpoint = endpoint or self.last_endpoint
+        if endpoint is None:
+            return
+        with self._lock:
+            self._stats(endpoint).retries += 1
+
+    def record_relogin(self, endpoint: str | None = None) -> None:
+        """Record a re-login triggered by ``endpoint``."""
+        endpoint = endpoint or self.last_endpoint
+        if endpoint is None:
+            return
+        with self._lock:
+            self._stats(endpoint).relogins += 1
+
+    def reset(self) -> None:
+        """Drop all recorded data."""
+        with self._lock:
+            self._endpoints.clear()
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return per-endpoint stats plus account-wide totals."""
+        with self._lock:
+            endpoints = {
+                label: stats.as_dict() for label, stats in self._endpoints.items()
+            }
+        totals = {
+            key: sum(ep[key] for ep in endpoints.values())
+            for key in ("count", "errors", "retries", "relogins")
+        }
+        totals["latency_ms"] = round(
+            sum(ep["latency_ms"]["total"] for ep in endpoints.values()), 2
+        )
+        return {"endpoints": endpoints, "totals": totals}
@@ -3,16 +3,33 @@
 from __future__ import annotations
 
 from collections.abc import Mapping
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
+from types import MappingProxyType
 from typing import Any
 
 
-@dataclass(frozen=True)
+def readonly_view(data: Mapping[str, Any] | None) -> Mapping[str, Any]:
+    """Return a read-only view of a pagelist mapping without copying it.
+
+    Records, cameras and bulbs share one device payload through these
+    views; an existing view is returned as-is so wrapping never nests.
+    """
+    if data is None:
+        return MappingProxyType({})
+    if isinstance(data, MappingProxyType):
+        return data
+    if isinstance(data, dict):
+        return MappingProxyType(data)
+    return data
+
+
+@dataclass(frozen=True, slots=True)
 class EzvizDeviceRecord:
     """A light, ergonomic view over Ezviz get_device_infos() output.
 
     Captures commonly used fields with a stable API while preserving
-    the full raw mapping for advanced/one-off access.
+    the full raw mapping for advanced/one-off access. Slotted, since an
+    account's records are rebuilt whenever a device's payload changes.
     """
 
     serial: str
@@ -36,9 +53,21 @@ class EzvizDeviceRecord:
     # Switches collapsed to a simple type->enabled map for convenience
     switches: Mapping[int, bool] = field(default_factory=dict)
 
-    # Full unmodified mapping for anything not yet modeled
+    # Full unmodified mapping for anything not yet modeled (read-only view)
     raw: Mapping[str, Any] = field(default_factory=dict)
 
+    @classmethod
+    def _make(cls, values: tuple[Any, ...]) -> EzvizDeviceRecord:
+        """Build a record from values in ``_RECORD_FIELDS`` order.
+
+        Skips the generated frozen ``__init__`` (one ``object.__setattr__``
+        per field) by writing the slots directly.
+        """
+        record = object.__new__(cls)
+        for setter, value in zip(_RECORD_SETTERS, values, strict=True):
+            setter(record, value)
+        return record
+
     @classmethod
     def from_api(cls, serial: str, data: Mapping[str, Any]) -> EzvizDeviceRecord:
         """Build EzvizDeviceRecord from raw pagelist mapping.
@@ -58,34 +87,52 @@ class EzvizDeviceRecord:
             if isinstance(t, int) and isinstance(en, (bool, int)):
                 switches[t] = bool(en)
 
-        return cls(
-            serial=serial,
-            name=device_infos.get("name"),
-            device_category=device_infos.get("deviceCategory") or device_infos.get("device_category"),
-            device_sub_category=device_infos.get("deviceSubCategory") or device_infos.get("device_sub_category"),
-            version=device_infos.get("version"),
-            status=device_infos.get("status") or status.get("globalStatus") if isinstance(status, dict) else None,
-            support_ext=device_infos.get("supportExt"),
-            connection=data.get("CONNECTION"),
-            wifi=data.get("WIFI"),
-            qos=data.get("QOS"),
-            vtm=next(iter((data.get("VTM") or {}).values()), None),
-            cloud=next(iter((data.get("CLOUD") or {}).values()), None),
-            p2p=data.get("P2P"),
-            time_plan=data.get("TIME_PLAN"),
-            optionals=optionals if isinstance(optionals, dict) else None,
-            switches=switches,
-            raw=data,
-        )
-
-
-def build_device_records_map(devices: Mapping[str, Any]) -> dict[str, EzvizDeviceRecord]:
+        # Positional, in _RECORD_FIELDS order
+        return cls._make((
+            serial,
+            device_infos.get("name"),
+            device_infos.get("deviceCategory") or device_infos.get("device_category"),
+            device_infos.get("deviceSubCategory") or device_infos.get("device_sub_category"),
+            device_infos.get("version"),
+            device_infos.get("status") or status.get("globalStatus") if isinstance(status, dict) else None,
+            device_infos.get("supportExt"),
+            data.get("CONNECTION"),
+            data.get("WIFI"),
+            data.get("QOS"),
+            next(iter((data.get("VTM") or {}).values()), None),
+            next(iter((data.get("CLOUD") or {}).values()), None),
+            data.get("P2P"),
+            data.get("TIME_PLAN"),
+            optionals if isinstance(optionals, dict) else None,
+            switches,
+            readonly_view(data),
+        ))
+
+
+# Field layout fixed once; _make writes the slot descriptors directly.
+_RECORD_FIELDS: tuple[str, ...] = tuple(f.name for f in fields(EzvizDeviceRecord))
+_RECORD_SETTERS = tuple(
+    getattr(EzvizDeviceRecord, name).__set__ for name in _RECORD_FIELDS
+)
+
+
+def build_device_records_map(
+    devices: Mapping[str, Any],
+    previous: Mapping[str, EzvizDeviceRecord] | None = None,
+) -> dict[str, EzvizDeviceRecord]:
     """Convert get_device_infos() mapping → {serial: EzvizDeviceRecord}.
 
-    Keeps behavior robust to partial/missing keys.
+    Keeps behavior robust to partial/missing keys. Records in ``previous``
+    (the last build) are returned as-is when the device payload is unchanged,
+    so a steady account allocates no new records on refresh.
     """
     out: dict[str, EzvizDeviceRecord] = {}
     for serial, payload in (devices or {}).items():
+        old = previous.get(serial) if previous else None
+        # Deep compare in C; shared sections short-circuit on identity
+        if old is not None and old.raw == payload:
+            out[serial] = old
+            continue
         try:
             out[serial] = EzvizDeviceRecord.from_api(serial, payload)
         except (TypeError, KeyError, ValueError):
@@ -97,7 +144,7 @@ def build_device_records_map(devices: Mapping[str, Any]) -> dict[str, EzvizDevic
                 device_sub_category=(payload.get("deviceInfos") or {}).get("deviceSubCategory"),
                 version=(payload.get("deviceInfos") or {}).get("version"),
                 status=(payload.get("deviceInfos") or {}).get("status"),
-                raw=payload,
+                raw=readonly_view(payload),
                 switches={},
             )
     return out
@@ -7,8 +7,9 @@ incoming payloads into a structured form.
 
 This module is intentionally synchronous (uses `requests` and
 `paho-mqtt`'s background network thread via `loop_start()`), which keeps
-integration code simple. If you later migrate to an async HA integration,
-wrap the blocking calls with `hass.async_add_executor_job`.
+integration code simple. For an event-loop based integration use
+:class:`~.mqtt_async.AsyncMQTTClient`, which drives the same protocol without
+a thread per account.
 
 Example:
     >>> client = MQTTClient(token)
@@ -22,25 +23,54 @@ from __future__ import annotations
 
 import base64
 from collections import OrderedDict
-from collections.abc import Callable
+from collections.abc import Callable, Iterable, Iterator, Mapping
 from contextlib import suppress
 import json
 import logging
+import random
+import threading
+import time
 from typing import Any, Final, TypedDict
 
 import paho.mqtt.client as mqtt
 import requests
 
+try:  # Optional fast JSON backend; accepts bytes directly.
+    import orjson
+
+    _json_loads: Callable[[bytes], Any] = orjson.loads
+    JSON_BACKEND: Final[str] = "orjson"
+except ImportError:  # pragma: no cover - depends on environment
+    _json_loads = json.loads
+    JSON_BACKEND = "json"
+
 from .api_endpoints import (
     API_ENDPOINT_REGISTER_MQTT,
     API_ENDPOINT_START_MQTT,
     API_ENDPOINT_STOP_MQTT,
 )
 from .constants import APP_SECRET, DEFAULT_TIMEOUT, FEATURE_CODE, MQTT_APP_KEY
+from .dedup import EventDeduplicator
+from .event_history import EventHistory
+from .event_queue import EventQueue, QueueWorker
 from .exceptions import HTTPError, InvalidURL, PyEzvizError
+from .tracing import NOOP_TRACER, TraceHooks
+from .utils import build_url, coerce_int
 
 _LOGGER = logging.getLogger(__name__)
 
+# Supervisor tuning (seconds).
+SUPERVISE_INTERVAL: Final[float] = 10.0
+RESTART_AFTER_DISCONNECT: Final[float] = 60.0
+RESTART_BACKOFF_BASE: Final[float] = 2.0
+RESTART_BACKOFF_MAX: Final[float] = 300.0
+# Start backfill slightly before the disconnect to cover clock skew.
+BACKFILL_SLACK: Final[float] = 5.0
+# Port of the EZVIZ push broker (host comes from ``service_urls.pushAddr``).
+MQTT_BROKER_PORT: Final[int] = 1882
+# MQTT CONNACK codes meaning the client id/credentials are no longer valid.
+_RESTART_CONNACK_CODES: Final[frozenset[int]] = frozenset({2, 4, 5})
+
 
 # ---------------------------------------------------------------------------
 # Typed structures
@@ -120,6 +150,195 @@ EXT_INT_FIELDS: Final[frozenset[str]] = frozenset(
 )
 
 
+def _int_or_raw(value: str) -> int | str:
+    """Convert an ``ext`` field to ``int``, keeping the raw string on failure."""
+    try:
+        return int(value)
+    except ValueError:
+        return value
+
+
+# Precomputed decoding schema: field name -> position, and the positions that
+# need integer conversion. Built once at import instead of per message.
+_EXT_FIELD_COUNT: Final[int] = len(EXT_FIELD_NAMES)
+_EXT_INDEX: Final[dict[str, int]] = {name: i for i, name in enumerate(EXT_FIELD_NAMES)}
+_EXT_CONVERTERS: Final[tuple[Callable[[str], Any] | None, ...]] = tuple(
+    _int_or_raw if name in EXT_INT_FIELDS else None for name in EXT_FIELD_NAMES
+)
+_EXT_INT_SLOTS: Final[tuple[int, ...]] = tuple(
+    i for i, conv in enumerate(_EXT_CONVERTERS) if conv is not None
+)
+_MISSING: Final = object()
+
+
+def _split_ext(ext: str) -> list[str | None]:
+    """Split an ``ext`` string into exactly ``len(EXT_FIELD_NAMES)`` slots."""
+    parts: list[str | None] = list(ext.split(",", _EXT_FIELD_COUNT)[:_EXT_FIELD_COUNT])
+    if len(parts) < _EXT_FIELD_COUNT:
+        parts.extend([None] * (_EXT_FIELD_COUNT - len(parts)))
+    return parts
+
+
+def decode_ext(ext: str) -> dict[str, Any]:
+    """Decode a comma-separated ``ext`` string into a dict of named fields.
+
+    Missing trailing fields are ``None``; integer fields that fail to parse
+    keep their raw string value.
+    """
+    values = _split_ext(ext)
+    for idx in _EXT_INT_SLOTS:
+        value = values[idx]
+        if value is not None:
+            try:
+                values[idx] = int(value)
+            except ValueError:
+                pass
+    return dict(zip(EXT_FIELD_NAMES, values))
+
+
+class ExtView(Mapping[str, Any]):
+    """Read-only, lazily converted view over a raw ``ext`` string.
+
+    The string is split on first access and each field is converted only
+    when read, then cached. Use :meth:`to_dict` where a real ``dict`` is
+    required (e.g. JSON serialization).
+    """
+
+    __slots__ = ("_cache", "_parts", "raw")
+
+    def __init__(self, raw: str) -> None:
+        """Wrap ``raw`` without parsing it."""
+        self.raw = raw
+        self._parts: list[str | None] | None = None
+        self._cache: dict[str, Any] = {}
+
+    def __getitem__(self, name: str) -> Any:
+        """Return the converted value of field ``name``."""
+        value = self._cache.get(name, _MISSING)
+        if value is not _MISSING:
+            return value
+        idx = _EXT_INDEX[name]
+        if self._parts is None:
+            self._parts = _split_ext(self.raw)
+        value = self._parts[idx]
+        conv = _EXT_CONVERTERS[idx]
+        if conv is not None and value is not None:
+            value = conv(value)
+        self._cache[name] = value
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over all field names."""
+        return iter(EXT_FIELD_NAMES)
+
+    def __len__(self) -> int:
+        """Return the number of ``ext`` fields."""
+        return _EXT_FIELD_COUNT
+
+    def __repr__(self) -> str:
+        """Show the raw string rather than forcing a full decode."""
+        return f"ExtView({self.raw!r})"
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a fully decoded plain ``dict``."""
+        return decode_ext(self.raw)
+
+
+def decode_mqtt_payload(payload_bytes: bytes, *, lazy_ext: bool = False) -> dict[str, Any]:
+    """Decode a raw EZVIZ push payload.
+
+    ``ext`` is decoded eagerly into a dict, or wrapped in an :class:`ExtView`
+    when ``lazy_ext`` is True. JSON parsing uses ``orjson`` when installed.
+
+    Raises:
+        ValueError: If the payload is not valid UTF-8 JSON (``json.JSONDecodeError``
+            or the ``orjson`` equivalent, both ``ValueError`` subclasses).
+    """
+    data = _json_loads(payload_bytes)
+    if not isinstance(data, dict):
+        raise ValueError("MQTT payload is not a JSON object")
+    ext = data.get("ext")
+    if isinstance(ext, str):
+        data["ext"] = ExtView(ext) if lazy_ext else decode_ext(ext)
+    return data
+
+
+def push_register_auth() -> str:
+    """Return the Basic auth header value for the push register call."""
+    return (
+        "Basic "
+        + base64.b64encode(f"{MQTT_APP_KEY}:{APP_SECRET}".encode("ascii")).decode()
+    )
+
+
+def push_register_payload() -> dict[str, Any]:
+    """Return the form body of the push register (client id) call."""
+    return {
+        "appKey": MQTT_APP_KEY,
+        "clientType": "5",
+        "mac": FEATURE_CODE,
+        "token": "123456",
+        "version": "v1.3.0",
+    }
+
+
+def push_session_payload(
+    client_id: str | None, token: Mapping[str, Any], *, start: bool
+) -> dict[str, Any]:
+    """Return the form body of the push start (``start=True``) or stop call."""
+    payload: dict[str, Any] = {
+        "appKey": MQTT_APP_KEY,
+        "clientId": client_id,
+        "clientType": 5,
+        "sessionId": token["session_id"],
+        "username": token["username"],
+    }
+    if start:
+        payload["token"] = "123456"
+    return payload
+
+
+def push_event_from_message(item: Mapping[str, Any]) -> dict[str, Any] | None:
+    """Convert one unified message list entry into the decoded push shape.
+
+    Used to backfill events missed while disconnected, so consumers handle
+    them exactly like live MQTT messages. The result carries
+    ``"backfill": True``. Returns ``None`` for entries without a serial.
+    """
+    serial = item.get("deviceSerial") or item.get("subSerial")
+    if not serial:
+        return None
+    stamp = coerce_int(item.get("time") or item.get("msgTime"))
+    code = coerce_int(item.get("subType") or item.get("alarmType") or item.get("msgType"))
+    ext: dict[str, Any] = dict.fromkeys(EXT_FIELD_NAMES)
+    ext.update(
+        {
+            "time": item.get("timeStr"),
+            "device_serial": str(serial),
+            "channel_no": coerce_int(item.get("channelNo") or item.get("channel")),
+            "alert_type_code": code,
+            "file_id": item.get("fileId"),
+            "msgId": item.get("msgId"),
+            "image": item.get("pic") or item.get("picUrl"),
+            "device_name": item.get("deviceName"),
+        }
+    )
+    return {
+        "id": item.get("msgId"),
+        "alert": item.get("title") or item.get("detail"),
+        "alert_type": str(code) if code is not None else None,
+        "ext": ext,
+        "t": str(stamp) if stamp is not None else None,
+        "backfill": True,
+    }
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Return a full-jitter exponential backoff delay in seconds."""
+    ceiling = min(RESTART_BACKOFF_MAX, RESTART_BACKOFF_BASE * 2 ** min(attempt, 16))
+    return random.uniform(RESTART_BACKOFF_BASE / 2, max(ceiling, RESTART_BACKOFF_BASE))
+
+
 # ---------------------------------------------------------------------------
 # Client
 # ---------------------------------------------------------------------------
@@ -154,6 +373,13 @@ class MQTTClient:
         on_message_callback: Callable[[dict[str, Any]], None] | None = None,
         *,
         max_messages: int = 1000,
+        tracer: TraceHooks | None = None,
+        lazy_ext: bool = False,
+        event_queue: EventQueue | None = None,
+        history_size: int = 0,
+        token_provider: Callable[[], Mapping[str, Any]] | None = None,
+        backfill: Callable[[float], Iterable[dict[str, Any]]] | None = None,
+        dedup: EventDeduplicator | None = None,
     ) -> None:
         """Initialize the Ezviz MQTT client.
 
@@ -174,6 +400,34 @@ class MQTTClient:
             max_messages:
                 Maximum number of device entries kept in :attr:`messages_by_device`.
                 Oldest entries are evicted when the limit is exceeded. Defaults to ``1000``.
+            tracer:
+                Tracing hooks receiving ``mqtt.receive``/``mqtt.decode``/``mqtt.callback``
+                spans for every message. Defaults to a no-op.
+            lazy_ext:
+                Deliver ``ext`` as an :class:`ExtView` that converts fields on
+                access instead of a fully decoded dict. Defaults to ``False``.
+            event_queue:
+                Hand decoded messages to this bounded queue instead of running
+                ``on_message_callback`` on paho's network thread. When a
+                callback is also given, a :class:`QueueWorker` thread delivers
+                to it; otherwise consumers read :attr:`events` themselves
+                (e.g. with :class:`AsyncEventReader`). Defaults to ``None``.
+            history_size:
+                Keep the last ``history_size`` events per device in
+                :attr:`history` for local time-range queries. ``0`` (the
+                default) disables the history.
+            token_provider:
+                Returns the current EZVIZ token. The supervisor uses it to notice
+                a rotated session id and restart push with it. Defaults to the
+                ``token`` passed in.
+            backfill:
+                Called by the supervisor after a reconnect with the epoch time the
+                connection was lost; returns missed events in decoded push shape
+                (see :func:`push_event_from_message`), oldest first.
+            dedup:
+                Drop messages whose ``msgId``/``file_id`` was already seen by this
+                index, which may be shared with polling consumers. Defaults to
+                ``None`` (no de-duplication).
 
         Raises:
             PyEzvizError: If the provided token is missing required fields.
@@ -191,6 +445,28 @@ class MQTTClient:
         self._topic: str = f"{MQTT_APP_KEY}/#"
         self._on_message_callback = on_message_callback
         self._max_messages: int = max_messages
+        self._tracer: TraceHooks = tracer or NOOP_TRACER
+        self._lazy_ext = lazy_ext
+        self._event_queue = event_queue
+        self._worker: QueueWorker | None = None
+        self._token_provider = token_provider
+        self._backfill = backfill
+        self._dedup = dedup
+
+        # Supervisor state
+        self._clean_session = False
+        self._keepalive = 60
+        self._supervisor: threading.Thread | None = None
+        self._stopping = threading.Event()
+        self._wake = threading.Event()
+        self._restart_requested = False
+        self._push_session: str | None = None
+        self._disconnected_at: float | None = None
+        self._pending_gap: float | None = None
+        self._last_message_at: float | None = None
+        self.decode_errors = 0
+        self.duplicates = 0
+        self.restarts = 0
 
         self._mqtt_data: MqttData = {
             "mqtt_clientid": None,
@@ -201,12 +477,26 @@ class MQTTClient:
         self.mqtt_client: mqtt.Client | None = None
         # Keep last payload per device, bounded by ``max_messages``
         self.messages_by_device: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self.history: EventHistory | None = (
+            EventHistory(history_size) if history_size > 0 else None
+        )
 
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
 
-    def connect(self, *, clean_session: bool = False, keepalive: int = 60) -> None:
+    @property
+    def events(self) -> EventQueue | None:
+        """Handoff queue of decoded messages, if one was configured."""
+        return self._event_queue
+
+    def queue_stats(self) -> dict[str, Any]:
+        """Return depth/drop counters of the handoff queue (empty without one)."""
+        return self._event_queue.stats() if self._event_queue is not None else {}
+
+    def connect(
+        self, *, clean_session: bool = False, keepalive: int = 60, supervise: bool = False
+    ) -> None:
         """Connect to the Ezviz MQTT broker and start receiving push messages.
 
         This method performs the following steps:
@@ -218,18 +508,37 @@ class MQTTClient:
         Keyword Args:
           clean_session (bool, optional): Whether to start a clean MQTT session. Defaults to False.
           keepalive (int, optional): Keep-alive interval in seconds for the MQTT connection. Defaults to 60.
+          supervise (bool, optional): Start a supervisor thread that re-registers and
+            restarts push (with jittered backoff) when the session id rotates or the
+            broker rejects the client, and backfills events missed while disconnected.
+            Defaults to False.
 
         Raises:
           PyEzvizError: If required Ezviz credentials are missing or registration/start fails.
           InvalidURL: If a push API endpoint is invalid or unreachable.
           HTTPError: If a push API request returns a non-success status.
         """
+        self._clean_session = clean_session
+        self._keepalive = keepalive
+        self._stopping.clear()
         self._register_ezviz_push()
         self._start_ezviz_push()
         self._configure_mqtt(clean_session=clean_session)
+        if (
+            self._event_queue is not None
+            and self._on_message_callback
+            and (self._worker is None or not self._worker.running)
+        ):
+            self._worker = QueueWorker(self._event_queue, self._dispatch)
+            self._worker.start()
         assert self.mqtt_client is not None
-        self.mqtt_client.connect(self._mqtt_data["push_url"], 1882, keepalive)
+        self.mqtt_client.connect(self._mqtt_data["push_url"], MQTT_BROKER_PORT, keepalive)
         self.mqtt_client.loop_start()
+        if supervise and (self._supervisor is None or not self._supervisor.is_alive()):
+            self._supervisor = threading.Thread(
+                target=self._supervise, name="ezviz-mqtt-supervisor", daemon=True
+            )
+            self._supervisor.start()
 
     def stop(self) -> None:
         """Stop the MQTT client and push notifications.
@@ -242,6 +551,14 @@ class MQTTClient:
         Raises:
           PyEzvizError: If stopping the push service fails.
         """
+        self._stopping.set()
+        self._wake.set()
+        if (
+            self._supervisor is not None
+            and self._supervisor is not threading.current_thread()
+        ):
+            self._supervisor.join(timeout=self._timeout)
+        self._supervisor = None
         if self.mqtt_client:
             try:
                 # Stop background thread and disconnect
@@ -249,6 +566,9 @@ class MQTTClient:
                 self.mqtt_client.disconnect()
             except Exception as err:  # noqa: BLE001
                 _LOGGER.debug("MQTT disconnect failed: %s", err)
+        if self._worker is not None:
+            self._worker.stop()
+            self._worker = None
         # Always attempt to stop push on server side
         self._stop_ezviz_push()
 
@@ -283,6 +603,14 @@ class MQTTClient:
         _LOGGER.debug("MQTT connected: rc=%s session_present=%s", rc, session_present)
         if rc == 0 and not session_present:
             client.subscribe(self._topic, qos=2)
+        if rc == 0 and self._disconnected_at is not None:
+            # Reconnected: let the supervisor backfill the gap off this thread.
+            self._pending_gap = self._disconnected_at
+            self._disconnected_at = None
+            self._wake.set()
+        if rc in _RESTART_CONNACK_CODES:
+            self._restart_requested = True
+            self._wake.set()
         if rc != 0:
             # Let paho handle reconnects (reconnect_delay_set configured)
             _LOGGER.error(
@@ -308,6 +636,8 @@ class MQTTClient:
             rc,
             "disconnected",
         )
+        if self._disconnected_at is None and not self._stopping.is_set():
+            self._disconnected_at = time.time()
 
     def _on_message(
         self, client: mqtt.Client, userdata: Any, msg: mqtt.MQTTMessage
@@ -315,28 +645,70 @@ class MQTTClient:
         """Handle incoming MQTT messages.
 
         Decodes the payload, updates `messages_by_device` with the latest message,
-        and calls the optional user callback.
+        and calls the optional user callback, or hands the message to the
+        event queue when one is configured.
 
         Args:
             client (mqtt.Client): The MQTT client instance.
             userdata (Any): The user data passed to the client (not used).
             msg (mqtt.MQTTMessage): The MQTT message object containing payload and topic.
         """
+        tracer = self._tracer
+        receive_span = (
+            tracer.start_span("mqtt.receive", topic=msg.topic, bytes=len(msg.payload))
+            if tracer.enabled
+            else None
+        )
+        try:
+            self._handle_message(msg)
+        finally:
+            if receive_span is not None:
+                tracer.end_span(receive_span)
+
+    def _handle_message(self, msg: mqtt.MQTTMessage) -> None:
+        """Decode one message and pass it to :meth:`_ingest` (traced by ``_on_message``)."""
+        tracer = self._tracer
+        decode_span = tracer.start_span("mqtt.decode") if tracer.enabled else None
         try:
             decoded = self.decode_mqtt_message(msg.payload)
         except PyEzvizError as err:
+            self.decode_errors += 1
+            if decode_span is not None:
+                tracer.end_span(decode_span, error=str(err))
             _LOGGER.warning("MQTT decode error: msg=%s", str(err))
             return
 
-        ext: dict[str, Any] = (
-            decoded.get("ext", {}) if isinstance(decoded.get("ext"), dict) else {}
+        if decode_span is not None:
+            ext = decoded.get("ext")
+            ext = ext if isinstance(ext, Mapping) else {}
+            tracer.end_span(
+                decode_span,
+                serial=ext.get("device_serial"),
+                alert_code=ext.get("alert_type_code"),
+                msg_id=ext.get("msgId"),
+            )
+        self._ingest(decoded)
+
+    def _ingest(self, decoded: dict[str, Any]) -> None:
+        """Cache, record and dispatch one decoded (or backfilled) message."""
+        ext: Mapping[str, Any] = (
+            decoded["ext"] if isinstance(decoded.get("ext"), Mapping) else {}
         )
         device_serial = ext.get("device_serial")
         alert_code = ext.get("alert_type_code")
         msg_id = ext.get("msgId")
+        self._last_message_at = time.time()
+        if self._dedup is not None and not self._dedup.is_new(decoded):
+            self.duplicates += 1
+            _LOGGER.debug(
+                "MQTT duplicate dropped: serial=%s msg_id=%s", device_serial, msg_id
+            )
+            return
 
         if device_serial:
             self._cache_message(device_serial, decoded)
+            if self.history is not None:
+                self.history.record_push(decoded)
             _LOGGER.debug(
                 "MQTT msg: serial=%s alert_code=%s msg_id=%s",
                 device_serial,
@@ -350,11 +722,165 @@ class MQTTClient:
                 msg_id,
             )
 
-        if self._on_message_callback:
+        if self._event_queue is not None:
+            if not self._event_queue.put(decoded):
+                _LOGGER.debug(
+                    "MQTT event dropped (queue full): serial=%s msg_id=%s",
+                    device_serial,
+                    msg_id,
+                )
+            return
+        self._dispatch(decoded)
+
+    def _dispatch(self, decoded: dict[str, Any]) -> None:
+        """Run the user callback for one decoded message (traced)."""
+        if not self._on_message_callback:
+            return
+        tracer = self._tracer
+        callback_span = None
+        if tracer.enabled:
+            ext = decoded.get("ext")
+            ext = ext if isinstance(ext, Mapping) else {}
+            callback_span = tracer.start_span(
+                "mqtt.callback",
+                serial=ext.get("device_serial"),
+                msg_id=ext.get("msgId"),
+            )
+        error: str | None = None
+        try:
+            self._on_message_callback(decoded)
+        except Exception as err:
+            error = type(err).__name__
+            _LOGGER.exception("The on_message_callback raised")
+        finally:
+            if callback_span is not None:
+                tracer.end_span(callback_span, error=error)
+
+    # ------------------------------------------------------------------
+    # Supervision
+    # ------------------------------------------------------------------
+
+    def _supervise(self) -> None:
+        """Supervisor loop: restart push when needed and backfill gaps.
+
+        Every iteration is guarded: an unexpected error is logged and
+        retried with back-off, so the supervisor thread never dies.
+        """
+        attempt = 0
+        while not self._stopping.is_set():
+            self._wake.wait(SUPERVISE_INTERVAL)
+            self._wake.clear()
+            if self._stopping.is_set():
+                return
             try:
-                self._on_message_callback(decoded)
+                attempt = self._supervise_once(attempt)
             except Exception:
-                _LOGGER.exception("The on_message_callback raised")
+                attempt += 1
+                delay = _backoff_delay(attempt)
+                _LOGGER.exception(
+                    "MQTT supervisor: unexpected error (attempt %s), retry in %.1fs",
+                    attempt,
+                    delay,
+                )
+                self._stopping.wait(delay)
+                self._wake.set()
+
+    def _supervise_once(self, attempt: int) -> int:
+        """Run one supervisor iteration; return the updated failure count."""
+        try:
+            if self._needs_restart():
+                self._restart_push()
+                attempt = 0
+        except (PyEzvizError, requests.RequestException, OSError) as err:
+            attempt += 1
+            delay = _backoff_delay(attempt)
+            _LOGGER.warning(
+                "MQTT supervisor: restart failed (attempt %s), retry in %.1fs: %s",
+                attempt,
+                delay,
+                err,
+            )
+            self._restart_requested = True
+            self._stopping.wait(delay)
+            self._wake.set()
+            return attempt
+        if self._pending_gap is not None:
+            since, self._pending_gap = self._pending_gap, None
+            try:
+                self._run_backfill(since)
+            except (PyEzvizError, requests.RequestException) as err:
+                _LOGGER.warning("MQTT backfill failed, will retry: %s", err)
+                if self._pending_gap is None:
+                    self._pending_gap = since
+            except Exception:
+                # Keep the gap for the next iteration; the caller backs off
+                if self._pending_gap is None:
+                    self._pending_gap = since
+                raise
+        return attempt
+
+    def _needs_restart(self) -> bool:
+        """Return True if push must be re-registered and restarted."""
+        if self._restart_requested:
+            return True
+        if self._token_provider is not None:
+            token = self._token_provider()
+            session_id = token.get("session_id") if token else None
+            if session_id and session_id != self._push_session:
+                _LOGGER.debug("MQTT supervisor: session id rotated, restarting push")
+                return True
+        disconnected_at = self._disconnected_at
+        return (
+            disconnected_at is not None
+            and time.time() - disconnected_at > RESTART_AFTER_DISCONNECT
+        )
+
+    def _restart_push(self) -> None:
+        """Tear down the MQTT session and run register/start/connect again."""
+        if self._disconnected_at is None:
+            self._disconnected_at = time.time()
+        gap_start = self._disconnected_at
+        old_client = self.mqtt_client
+        if old_client is not None:
+            with suppress(Exception):
+                old_client.loop_stop()
+                old_client.disconnect()
+        with suppress(PyEzvizError, requests.RequestException):
+            self._stop_ezviz_push()
+        if self._token_provider is not None:
+            token = self._token_provider()
+            if token:
+                push_url = (token.get("service_urls") or {}).get("pushAddr")
+                if not push_url:
+                    raise PyEzvizError("Token has no push service address (pushAddr)")
+                self._token = token  # type: ignore[assignment]
+                self._mqtt_data["push_url"] = push_url
+        self._register_ezviz_push()
+        self._start_ezviz_push()
+        self._configure_mqtt(clean_session=self._clean_session)
+        assert self.mqtt_client is not None
+        # Keep the gap open until on_connect reports success.
+        self._disconnected_at = gap_start
+        self.mqtt_client.connect(
+            self._mqtt_data["push_url"], MQTT_BROKER_PORT, self._keepalive
+        )
+        self.mqtt_client.loop_start()
+        self._restart_requested = False
+        self.restarts += 1
+        _LOGGER.info(
+            "MQTT push restarted: client_id=%s", self._mqtt_data["mqtt_clientid"]
+        )
+
+    def _run_backfill(self, since: float) -> None:
+        """Deliver events missed since ``since`` through the normal path."""
+        if self._backfill is None:
+            return
+        events = list(self._backfill(since - BACKFILL_SLACK))
+        for event in events:
+            self._ingest(event)
+        _LOGGER.debug(
+            "MQTT backfill: %s events since %s", len(events), int(since)
+        )
 
     # ------------------------------------------------------------------
     # HTTP helpers
@@ -370,25 +896,12 @@ class MQTTClient:
             InvalidURL: If the push service URL is invalid or unreachable.
             HTTPError: If the HTTP request fails for other reasons.
         """
-        auth_seq = (
-            "Basic "
-            + base64.b64encode(f"{MQTT_APP_KEY}:{APP_SECRET}".encode("ascii")).decode()
-        )
-
-        payload = {
-            "appKey": MQTT_APP_KEY,
-            "clientType": "5",
-            "mac": FEATURE_CODE,
-            "token": "123456",
-            "version": "v1.3.0",
-        }
-
         try:
             req = self._session.post(
-                f"https://{self._mqtt_data['push_url']}{API_ENDPOINT_REGISTER_MQTT}",
+                build_url(self._mqtt_data["push_url"], API_ENDPOINT_REGISTER_MQTT),
                 allow_redirects=False,
-                headers={"Authorization": auth_seq},
-                data=payload,
+                headers={"Authorization": push_register_auth()},
+                data=push_register_payload(),
                 timeout=self._timeout,
             )
             req.raise_for_status()
@@ -413,7 +926,13 @@ class MQTTClient:
             )
 
         # Persist client id from payload
-        self._mqtt_data["mqtt_clientid"] = json_output["data"]["clientId"]
+        data = json_output.get("data")
+        client_id = data.get("clientId") if isinstance(data, Mapping) else None
+        if not client_id:
+            raise PyEzvizError(
+                f"EZVIZ mqtt registration returned no clientId: Got {json_output})"
+            )
+        self._mqtt_data["mqtt_clientid"] = client_id
 
     def _start_ezviz_push(self) -> None:
         """Start push notifications for this client with the Ezviz API.
@@ -426,20 +945,13 @@ class MQTTClient:
             InvalidURL: If the push service URL is invalid or unreachable.
             HTTPError: If the HTTP request fails for other reasons.
         """
-        payload = {
-            "appKey": MQTT_APP_KEY,
-            "clientId": self._mqtt_data["mqtt_clientid"],
-            "clientType": 5,
-            "sessionId": self._token["session_id"],
-            "username": self._token["username"],
-            "token": "123456",
-        }
-
         try:
             req = self._session.post(
-                f"https://{self._mqtt_data['push_url']}{API_ENDPOINT_START_MQTT}",
+                build_url(self._mqtt_data["push_url"], API_ENDPOINT_START_MQTT),
                 allow_redirects=False,
-                data=payload,
+                data=push_session_payload(
+                    self._mqtt_data["mqtt_clientid"], self._token, start=True
+                ),
                 timeout=self._timeout,
             )
             req.raise_for_status()
@@ -463,7 +975,13 @@ class MQTTClient:
                 f"Could not signal EZVIZ mqtt server to start pushing messages: Got {json_output})"
             )
 
-        self._mqtt_data["ticket"] = json_output["ticket"]
+        ticket = json_output.get("ticket")
+        if not ticket:
+            raise PyEzvizError(
+                f"EZVIZ mqtt start returned no ticket: Got {json_output})"
+            )
+        self._mqtt_data["ticket"] = ticket
+        self._push_session = self._token["session_id"]
         _LOGGER.debug(
             "MQTT ticket acquired: client_id=%s", self._mqtt_data["mqtt_clientid"]
         )
@@ -478,18 +996,12 @@ class MQTTClient:
             InvalidURL: If the push service URL is invalid or unreachable.
             HTTPError: If the HTTP request fails for other reasons.
         """
-        payload = {
-            "appKey": MQTT_APP_KEY,
-            "clientId": self._mqtt_data["mqtt_clientid"],
-            "clientType": 5,
-            "sessionId": self._token["session_id"],
-            "username": self._token["username"],
-        }
-
         try:
             req = self._session.post(
-                f"https://{self._mqtt_data['push_url']}{API_ENDPOINT_STOP_MQTT}",
-                data=payload,
+                build_url(self._mqtt_data["push_url"], API_ENDPOINT_STOP_MQTT),
+                data=push_session_payload(
+                    self._mqtt_data["mqtt_clientid"], self._token, start=False
+                ),
                 timeout=self._timeout,
             )
             req.raise_for_status()
@@ -580,7 +1092,8 @@ class MQTTClient:
         """Decode raw MQTT message payload into a structured dictionary.
 
         The returned dictionary will contain all top-level fields from the message,
-        and the 'ext' field is parsed into named subfields with numeric fields converted to int.
+        and the 'ext' field is parsed into named subfields with numeric fields converted to int
+        (or wrapped in an :class:`ExtView` when the client was built with ``lazy_ext``).
 
         Parameters:
             payload_bytes (bytes): Raw payload received from MQTT broker.
@@ -593,24 +1106,10 @@ class MQTTClient:
             PyEzvizError: If the payload is not valid JSON.
         """
         try:
-            payload_str = payload_bytes.decode("utf-8")
-            data: dict[str, Any] = json.loads(payload_str)
-
-            if "ext" in data and isinstance(data["ext"], str):
-                ext_parts = data["ext"].split(",")
-                ext_dict: dict[str, Any] = {}
-                for i, name in enumerate(EXT_FIELD_NAMES):
-                    value: Any = ext_parts[i] if i < len(ext_parts) else None
-                    if value is not None and name in EXT_INT_FIELDS:
-                        with suppress(ValueError):
-                            value = int(value)
-                    ext_dict[name] = value
-                data["ext"] = ext_dict
-
-        except json.JSONDecodeError as err:
-            # Stop the client on malformed payloads as a defensive measure,
-            # mirroring previous behaviour.
-            self.stop()
+            data = decode_mqtt_payload(payload_bytes, lazy_ext=self._lazy_ext)
+        except ValueError as err:
+            # A single malformed payload is skipped; it must not tear down
+            # the push session for every later message.
             raise PyEzvizError(f"Unable to decode MQTT message: {err}") from err
 
         return data
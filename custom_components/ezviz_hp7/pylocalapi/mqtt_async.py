@@ -0,0 +1,498 @@
+"""Asyncio-native EZVIZ push client.
+
+:class:`AsyncMQTTClient` is the event-loop counterpart of
+:class:`~.mqtt.MQTTClient`: the push register/start/stop calls use an
+``aiohttp`` session and the paho-mqtt connection is driven by the event loop
+itself (socket readiness callbacks plus a housekeeping task) instead of
+``loop_start()``'s background thread. Many accounts can therefore share one
+loop without a thread each. Decoded events are delivered through an async
+iterator::
+
+    async with AsyncMQTTClient(token, session) as client:
+        async for event in client:
+            ...
+
+``aiohttp`` is an optional dependency (Home Assistant ships it); a
+:class:`PyEzvizError` is raised when it is missing.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Mapping
+from contextlib import suppress
+import json
+import logging
+import time
+from typing import Any
+
+import paho.mqtt.client as mqtt
+
+from .api_endpoints import (
+    API_ENDPOINT_REGISTER_MQTT,
+    API_ENDPOINT_START_MQTT,
+    API_ENDPOINT_STOP_MQTT,
+)
+from .constants import APP_SECRET, DEFAULT_TIMEOUT, MQTT_APP_KEY
+from .dedup import EventDeduplicator
+from .event_history import EventHistory
+from .event_queue import AsyncEventReader, EventQueue, OverflowPolicy
+from .exceptions import HTTPError, InvalidURL, PyEzvizError
+from .mqtt import (
+    _RESTART_CONNACK_CODES,
+    BACKFILL_SLACK,
+    MQTT_BROKER_PORT,
+    _backoff_delay,
+    decode_mqtt_payload,
+    push_register_auth,
+    push_register_payload,
+    push_session_payload,
+)
+from .utils import build_url
+
+_LOGGER = logging.getLogger(__name__)
+
+# Seconds between paho housekeeping calls (keepalive pings, retries).
+_MISC_INTERVAL = 1.0
+
+
+class AsyncMQTTClient:
+    """EZVIZ push client running entirely on an asyncio event loop."""
+
+    def __init__(
+        self,
+        token: Mapping[str, Any],
+        session: Any,
+        *,
+        timeout: int = DEFAULT_TIMEOUT,
+        max_messages: int = 1000,
+        lazy_ext: bool = False,
+        queue_size: int = 256,
+        overflow: OverflowPolicy | str = OverflowPolicy.DROP_OLDEST,
+        history_size: int = 0,
+        dedup: EventDeduplicator | None = None,
+        token_provider: Callable[[], Mapping[str, Any]] | None = None,
+        backfill: Callable[[float], Awaitable[Iterable[dict[str, Any]]]] | None = None,
+    ) -> None:
+        """Initialize the client.
+
+        Args:
+            token: EZVIZ token with ``username``, ``session_id`` and
+                ``service_urls.pushAddr``.
+            session: ``aiohttp.ClientSession`` used for the push HTTP calls.
+            timeout: HTTP timeout in seconds.
+            max_messages: Devices kept in :attr:`messages_by_device`.
+            lazy_ext: Deliver ``ext`` as a lazy :class:`~.mqtt.ExtView`.
+            queue_size: Capacity of the event queue behind the iterator.
+            overflow: Overflow policy of that queue (``block`` is not
+                supported here and falls back to ``drop_oldest``).
+            history_size: Events kept per device in :attr:`history`
+                (``0`` disables it).
+            dedup: Shared de-duplication index, as for ``MQTTClient``.
+            token_provider: Returns the current token; a rotated session id
+                triggers a push restart on the next reconnect.
+            backfill: Coroutine function returning missed events (decoded push
+                shape, oldest first) since an epoch time, run after reconnects.
+
+        Raises:
+            PyEzvizError: If the token lacks the username or ``aiohttp`` is not
+                installed.
+        """
+        try:
+            import aiohttp  # noqa: PLC0415
+        except ImportError as err:
+            raise PyEzvizError(
+                "AsyncMQTTClient requires the 'aiohttp' package"
+            ) from err
+        if not token or not token.get("username"):
+            raise PyEzvizError(
+                "Ezviz internal username is required. Ensure EzvizClient.login() was called first."
+            )
+        self._aiohttp = aiohttp
+        self._session = session
+        self._token: Mapping[str, Any] = token
+        self._timeout = timeout
+        self._topic = f"{MQTT_APP_KEY}/#"
+        self._max_messages = max_messages
+        self._lazy_ext = lazy_ext
+        self._dedup = dedup
+        self._token_provider = token_provider
+        self._backfill = backfill
+        policy = OverflowPolicy(overflow)
+        self.events = EventQueue(
+            queue_size,
+            OverflowPolicy.DROP_OLDEST if policy is OverflowPolicy.BLOCK else policy,
+        )
+        self.messages_by_device: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self.history: EventHistory | None = (
+            EventHistory(history_size) if history_size > 0 else None
+        )
+
+        self.client_id: str | None = None
+        self.ticket: str | None = None
+        self.mqtt_client: mqtt.Client | None = None
+        self._push_session: str | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._misc_task: asyncio.Task[None] | None = None
+        self._reconnect_task: asyncio.Task[None] | None = None
+        self._connected = asyncio.Event()
+        self._clean_session = False
+        self._keepalive = 60
+        self._port = MQTT_BROKER_PORT
+        self._stopping = False
+        self._disconnected_at: float | None = None
+        self.decode_errors = 0
+        self.duplicates = 0
+        self.restarts = 0
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    @property
+    def push_url(self) -> str:
+        """Push service host from the current token."""
+        return str(self._token["service_urls"]["pushAddr"])
+
+    async def connect(
+        self,
+        *,
+        clean_session: bool = False,
+        keepalive: int = 60,
+        port: int = MQTT_BROKER_PORT,
+        wait: bool = True,
+    ) -> None:
+        """Register, start push and connect to the broker.
+
+        With ``wait`` (the default) this returns once the broker accepted the
+        connection.
+
+        Raises:
+            PyEzvizError: If registration or push start fails.
+            HTTPError: If a push API request returns a non-success status.
+            InvalidURL: If the push service cannot be reached.
+        """
+        self._loop = asyncio.get_running_loop()
+        self._clean_session = clean_session
+        self._keepalive = keepalive
+        self._port = port
+        self._stopping = False
+        await self._start_session()
+        if wait:
+            await asyncio.wait_for(self._connected.wait(), self._timeout)
+
+    async def stop(self) -> None:
+        """Disconnect, stop push on the server and end event iteration."""
+        self._stopping = True
+        for task in (self._reconnect_task, self._misc_task):
+            if task is not None:
+                task.cancel()
+        self._reconnect_task = None
+        if self.mqtt_client is not None:
+            with suppress(Exception):
+                self.mqtt_client.disconnect()
+        try:
+            await self._push_call(API_ENDPOINT_STOP_MQTT, start=False)
+        finally:
+            self.events.close()
+
+    def __aiter__(self) -> AsyncIterator[Mapping[str, Any]]:
+        """Iterate over decoded events until :meth:`stop` is called."""
+        return AsyncEventReader(self.events, self._loop)
+
+    async def __aenter__(self) -> AsyncMQTTClient:
+        """Connect and return self."""
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        """Stop the client."""
+        await self.stop()
+
+    def queue_stats(self) -> dict[str, Any]:
+        """Return depth/drop counters of the event queue."""
+        return self.events.stats()
+
+    # ------------------------------------------------------------------
+    # Push HTTP calls
+    # ------------------------------------------------------------------
+
+    async def _post_json(self, path: str, **kwargs: Any) -> dict[str, Any]:
+        aiohttp = self._aiohttp
+        try:
+            async with self._session.post(
+                build_url(self.push_url, path),
+                allow_redirects=False,
+                timeout=aiohttp.ClientTimeout(total=self._timeout),
+                **kwargs,
+            ) as resp:
+                resp.raise_for_status()
+                text = await resp.text()
+        except aiohttp.ClientResponseError as err:
+            raise HTTPError from err
+        except (aiohttp.ClientError, TimeoutError) as err:
+            raise InvalidURL("Invalid URL or proxy error") from err
+        try:
+            data = json.loads(text)
+            if not isinstance(data, dict):
+                raise ValueError("expected a JSON object")
+        except ValueError as err:
+            raise PyEzvizError(
+                "Impossible to decode response: " + str(err) + "Response was: " + text
+            ) from err
+        return data
+
+    async def _register(self) -> None:
+        json_output = await self._post_json(
+            API_ENDPOINT_REGISTER_MQTT,
+            headers={"Authorization": push_register_auth()},
+            data=push_register_payload(),
+        )
+        if json_output.get("status") != 200:
+            raise PyEzvizError(
+                f"Could not register to EZVIZ mqtt server: Got {json_output})"
+            )
+        self.client_id = json_output["data"]["clientId"]
+
+    async def _push_call(self, path: str, *, start: bool) -> None:
+        json_output = await self._post_json(
+            path, data=push_session_payload(self.client_id, self._token, start=start)
+        )
+        if json_output.get("status") != 200:
+            action = "start" if start else "stop"
+            raise PyEzvizError(
+                f"Could not signal EZVIZ mqtt server to {action} pushing messages: Got {json_output})"
+            )
+        if start:
+            self.ticket = json_output["ticket"]
+            self._push_session = self._token["session_id"]
+
+    # ------------------------------------------------------------------
+    # Session / connection management
+    # ------------------------------------------------------------------
+
+    async def _start_session(self) -> None:
+        """Run register + start and (re)connect a fresh paho client."""
+        if self._token_provider is not None:
+            token = self._token_provider()
+            if token:
+                self._token = token
+        await self._register()
+        await self._push_call(API_ENDPOINT_START_MQTT, start=True)
+        if self.mqtt_client is not None:
+            with suppress(Exception):
+                self.mqtt_client.disconnect()
+        self._configure()
+        await self._connect_socket()
+
+    def _configure(self) -> None:
+        client = mqtt.Client(
+            callback_api_version=mqtt.CallbackAPIVersion.VERSION1,
+            client_id=self.client_id,
+            clean_session=self._clean_session,
+            protocol=mqtt.MQTTv311,
+            transport="tcp",
+        )
+        client.on_connect = self._on_connect
+        client.on_disconnect = self._on_disconnect
+        client.on_message = self._on_message
+        client.on_socket_open = self._on_socket_open
+        client.on_socket_close = self._on_socket_close
+        client.on_socket_register_write = self._on_socket_register_write
+        client.on_socket_unregister_write = self._on_socket_unregister_write
+        client.username_pw_set(MQTT_APP_KEY, APP_SECRET)
+        self.mqtt_client = client
+
+    async def _connect_socket(self) -> None:
+        """Open the broker connection without blocking the loop.
+
+        paho's ``connect`` resolves and opens the TCP socket synchronously,
+        so only that step runs in the default executor; all traffic after it
+        is handled on the loop.
+        """
+        assert self.mqtt_client is not None and self._loop is not None
+        self._connected.clear()
+        await self._loop.run_in_executor(
+            None, self.mqtt_client.connect, self.push_url, self._port, self._keepalive
+        )
+
+    def _session_rotated(self) -> bool:
+        if self._token_provider is None:
+            return False
+        token = self._token_provider()
+        session_id = token.get("session_id") if token else None
+        return bool(session_id) and session_id != self._push_session
+
+    async def _reconnect(self, *, restart: bool) -> None:
+        """Reconnect with jittered backoff; re-register when needed."""
+        attempt = 0
+        while not self._stopping:
+            attempt += 1
+            delay = _backoff_delay(attempt)
+            _LOGGER.debug("MQTT reconnect attempt %s in %.1fs", attempt, delay)
+            await asyncio.sleep(delay)
+            try:
+                if restart or self._session_rotated() or attempt > 3:
+                    await self._start_session()
+                    self.restarts += 1
+                else:
+                    await self._connect_socket()
+                await asyncio.wait_for(self._connected.wait(), self._timeout)
+            except (PyEzvizError, OSError, TimeoutError) as err:
+                _LOGGER.warning("MQTT reconnect failed (attempt %s): %s", attempt, err)
+                restart = restart or isinstance(err, PyEzvizError)
+                continue
+            return
+
+    def _schedule_reconnect(self, *, restart: bool) -> None:
+        if self._stopping or self._loop is None:
+            return
+        if self._reconnect_task is not None and not self._reconnect_task.done():
+            return
+        self._reconnect_task = self._loop.create_task(self._reconnect(restart=restart))
+
+    async def _run_backfill(self, since: float) -> None:
+        if self._backfill is None:
+            return
+        try:
+            events = list(await self._backfill(since - BACKFILL_SLACK))
+        except (PyEzvizError, OSError) as err:
+            _LOGGER.warning("MQTT backfill failed: %s", err)
+            return
+        for event in events:
+            self._ingest(event)
+        _LOGGER.debug("MQTT backfill: %s events since %s", len(events), int(since))
+
+    # ------------------------------------------------------------------
+    # paho socket callbacks (may run in the executor during connect)
+    # ------------------------------------------------------------------
+
+    def _call_on_loop(self, func: Callable[..., Any], *args: Any) -> None:
+        assert self._loop is not None
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            func(*args)
+        else:
+            self._loop.call_soon_threadsafe(func, *args)
+
+    def _on_socket_open(self, client: mqtt.Client, userdata: Any, sock: Any) -> None:
+        def _attach() -> None:
+            assert self._loop is not None
+            self._loop.add_reader(sock, client.loop_read)
+            if self._misc_task is None or self._misc_task.done():
+                self._misc_task = self._loop.create_task(self._misc_loop(client))
+
+        self._call_on_loop(_attach)
+
+    def _on_socket_close(self, client: mqtt.Client, userdata: Any, sock: Any) -> None:
+        def _detach() -> None:
+            assert self._loop is not None
+            self._loop.remove_reader(sock)
+            if self._misc_task is not None:
+                self._misc_task.cancel()
+                self._misc_task = None
+
+        self._call_on_loop(_detach)
+
+    def _on_socket_register_write(
+        self, client: mqtt.Client, userdata: Any, sock: Any
+    ) -> None:
+        self._call_on_loop(
+            lambda: self._loop.add_writer(sock, client.loop_write)  # type: ignore[union-attr]
+        )
+
+    def _on_socket_unregister_write(
+        self, client: mqtt.Client, userdata: Any, sock: Any
+    ) -> None:
+        self._call_on_loop(
+            lambda: self._loop.remove_writer(sock)  # type: ignore[union-attr]
+        )
+
+    async def _misc_loop(self, client: mqtt.Client) -> None:
+        """Drive paho's keepalive/retry housekeeping."""
+        while client.loop_misc() == mqtt.MQTT_ERR_SUCCESS:
+            await asyncio.sleep(_MISC_INTERVAL)
+
+    # ------------------------------------------------------------------
+    # MQTT callbacks (run on the loop)
+    # ------------------------------------------------------------------
+
+    def _on_connect(
+        self, client: mqtt.Client, userdata: Any, flags: dict, rc: int
+    ) -> None:
+        session_present = (
+            flags.get("session present") if isinstance(flags, dict) else None
+        )
+        _LOGGER.debug("MQTT connected: rc=%s session_present=%s", rc, session_present)
+        if rc != 0:
+            _LOGGER.error(
+                "MQTT connect failed: serial=%s code=%s msg=%s",
+                "unknown",
+                rc,
+                "connect_failed",
+            )
+            restart = rc in _RESTART_CONNACK_CODES
+            self._call_on_loop(lambda: self._schedule_reconnect(restart=restart))
+            return
+        if not session_present:
+            client.subscribe(self._topic, qos=2)
+        gap_start, self._disconnected_at = self._disconnected_at, None
+
+        def _connected() -> None:
+            self._connected.set()
+            if gap_start is not None and self._loop is not None:
+                self._loop.create_task(self._run_backfill(gap_start))
+
+        self._call_on_loop(_connected)
+
+    def _on_disconnect(self, client: mqtt.Client, userdata: Any, rc: int) -> None:
+        _LOGGER.debug(
+            "MQTT disconnected: serial=%s code=%s msg=%s", "unknown", rc, "disconnected"
+        )
+        if self._stopping:
+            return
+        if self._disconnected_at is None:
+            self._disconnected_at = time.time()
+        self._call_on_loop(self._clear_and_reconnect)
+
+    def _clear_and_reconnect(self) -> None:
+        self._connected.clear()
+        self._schedule_reconnect(restart=False)
+
+    def _on_message(
+        self, client: mqtt.Client, userdata: Any, msg: mqtt.MQTTMessage
+    ) -> None:
+        try:
+            decoded = decode_mqtt_payload(msg.payload, lazy_ext=self._lazy_ext)
+        except ValueError as err:
+            self.decode_errors += 1
+            _LOGGER.warning("MQTT decode error: msg=%s", err)
+            return
+        self._ingest(decoded)
+
+    def _ingest(self, decoded: dict[str, Any]) -> None:
+        """Cache, record and enqueue one decoded (or backfilled) message."""
+        ext = decoded.get("ext")
+        ext = ext if isinstance(ext, Mapping) else {}
+        device_serial = ext.get("device_serial")
+        if self._dedup is not None and not self._dedup.is_new(decoded):
+            self.duplicates += 1
+            return
+        if device_serial:
+            self.messages_by_device.pop(device_serial, None)
+            self.messages_by_device[device_serial] = decoded
+            while len(self.messages_by_device) > self._max_messages:
+                self.messages_by_device.popitem(last=False)
+            if self.history is not None:
+                self.history.record_push(decoded)
+        if not self.events.put(decoded):
+            _LOGGER.debug(
+                "MQTT event dropped (queue full): serial=%s msg_id=%s",
+                device_serial,
+                ext.get("msgId"),
+            )
+
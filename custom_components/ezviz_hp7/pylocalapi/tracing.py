@@ -0,0 +1,239 @@
+"""Pluggable tracing hooks for HTTP, MQTT and CAS operations.
+
+The client, MQTT and CAS layers call :meth:`TraceHooks.start_span` /
+:meth:`TraceHooks.end_span` around each operation. The default
+:data:`NOOP_TRACER` has ``enabled = False`` so call sites skip building span
+attributes entirely; the remaining cost is one attribute check per operation.
+
+Span names used by this package:
+
+``http.request``
+    One HTTP attempt. Attributes: ``endpoint``, ``serial``, ``attempt``,
+    ``request_bytes``; on end ``status``, ``response_bytes``, ``error``.
+``mqtt.receive`` / ``mqtt.decode`` / ``mqtt.callback``
+    Push message arrival on paho's thread, payload decoding and the user
+    callback. Attributes: ``topic``, ``bytes``, ``serial``, ``alert_code``,
+    ``msg_id``, ``error``.
+``cas.connect`` / ``cas.exchange``
+    TLS connection to the CAS server and one request/response exchange.
+    Attributes: ``host``, ``port``, ``serial``, ``op``, ``request_bytes``,
+    ``response_bytes``, ``error``.
+
+:class:`RecordingTraceHooks` keeps the last finished spans in memory,
+:class:`JsonLinesTraceHooks` writes them to a local file and
+:class:`OpenTelemetryTraceHooks` forwards them to an OpenTelemetry tracer
+(requires the optional ``opentelemetry-api`` package).
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Mapping
+import json
+from pathlib import Path
+import threading
+import time
+from typing import Any, ClassVar
+from uuid import uuid4
+
+from .exceptions import PyEzvizError
+
+# Request keys that carry a device serial, in lookup order.
+_SERIAL_KEYS = ("deviceSerial", "deviceSerials", "subSerial", "serial", "serials")
+
+
+def serial_hint(*sources: Any) -> str | None:
+    """Return the first serial-like value found in request params/bodies."""
+    for source in sources:
+        if isinstance(source, Mapping):
+            for key in _SERIAL_KEYS:
+                value = source.get(key)
+                if value:
+                    return str(value)
+    return None
+
+
+class TraceHooks:
+    """Tracing interface; the base implementation does nothing.
+
+    Subclasses set ``enabled = True`` and override both methods. The object
+    returned by :meth:`start_span` is opaque to callers and handed back
+    unchanged to :meth:`end_span`.
+    """
+
+    enabled: ClassVar[bool] = False
+
+    def start_span(self, name: str, **attrs: Any) -> Any:
+        """Begin a span and return a handle for :meth:`end_span`."""
+        return None
+
+    def end_span(self, span: Any, **attrs: Any) -> None:
+        """Finish ``span`` adding ``attrs`` (e.g. status, bytes, error)."""
+
+
+NOOP_TRACER = TraceHooks()
+
+
+class Span:
+    """A finished or in-flight span recorded by :class:`RecordingTraceHooks`."""
+
+    __slots__ = (
+        "attrs",
+        "duration",
+        "name",
+        "parent_id",
+        "perf_start",
+        "span_id",
+        "start",
+        "trace_id",
+    )
+
+    def __init__(
+        self, name: str, attrs: dict[str, Any], parent: Span | None
+    ) -> None:
+        """Start the span now."""
+        self.name = name
+        self.attrs = attrs
+        self.span_id = uuid4().hex[:16]
+        self.trace_id = parent.trace_id if parent else uuid4().hex
+        self.parent_id = parent.span_id if parent else None
+        self.start = time.time()
+        self.perf_start = time.perf_counter()
+        self.duration: float | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON-friendly representation."""
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": self.start,
+            "duration_ms": round(self.duration * 1000, 3)
+            if self.duration is not None
+            else None,
+            "attrs": self.attrs,
+        }
+
+
+class RecordingTraceHooks(TraceHooks):
+    """Keep the last ``maxlen`` finished :class:`Span` objects in memory.
+
+    Spans started while another span is open on the same thread become its
+    children, so an ``http.request`` issued from an ``mqtt.callback`` shares
+    the callback's trace id. Subclasses override :meth:`export` to send
+    spans elsewhere instead.
+    """
+
+    enabled: ClassVar[bool] = True
+
+    def __init__(self, maxlen: int = 1000) -> None:
+        """Initialize the per-thread span stack and the bounded span buffer."""
+        self._local = threading.local()
+        self._finished: deque[Span] = deque(maxlen=maxlen)
+
+    def _stack(self) -> list[Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def start_span(self, name: str, **attrs: Any) -> Span:
+        """Begin a span, parented to the innermost open span on this thread."""
+        stack = self._stack()
+        span = Span(name, attrs, stack[-1] if stack else None)
+        stack.append(span)
+        return span
+
+    def end_span(self, span: Any, **attrs: Any) -> None:
+        """Finish ``span`` and pass it to :meth:`export`."""
+        if not isinstance(span, Span):
+            return
+        span.duration = time.perf_counter() - span.perf_start
+        span.attrs.update(attrs)
+        stack = self._stack()
+        if span in stack:
+            stack.remove(span)
+        self.export(span)
+
+    def export(self, span: Span) -> None:
+        """Record a finished span, dropping the oldest beyond ``maxlen``."""
+        self._finished.append(span)
+
+    @property
+    def spans(self) -> list[Span]:
+        """Finished spans, oldest first."""
+        return list(self._finished)
+
+    def clear(self) -> None:
+        """Forget the recorded spans."""
+        self._finished.clear()
+
+
+class JsonLinesTraceHooks(RecordingTraceHooks):
+    """Append finished spans as JSON lines to ``path``."""
+
+    def __init__(self, path: str | Path) -> None:
+        """Open ``path`` for appending."""
+        super().__init__()
+        self._lock = threading.Lock()
+        self._fh = Path(path).open("a", encoding="utf-8")
+
+    def export(self, span: Span) -> None:
+        """Write one JSON line for ``span``."""
+        line = json.dumps(span.as_dict(), default=str, ensure_ascii=False)
+        with self._lock:
+            self._fh.write(line + "\n")
+            self._fh.flush()
+
+    def close(self) -> None:
+        """Close the output file."""
+        with self._lock:
+            self._fh.close()
+
+
+class OpenTelemetryTraceHooks(TraceHooks):
+    """Forward spans to an OpenTelemetry tracer.
+
+    Exporting to a collector is configured through the OpenTelemetry SDK as
+    usual (e.g. an OTLP exporter on the global tracer provider); this adapter
+    only creates and ends spans.
+
+    Raises:
+        PyEzvizError: If ``opentelemetry-api`` is not installed.
+    """
+
+    enabled: ClassVar[bool] = True
+
+    def __init__(self, tracer: Any | None = None) -> None:
+        """Use ``tracer`` or the global ``pyezvizapi`` tracer."""
+        try:
+            from opentelemetry import trace  # noqa: PLC0415
+        except ImportError as err:
+            raise PyEzvizError(
+                "OpenTelemetry tracing requires the 'opentelemetry-api' package"
+            ) from err
+        self._trace = trace
+        self._tracer = tracer or trace.get_tracer("pyezvizapi")
+
+    def start_span(self, name: str, **attrs: Any) -> Any:
+        """Start an OpenTelemetry span in the current context."""
+        return self._tracer.start_span(name, attributes=_otel_attrs(attrs))
+
+    def end_span(self, span: Any, **attrs: Any) -> None:
+        """Set the final attributes and end the span."""
+        if span is None:
+            return
+        span.set_attributes(_otel_attrs(attrs))
+        if attrs.get("error"):
+            span.set_status(self._trace.Status(self._trace.StatusCode.ERROR))
+        span.end()
+
+
+def _otel_attrs(attrs: Mapping[str, Any]) -> dict[str, Any]:
+    """Drop ``None`` values and stringify types OpenTelemetry cannot carry."""
+    return {
+        key: value if isinstance(value, (str, bool, int, float)) else str(value)
+        for key, value in attrs.items()
+        if value is not None
+    }
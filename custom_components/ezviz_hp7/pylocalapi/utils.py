@@ -33,6 +33,18 @@ def coerce_int(value: Any) -> int | None:
         return None
 
 
+def build_url(host: str, path: str) -> str:
+    """Join an API host and path, defaulting to HTTPS when no scheme is given.
+
+    Hosts that already carry a scheme (e.g. ``http://127.0.0.1:8080`` for a
+    local stand-in server) are used verbatim.
+    """
+
+    if "://" in host:
+        return f"{host.rstrip('/')}{path}"
+    return f"https://{host}{path}"
+
+
 def decode_json(value: Any) -> Any:
     """Decode a JSON string when possible, otherwise return the original value."""
 
@@ -0,0 +1,104 @@
+"""Registro per account condiviso tra le config entry.
+
+Più entry dello stesso account EZVIZ usano un solo ``Hp7Api`` (quindi un solo
+``EzvizClient``, una sola sessione/token e, se attivo, un solo client push):
+evita login doppi che si invalidano a vicenda. Il client viene chiuso quando
+l'ultima entry che lo usa viene scaricata.
+
+Le credenziali sono quelle della prima entry che crea il client: una entry
+successiva con password diversa viene rifiutata (``ConfigEntryAuthFailed``,
+quindi riautenticazione) invece di riusare in silenzio la sessione aperta.
+Le chiamate al client sono serializzate da ``Hp7Api``.
+"""
+from __future__ import annotations
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Optional
+
+from homeassistant.core import HomeAssistant
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.exceptions import ConfigEntryAuthFailed
+
+from .api import Hp7Api
+from .const import DOMAIN, CONF_REGION, DATA_ACCOUNTS
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def account_key(data) -> tuple[str, str]:
+    return (
+        str(data["username"]).strip().lower(),
+        str(data.get(CONF_REGION) or "").strip().lower(),
+    )
+
+
+@dataclass
+class _Account:
+    api: Hp7Api
+    password: str
+    entries: set[str] = field(default_factory=set)
+
+
+class AccountRegistry:
+    """Client per account con conteggio dei riferimenti (in ``hass.data[DOMAIN]``)."""
+
+    def __init__(self) -> None:
+        self._accounts: dict[tuple[str, str], _Account] = {}
+        self._lock = asyncio.Lock()
+
+    async def async_acquire(
+        self, hass: HomeAssistant, entry: ConfigEntry, token: Optional[dict] = None
+    ) -> Hp7Api:
+        """Restituisce l'api dell'account, creandola (e facendo login) se serve.
+
+        Con ``token`` (sessione salvata) il login iniziale viene saltato.
+        """
+        key = account_key(entry.data)
+        async with self._lock:
+            account = self._accounts.get(key)
+            if account is None:
+                api = Hp7Api(
+                    entry.data["username"], entry.data["password"], entry.data[CONF_REGION], token=token
+                )
+                await hass.async_add_executor_job(api.login)
+                account = self._accounts[key] = _Account(api, entry.data["password"])
+            else:
+                if entry.data["password"] != account.password:
+                    raise ConfigEntryAuthFailed(
+                        f"La entry {entry.title} ha una password diversa da quella "
+                        f"in uso per l'account {key[0]}"
+                    )
+                _LOGGER.debug("EZVIZ HP7: riuso client per account %s", key[0])
+            account.entries.add(entry.entry_id)
+            return account.api
+
+    async def async_set_password(self, hass: HomeAssistant, data, password: str) -> None:
+        """Password verificata dalla riautenticazione: vale per il client aperto."""
+        async with self._lock:
+            account = self._accounts.get(account_key(data))
+            if account is None or account.password == password:
+                return
+            account.password = password
+            await hass.async_add_executor_job(account.api.set_password, password)
+
+    async def async_release(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """Rilascia il riferimento; chiude il client quando non ne restano."""
+        key = account_key(entry.data)
+        async with self._lock:
+            account = self._accounts.get(key)
+            if account is None:
+                return
+            account.entries.discard(entry.entry_id)
+            if account.entries:
+                return
+            del self._accounts[key]
+        await hass.async_add_executor_job(account.api.close)
+
+
+def get_registry(hass: HomeAssistant) -> AccountRegistry:
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    registry = domain_data.get(DATA_ACCOUNTS)
+    if registry is None:
+        registry = domain_data[DATA_ACCOUNTS] = AccountRegistry()
+    return registry
@@ -1,20 +1,77 @@
 from __future__ import annotations
-from typing import Any, Optional
-from datetime import datetime, timedelta
+import time
+from functools import lru_cache
+from typing import Any, Callable, Optional
+from datetime import datetime, tzinfo
 from homeassistant.util import dt as dt_util
 from homeassistant.components.sensor import SensorEntity, SensorDeviceClass
-from homeassistant.helpers.entity import DeviceInfo
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.helpers.entity import DeviceInfo, EntityCategory
 from .const import DOMAIN
+from .entity import Hp7CoordinatorEntity
 
-def _dig(data: dict, path: str, default=None):
-    cur = data
-    for p in path.split("."):
-        if not isinstance(cur, dict) or p not in cur:
-            return default
-        cur = cur[p]
-    return cur
+ALARM_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
 
+
+def _compile_getter(path: str) -> Callable[[dict], Any]:
+    """Restituisce un accessor per il percorso puntato ``path`` (split una volta sola)."""
+    keys = tuple(path.split("."))
+    if len(keys) == 1:
+        key = keys[0]
+        return lambda data: data.get(key)
+
+    def getter(data: dict):
+        cur = data
+        for key in keys:
+            if not isinstance(cur, dict):
+                return None
+            cur = cur.get(key)
+        return cur
+
+    return getter
+
+
+@lru_cache(maxsize=32)
+def _parse_alarm_time(raw: str, tz: tzinfo) -> Optional[datetime]:
+    # Lo stesso allarme resta "ultimo" per molti cicli: parse una volta per stringa
+    try:
+        return datetime.strptime(raw, ALARM_TIME_FORMAT).replace(tzinfo=tz)
+    except ValueError:
+        return None
+
+
+def _compile_value(path: str, device_class, transform) -> Callable[[dict], Any]:
+    """Compila una riga di ``SENSORS`` in ``data -> valore nativo``."""
+    get = _compile_getter(path)
+
+    if device_class == SensorDeviceClass.TIMESTAMP:
+        def timestamp(data: dict):
+            raw = get(data)
+            if not raw or not isinstance(raw, str):
+                return None
+            return _parse_alarm_time(raw, dt_util.DEFAULT_TIME_ZONE)
+        return timestamp
+
+    if device_class == SensorDeviceClass.DURATION:
+        def duration(data: dict):
+            try:
+                return float(get(data))
+            except (TypeError, ValueError):
+                return None
+        return duration
+
+    if transform is None:
+        return get
+
+    def transformed(data: dict):
+        val = get(data)
+        try:
+            return transform(val)
+        except Exception:
+            return val
+    return transformed
+
+
+# (percorso, nome, device_class, unità, icona, transform)
 SENSORS = [
     ("name", "Nome Dispositivo", None, None, "mdi:label", None),
     ("version", "Firmware", None, None, "mdi:update", None),
@@ -22,33 +79,69 @@ SENSORS = [
     ("wifiInfos.signal", "WiFi Segnale", None, "%", "mdi:wifi", None),
     ("local_ip", "IP Locale", None, None, "mdi:ip", None),
     ("wan_ip", "IP WAN", None, None, "mdi:wan", None),
-    ("last_alarm_time", "Ultimo Allarme", SensorDeviceClass.TIMESTAMP, None, "mdi:alarm-light",
-     lambda v: None if not v else __import__("datetime").datetime.strptime(v, "%Y-%m-%d %H:%M:%S")),
+    ("last_alarm_time", "Ultimo Allarme", SensorDeviceClass.TIMESTAMP, None, "mdi:alarm-light", None),
     ("last_alarm_type_name", "Tipo Ultimo Allarme", None, None, "mdi:alarm-light-outline", None),
     ("Seconds_Last_Trigger", "Secondi da Ultimo Trigger", SensorDeviceClass.DURATION, "s", "mdi:timer-outline", None),
 ]
 
+# Chiavi lette dagli attributi del sensore "status"
+STATUS_ATTR_KEYS = (
+    "device_category",
+    "device_sub_category",
+    "alarm_notify",
+    "alarm_schedules_enabled",
+    "PIR_Status",
+    "Motion_Trigger",
+    "cam_timezone",
+    "supported_channels",
+    "wifiInfos",
+)
+_WIFI_SSID = _compile_getter("wifiInfos.ssid")
+_WIFI_SIGNAL = _compile_getter("wifiInfos.signal")
+
+# Le metriche cambiano a ogni ciclo: le scriviamo al massimo una volta al minuto
+METRIC_WRITE_INTERVAL_SEC = 60
+
+# Sensori diagnostici sulle chiamate cloud: (chiave totale, nome, unità, icona)
+METRIC_SENSORS = [
+    ("count", "Richieste Cloud", None, "mdi:cloud-upload"),
+    ("errors", "Errori Cloud", None, "mdi:cloud-alert"),
+    ("retries", "Retry Cloud", None, "mdi:cloud-refresh"),
+    ("relogins", "Relogin Cloud", None, "mdi:account-key"),
+    ("latency_ms", "Tempo Totale Cloud", "ms", "mdi:timer-sand"),
+]
+
 
 async def async_setup_entry(hass, entry, async_add_entities):
     data = hass.data[DOMAIN][entry.entry_id]
     coordinator = data["coordinator"]
-    serial = data["serial"]
-    ents = [Hp7Sensor(coordinator, serial, *cfg) for cfg in SENSORS]
+    serials = data["serials"]
+    # Tabella compilata una volta e condivisa da tutti i serial
+    compiled = [(cfg, _compile_value(cfg[0], cfg[2], cfg[5])) for cfg in SENSORS]
+    ents = [
+        Hp7Sensor(coordinator, serial, *cfg[:5], value_fn)
+        for serial in serials
+        for cfg, value_fn in compiled
+    ]
+    # Le metriche sono per account: le appendiamo al primo dispositivo
+    if serials:
+        ents += [Hp7CloudMetricSensor(coordinator, serials[0], *cfg) for cfg in METRIC_SENSORS]
     async_add_entities(ents)
 
-class Hp7Sensor(CoordinatorEntity, SensorEntity):
+class Hp7Sensor(Hp7CoordinatorEntity, SensorEntity):
     _attr_has_entity_name = True
 
-    def __init__(self, coordinator, serial, path, name, device_class, unit, icon, transform):
-        super().__init__(coordinator)
-        self._serial = serial
+    def __init__(self, coordinator, serial, path, name, device_class, unit, icon, value_fn):
+        super().__init__(coordinator, serial)
         self._path = path
+        top = path.split(".", 1)[0]
+        self._watch_keys = (top, *STATUS_ATTR_KEYS) if path == "status" else (top,)
         self._attr_name = name
         self._attr_unique_id = f"{DOMAIN}_{serial}_sensor_{path.replace('.', '_')}"
         self._attr_device_class = device_class
         self._unit = unit
         self._icon = icon
-        self._transform = transform
+        self._value_fn = value_fn
 
     @property
     def native_unit_of_measurement(self) -> Optional[str]:
@@ -69,43 +162,16 @@ class Hp7Sensor(CoordinatorEntity, SensorEntity):
 
     @property
     def native_value(self):
-        data = self.coordinator.data or {}
-        val = _dig(data, self._path)
-
-        # TIMESTAMP
-        if self._attr_device_class == SensorDeviceClass.TIMESTAMP:
-            if not val:
-                return None
-            try:
-                from datetime import datetime
-                from homeassistant.util import dt as dt_util
-                dt = datetime.strptime(val, "%Y-%m-%d %H:%M:%S")
-                return dt.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE)
-            except Exception:
-                return None
-
-        # DURATION
-        if self._attr_device_class == SensorDeviceClass.DURATION:
-            try:
-                return float(val)
-            except (TypeError, ValueError):
-                return None
-
-        # default
-        if self._transform:
-            try:
-                val = self._transform(val)
-            except Exception:
-                pass
-        return val
-    
+        return self._value_fn(self.coordinator.device_data(self._serial))
 
     @property
     def extra_state_attributes(self) -> dict:
+        attrs = super().extra_state_attributes or {}
         if self._path != "status":
-            return {}
-        data = self.coordinator.data or {}
+            return attrs
+        data = self.coordinator.device_data(self._serial)
         return {
+            **attrs,
             "device_category": data.get("device_category"),
             "device_sub_category": data.get("device_sub_category"),
             "alarm_notify": data.get("alarm_notify"),
@@ -114,6 +180,67 @@ class Hp7Sensor(CoordinatorEntity, SensorEntity):
             "Motion_Trigger": data.get("Motion_Trigger"),
             "cam_timezone": data.get("cam_timezone"),
             "supported_channels": data.get("supported_channels"),
-            "ssid": _dig(data, "wifiInfos.ssid"),
-            "signal": _dig(data, "wifiInfos.signal"),
+            "ssid": _WIFI_SSID(data),
+            "signal": _WIFI_SIGNAL(data),
         }
+
+
+class Hp7CloudMetricSensor(Hp7CoordinatorEntity, SensorEntity):
+    """Contatori diagnostici delle chiamate cloud dell'SDK (da EzvizClient.metrics)."""
+
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(self, coordinator, serial, key, name, unit, icon):
+        super().__init__(coordinator, serial)
+        self._key = key
+        self._last_write = 0.0
+        self._attr_name = name
+        self._attr_unique_id = f"{DOMAIN}_{serial}_metric_{key}"
+        self._attr_native_unit_of_measurement = unit
+        self._attr_icon = icon
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        return DeviceInfo(
+            identifiers={(DOMAIN, self._serial)},
+            name=f"EZVIZ HP7 ({self._serial})",
+            manufacturer="EZVIZ",
+            model="HP7",
+        )
+
+    def _should_write(self) -> bool:
+        # Non dipendono dai dati del dispositivo: throttling a tempo
+        now = time.monotonic()
+        if self.available == self._written_available and now - self._last_write < METRIC_WRITE_INTERVAL_SEC:
+            return False
+        self._last_write = now
+        return True
+
+    @property
+    def native_value(self):
+        return self.coordinator.api.metrics_snapshot().get("totals", {}).get(self._key)
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        # Dettaglio per endpoint, ordinato per tempo totale (chi domina il ciclo di poll)
+        endpoints = self.coordinator.api.metrics_snapshot().get("endpoints", {})
+        ranked = sorted(
+            endpoints.items(),
+            key=lambda item: item[1]["latency_ms"]["total"],
+            reverse=True,
+        )
+        if self._key == "latency_ms":
+            return {
+                label: {
+                    "total": ep["latency_ms"]["total"],
+                    "avg": ep["latency_ms"]["avg"],
+                    "p95": ep["latency_ms"]["p95"],
+                    "max": ep["latency_ms"]["max"],
+                }
+                for label, ep in ranked
+            }
+        attrs = {label: ep[self._key] for label, ep in ranked if ep[self._key]}
+        if self._key == "errors":
+            attrs["codes"] = {label: ep["codes"] for label, ep in ranked if ep["codes"]}
+        return attrs
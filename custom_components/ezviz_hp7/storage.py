@@ -0,0 +1,92 @@
+"""Cache persistente dell'integrazione (``.storage/ezviz_hp7.cache``).
+
+Condivisa da tutte le entry:
+
+- ``tokens``: sessione SDK per account, così al riavvio non serve un login
+  (se è scaduta il client rifà login da solo al primo 401);
+- ``capabilities``: capacità rilevate per serial, valide finché non cambia il
+  firmware;
+- ``snapshots``: ultimo stato buono per serial (solo le chiavi usate dalle
+  entità), servito come dato "stale" all'avvio finché non arriva il primo
+  refresh reale.
+"""
+from __future__ import annotations
+import asyncio
+from typing import Any, Optional
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, DATA_CACHE
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.cache"
+SAVE_DELAY_SEC = 10
+
+
+def _account_id(key: tuple[str, str]) -> str:
+    return "|".join(key)
+
+
+class Hp7Cache:
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._data: dict[str, dict[str, Any]] = {"tokens": {}, "capabilities": {}, "snapshots": {}}
+
+    async def async_load(self) -> None:
+        stored = await self._store.async_load() or {}
+        for section in self._data:
+            if isinstance(stored.get(section), dict):
+                self._data[section] = stored[section]
+
+    def token(self, key: tuple[str, str]) -> Optional[dict]:
+        return self._data["tokens"].get(_account_id(key))
+
+    def set_token(self, key: tuple[str, str], token: Optional[dict]) -> None:
+        if not token or not token.get("session_id"):
+            return
+        if self._data["tokens"].get(_account_id(key)) != token:
+            self._data["tokens"][_account_id(key)] = dict(token)
+            self._schedule_save()
+
+    def capabilities(self, serial: str, version: Optional[str]) -> Optional[dict]:
+        """Capacità salvate per ``serial``, solo se rilevate con lo stesso firmware."""
+        caps = self._data["capabilities"].get(serial)
+        if caps and version and caps.get("version") == version:
+            return caps
+        return None
+
+    def set_capabilities(self, serial: str, caps: dict) -> None:
+        if self._data["capabilities"].get(serial) != caps:
+            self._data["capabilities"][serial] = dict(caps)
+            self._schedule_save()
+
+    def snapshot(self, serials: list[str]) -> Optional[dict[str, dict[str, Any]]]:
+        """Ultimo stato salvato per tutti i ``serials`` (None se ne manca uno)."""
+        snapshots = self._data["snapshots"]
+        if not serials or not all(snapshots.get(s) for s in serials):
+            return None
+        return {s: dict(snapshots[s]) for s in serials}
+
+    def set_snapshot(self, serial: str, status: dict[str, Any]) -> None:
+        if status and self._data["snapshots"].get(serial) != status:
+            self._data["snapshots"][serial] = status
+            self._schedule_save()
+
+    def _schedule_save(self) -> None:
+        self._store.async_delay_save(lambda: self._data, SAVE_DELAY_SEC)
+
+
+async def async_get_cache(hass: HomeAssistant) -> Hp7Cache:
+    """Cache caricata una sola volta anche con più entry in setup in parallelo."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    task = domain_data.get(DATA_CACHE)
+    if task is None:
+        cache = Hp7Cache(hass)
+
+        async def _load() -> Hp7Cache:
+            await cache.async_load()
+            return cache
+
+        task = domain_data[DATA_CACHE] = asyncio.ensure_future(_load())
+    return await task